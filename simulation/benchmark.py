@@ -0,0 +1,279 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Benchmark-Suite der Simulation.
+Gemessen werden die einzelnen Stufen getrennt über ein Raster aus Anzahl Tage (TAGE), Anzahl Simulationsläufe und Anzahl Prozesse:
+- simulation: Monte-Carlo Simulation einer Kombination (monte_carlo)
+- statistik: Übernahme eines Blocks in die laufende Statistik und berechnung_statistiken
+- grafik: Häufigkeiten und Erstellung aller Grafiken (grafiken_erstellen)
+- export: Ergebnistabelle (ausgabe_csv) inkl. Speicherung als CSV
+Jede Messung läuft in einem eigenen Python-Prozess, in dem parameter.TAGE vor dem Import der Simulation gesetzt wird.
+Die Arbeitsprozesse der Prozess-Pools erhalten TAGE über ihren Initializer (parameter.arbeitsprozess_initialisieren), auch beim Start mit spawn.
+Dadurch ist auch der Spitzenwert des Arbeitsspeichers (maximale Resident Set Size, inkl. Kindprozesse) pro Messung aussagekräftig.
+Erfasst werden Laufzeit (bestes Ergebnis aus mehreren Wiederholungen), Durchsatz (simulierte Lauf-Tage pro Sekunde) und Spitzenspeicher.
+Die Ergebnisse werden als JSON gespeichert und können mit einer gespeicherten Baseline verglichen werden (Exit-Code 1 bei Regression).
+Zusätzlich wird die Importzeit der Simulationsmodule (Kaltstart eines Arbeitsprozesses) gemessen. Überschreitet ein Modul das Importbudget
+oder lädt es eine Bibliothek der Auswertung (pandas, Matplotlib) bzw. holidays, endet der Aufruf ebenfalls mit Exit-Code 1.
+
+Kommandozeile (aus dem Projektordner):
+    python simulation/benchmark.py [--tage 365 1000] [--durchlaeufe 100 400] [--prozesse 1 2] [--engine simpy]
+                                   [--ausgabe output/benchmark.json] [--baseline benchmark_baseline.json] [--toleranz 0.2] [--min-sekunden 0.05]
+                                   [--import-budget 0.4] [--nur-import]
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+STUFEN = ("simulation", "statistik", "grafik", "export")
+SZENARIO, HANDLUNGSOPTION = "Normal", "feste Abholintervalle" # gemessene Kombination
+IMPORT_MODULE = ("modell", "simulation", "vektorisiert", "ereignis", "flotte", "sensitivitaet") # Module, die in Arbeitsprozessen benötigt werden
+SCHWERE_BIBLIOTHEKEN = ("pandas", "matplotlib", "holidays") # dürfen erst bei Bedarf (Auswertung, Grafiken, Kalendertabelle) importiert werden
+IMPORT_BUDGET = 0.4 # maximale Importzeit pro Modul in Sekunden (Kaltstart)
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Spitzenwert des Arbeitsspeichers des Prozesses und seiner Kindprozesse
+Output:             spitze_mb (maximale Resident Set Size in MB)
+"""
+def spitzenspeicher_mb():
+    faktor = 1024 * 1024 if sys.platform == "darwin" else 1024 # ru_maxrss: Bytes (macOS) bzw. KB (Linux)
+    spitze = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return spitze * faktor / 1024 / 1024
+
+
+
+"""
+Funktion:           Durchführung einer Messung (im eigenen Prozess)
+Input:              stufe (gemessene Stufe, siehe STUFEN)
+                    tage (Anzahl der Tage, die in der Simulation betrachtet werden)
+                    durchlaeufe (Anzahl der Simulationsläufe)
+                    prozesse (Anzahl der parallelen Prozesse, nur Stufen simulation und grafik)
+                    engine (Simulationslogik)
+                    wiederholungen (Anzahl der Wiederholungen, gewertet wird die kürzeste Laufzeit)
+Output:             messung (Dictionary mit Konfiguration, Laufzeit, Durchsatz und Spitzenspeicher)
+Funktionsweise:     parameter.TAGE wird vor dem Import der Simulationsmodule gesetzt, da diese TAGE beim Import übernehmen.
+                    Die Arbeitsprozesse übernehmen TAGE über den Initializer der Prozess-Pools (parameter.arbeitsprozess_initialisieren).
+                    Die Vorbereitung (z.B. Simulation der Eingangsdaten für Statistik und Grafik mit der NumPy-Engine) wird nicht gemessen.
+"""
+def messung(stufe, tage, durchlaeufe, prozesse, engine, wiederholungen):
+    import parameter
+    parameter.TAGE = tage
+    from main import SZENARIEN, HANDLUNGSOPTIONEN
+    from simulation import monte_carlo, simulation_rohdaten, seed_bloecke
+    from statistik import Teilergebnis
+    from funktionen import berechnung_statistiken, ausgabe_csv
+    from grafik import histogramm_daten, grafiken_erstellen
+
+    szenario, handlungsoption = SZENARIEN[SZENARIO], HANDLUNGSOPTIONEN[HANDLUNGSOPTION]
+    kombinationen = [(szenario_key, handlungsoption_key) for szenario_key in SZENARIEN for handlungsoption_key in HANDLUNGSOPTIONEN]
+
+    # Vorbereitung der Eingangsdaten (nicht gemessen)
+    if stufe == "statistik":
+        speicher = simulation_rohdaten(seed_bloecke(durchlaeufe, durchlaeufe)[0], szenario, handlungsoption, engine="numpy")
+    if stufe in ("grafik", "export"):
+        ergebnis = monte_carlo(durchlaeufe, szenario, handlungsoption, engine="numpy")
+        zusammenfassung = {kombination: berechnung_statistiken(ergebnis) for kombination in kombinationen}
+
+    laufzeiten = []
+    for _ in range(wiederholungen):
+        with tempfile.TemporaryDirectory() as verzeichnis:
+            start = time.perf_counter()
+            if stufe == "simulation":
+                monte_carlo(durchlaeufe, szenario, handlungsoption, anzahl_prozesse=prozesse, engine=engine)
+            elif stufe == "statistik":
+                berechnung_statistiken(Teilergebnis().erfassen(speicher))
+            elif stufe == "grafik":
+                histogramme = {kombination: histogramm_daten(ergebnis.histogramme) for kombination in kombinationen}
+                grafiken_erstellen(histogramme, SZENARIEN, HANDLUNGSOPTIONEN, verzeichnis, prozesse)
+            elif stufe == "export":
+                ausgabe_csv(zusammenfassung).to_csv(os.path.join(verzeichnis, "simulation_ergebnisse.csv"))
+            laufzeiten.append(time.perf_counter() - start)
+
+    sekunden = min(laufzeiten)
+    messung = {
+        "stufe": stufe, "tage": tage, "durchlaeufe": durchlaeufe, "prozesse": prozesse, "engine": engine,
+        "sekunden": round(sekunden, 4),
+        "lauf_tage_pro_sekunde": round(durchlaeufe * tage / sekunden, 1) if sekunden > 0 else None,
+        "spitzenspeicher_mb": round(spitzenspeicher_mb(), 1),
+    }
+    return messung
+
+
+
+"""
+Funktion:           Importzeit eines Moduls im Kaltstart
+Input:              modul (Name des Moduls im Ordner simulation)
+                    wiederholungen (Anzahl der Wiederholungen, gewertet wird die kürzeste Importzeit)
+Output:             messung (Dictionary mit Modul, Importzeit in Sekunden und den dabei geladenen schweren Bibliotheken)
+Funktionsweise:     Jeder Import erfolgt in einem neuen Python-Prozess, damit keine bereits geladenen Module das Ergebnis verfälschen.
+"""
+def importzeit(modul, wiederholungen=3):
+    code = (f"import json, sys, time; sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r}); start = time.perf_counter(); import {modul}; "
+            f"print(json.dumps([time.perf_counter() - start, [name for name in {SCHWERE_BIBLIOTHEKEN!r} if name in sys.modules]]))")
+    laufzeiten = []
+    for _ in range(wiederholungen):
+        prozess = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        sekunden, geladen = json.loads(prozess.stdout.strip().splitlines()[-1])
+        laufzeiten.append(sekunden)
+    messung = {"modul": modul, "sekunden": round(min(laufzeiten), 4), "schwere_bibliotheken": geladen}
+    return messung
+
+
+
+"""
+Funktion:           Prüfung der Importzeiten gegen das Importbudget
+Input:              importzeiten (Messungen aus importzeit)
+                    budget (maximale Importzeit pro Modul in Sekunden)
+Output:             verstoesse (Liste der Verstöße als Text)
+"""
+def importpruefung(importzeiten, budget):
+    verstoesse = []
+    for messung in importzeiten:
+        if messung["sekunden"] > budget:
+            verstoesse.append(f"Import von {messung['modul']}: {messung['sekunden']} s > Budget {budget} s")
+        if messung["schwere_bibliotheken"]:
+            verstoesse.append(f"Import von {messung['modul']} lädt {', '.join(messung['schwere_bibliotheken'])}")
+    return verstoesse
+
+
+
+"""
+Funktion:           Raster der Messungen
+Input:              tage_liste, durchlaeufe_liste, prozesse_liste (Rasterwerte)
+                    stufen (gemessene Stufen)
+Output:             konfigurationen (Liste von (stufe, tage, durchlaeufe, prozesse))
+Funktionsweise:     Die Anzahl der Prozesse wird nur für die parallelisierbaren Stufen (simulation, grafik) variiert.
+"""
+def messraster(tage_liste, durchlaeufe_liste, prozesse_liste, stufen=STUFEN):
+    konfigurationen = []
+    for stufe in stufen:
+        for tage in tage_liste:
+            for durchlaeufe in durchlaeufe_liste:
+                for prozesse in (prozesse_liste if stufe in ("simulation", "grafik") else [1]):
+                    konfigurationen.append((stufe, tage, durchlaeufe, prozesse))
+    return konfigurationen
+
+
+
+"""
+Funktion:           Schlüssel einer Messung für den Vergleich mit der Baseline
+"""
+def messschluessel(messung):
+    return (messung["stufe"], messung["tage"], messung["durchlaeufe"], messung["prozesse"], messung["engine"])
+
+
+
+"""
+Funktion:           Vergleich der Messungen mit einer Baseline
+Input:              messungen (aktuelle Messungen)
+                    baseline (Messungen der Baseline)
+                    toleranz (zulässige relative Verschlechterung, z.B. 0.2 = 20%)
+                    min_sekunden (zusätzlich zulässige absolute Verschlechterung der Laufzeit, gegen Messrauschen bei sehr kurzen Stufen)
+Output:             regressionen (Liste der Regressionen als Text)
+Funktionsweise:     Verglichen werden Laufzeit und Spitzenspeicher der Messungen mit gleichem Schlüssel (Stufe, Tage, Durchläufe, Prozesse, Engine).
+                    Messungen ohne Gegenstück in der Baseline werden ignoriert.
+"""
+def vergleich_baseline(messungen, baseline, toleranz, min_sekunden=0.05):
+    referenz = {messschluessel(messung): messung for messung in baseline}
+    regressionen = []
+    for messung in messungen:
+        alt = referenz.get(messschluessel(messung))
+        if alt is None:
+            continue
+        for groesse, absolut in (("sekunden", min_sekunden), ("spitzenspeicher_mb", 0.0)):
+            if alt[groesse] and messung[groesse] > alt[groesse] * (1 + toleranz) + absolut:
+                regressionen.append(f"{messschluessel(messung)} {groesse}: {alt[groesse]} -> {messung[groesse]} (+{(messung[groesse] / alt[groesse] - 1) * 100:.1f}%)")
+    return regressionen
+
+
+
+"""
+Funktion:           Kommandozeile der Benchmark-Suite
+Funktionsweise:     Jede Konfiguration des Rasters wird in einem eigenen Prozess gemessen (interner Aufruf mit --messung).
+                    Die Ergebnisse werden als Tabelle ausgegeben und als JSON gespeichert. Bei Angabe einer Baseline
+                    wird verglichen und bei Regressionen mit Exit-Code 1 beendet.
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark der Simulationsstufen")
+    parser.add_argument("--tage", type=int, nargs="+", default=[365, 1000])
+    parser.add_argument("--durchlaeufe", type=int, nargs="+", default=[100, 400])
+    parser.add_argument("--prozesse", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--stufen", nargs="+", choices=STUFEN, default=list(STUFEN))
+    parser.add_argument("--engine", default="simpy", choices=["simpy", "numpy", "ereignis"])
+    parser.add_argument("--wiederholungen", type=int, default=3)
+    parser.add_argument("--ausgabe", default=os.path.join("output", "benchmark.json"))
+    parser.add_argument("--baseline", default=None, help="JSON-Datei einer früheren Ausführung zum Vergleich")
+    parser.add_argument("--toleranz", type=float, default=0.2, help="zulässige relative Verschlechterung (Standard: 0.2 = 20%%)")
+    parser.add_argument("--min-sekunden", type=float, default=0.05, help="zusätzlich zulässige absolute Verschlechterung der Laufzeit in Sekunden")
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET, help="maximale Importzeit der Simulationsmodule in Sekunden")
+    parser.add_argument("--nur-import", action="store_true", help="nur die Importzeiten messen und prüfen")
+    parser.add_argument("--messung", default=None, help=argparse.SUPPRESS) # interner Aufruf: eine Messung als JSON
+    argumente = parser.parse_args()
+
+    if argumente.messung is not None:
+        print(json.dumps(messung(**json.loads(argumente.messung))))
+        return 0
+
+    importzeiten = []
+    for modul in IMPORT_MODULE:
+        importzeiten.append(importzeit(modul, argumente.wiederholungen))
+        m = importzeiten[-1]
+        print(f"{'import':<11} {modul:<36} {m['sekunden']:>9.3f} s  {', '.join(m['schwere_bibliotheken']) or '-'}")
+    verstoesse = importpruefung(importzeiten, argumente.import_budget)
+    for verstoss in verstoesse:
+        print(f"[Importbudget] {verstoss}")
+    if argumente.nur_import:
+        return 1 if verstoesse else 0
+
+    messungen = []
+    for stufe, tage, durchlaeufe, prozesse in messraster(argumente.tage, argumente.durchlaeufe, argumente.prozesse, argumente.stufen):
+        konfiguration = {"stufe": stufe, "tage": tage, "durchlaeufe": durchlaeufe, "prozesse": prozesse, "engine": argumente.engine, "wiederholungen": argumente.wiederholungen}
+        prozess = subprocess.run([sys.executable, os.path.abspath(__file__), "--messung", json.dumps(konfiguration)], capture_output=True, text=True, check=True)
+        messungen.append(json.loads(prozess.stdout.strip().splitlines()[-1]))
+        m = messungen[-1]
+        print(f"{stufe:<11} Tage={tage:<6} Durchläufe={durchlaeufe:<6} Prozesse={prozesse:<3} {m['sekunden']:>9.3f} s  {m['lauf_tage_pro_sekunde']:>12.0f} Lauf-Tage/s  {m['spitzenspeicher_mb']:>8.1f} MB")
+
+    ergebnis = {
+        "umgebung": {"python": platform.python_version(), "plattform": platform.platform(), "prozessor": platform.processor(), "cpu_anzahl": os.cpu_count(), "zeitpunkt": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "importzeiten": importzeiten,
+        "messungen": messungen,
+    }
+    os.makedirs(os.path.dirname(argumente.ausgabe) or ".", exist_ok=True)
+    with open(argumente.ausgabe, "w", encoding="utf-8") as datei:
+        json.dump(ergebnis, datei, indent=2, ensure_ascii=False)
+    print(f"[Info] Ergebnisse gespeichert: {argumente.ausgabe}")
+
+    if argumente.baseline is not None:
+        with open(argumente.baseline, encoding="utf-8") as datei:
+            regressionen = vergleich_baseline(messungen, json.load(datei)["messungen"], argumente.toleranz, argumente.min_sekunden)
+        for regression in regressionen:
+            print(f"[Regression] {regression}")
+        if regressionen:
+            return 1
+        print(f"[Info] Keine Regression gegenüber {argumente.baseline} (Toleranz {argumente.toleranz * 100:.0f}%).")
+    return 1 if verstoesse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,319 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet den persistenten Ergebnis-Cache der Simulation.
+Die Teilergebnisse (laufende Statistik, Quantilskizzen, Histogramme und ggf. Summen pro Simulationslauf) werden pro Seed-Block als komprimierte NumPy-Datei (.npz) gespeichert.
+Der Schlüssel einer Kombination ist ein Hash über Szenario, Handlungsoption, die globalen Parameter (parameter.py inkl. Überschreibungen), Engine inkl. Version,
+den Quelltext der Simulationslogik der Engine und Varianzreduktion. Jede Änderung an der Simulationslogik führt damit zu einem neuen Schlüssel,
+auch wenn die Version in ENGINE_VERSIONEN nicht erhöht wurde.
+Innerhalb einer Kombination ist jeder Block über seinen Seed-Bereich adressiert. Bei einer erneuten Ausführung werden nur geänderte Kombinationen
+und nur neue Zufallsstartwerte simuliert (z.B. werden bei einer Erhöhung von 1000 auf 5000 Durchläufe die ersten 1000 Läufe wiederverwendet).
+Der Cache ist in der Größe begrenzt, bei Überschreitung werden die am längsten nicht verwendeten Blöcke gelöscht (LRU).
+
+Kommandozeile:
+    python simulation/cache.py info [--verzeichnis cache]
+    python simulation/cache.py purge [--verzeichnis cache] [--kombination HASH] [--max-mb 500]
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import argparse
+import functools
+import hashlib
+import io
+import json
+import os
+import time
+from pathlib import Path
+import numpy as np
+import parameter
+from statistik import Quantilskizze, Histogramm, Teilergebnis
+
+
+# Version der Simulationslogik pro Engine: bei jeder Änderung der Regeln erhöhen, damit alte Ergebnisse nicht wiederverwendet werden
+# (Änderungen am Quelltext werden zusätzlich über quellen_hash erkannt, z.B. bei Änderungen ohne Erhöhung der Version)
+ENGINE_VERSIONEN = {"simpy": 2, "numpy": 1, "ereignis": 2}
+FORMAT_VERSION = 3 # Version des Dateiformats eines Blocks
+
+# Quelldateien, von denen die Ergebnisse einer Engine abhängen (werden zusätzlich zur Version gehasht)
+GEMEINSAME_QUELLEN = ("parameter.py", "kalender.py", "ergebnisspeicher.py", "statistik.py", "simulation.py")
+ENGINE_QUELLEN = {"simpy": ("modell.py", "funktionen.py", "zufall.py"), "numpy": ("vektorisiert.py", "zufall.py"), "ereignis": ("ereignis.py", "vektorisiert.py", "zufall.py")}
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Hash des Quelltexts der Simulationslogik einer Engine
+Input:              engine (Simulationslogik)
+Output:             hash (Hexadezimaler SHA-256-Hash über alle Quelldateien der Engine, gekürzt auf 16 Zeichen)
+Funktionsweise:     Die Quelldateien (ENGINE_QUELLEN und GEMEINSAME_QUELLEN) werden in fester Reihenfolge mit ihrem Namen gehasht.
+                    Das Ergebnis wird pro Prozess zwischengespeichert.
+"""
+@functools.lru_cache(maxsize=None)
+def quellen_hash(engine):
+    verzeichnis = Path(__file__).resolve().parent
+    pruefsumme = hashlib.sha256()
+    for name in sorted(set(ENGINE_QUELLEN[engine] + GEMEINSAME_QUELLEN)):
+        pruefsumme.update(name.encode("utf-8"))
+        pruefsumme.update((verzeichnis / name).read_bytes())
+    return pruefsumme.hexdigest()[:16]
+
+
+
+"""
+Funktion:           Hash-Schlüssel einer Szenario-Handlungsoption-Kombination
+Input:              szenario (betrachteten Szenario)
+                    handlungsoption (betrachtete Handlungsoption)
+                    engine (Simulationslogik)
+                    varianzreduktion (None, "crn" oder "antithetisch")
+                    ueberschreibungen (Überschreibungen der Modellparameter, None = keine)
+Output:             schluessel (Hexadezimaler SHA-256-Hash, gekürzt auf 16 Zeichen)
+                    beschreibung (Dictionary mit allen Bestandteilen des Schlüssels)
+Funktionsweise:     Alle Bestandteile werden als JSON mit sortierten Schlüsseln serialisiert und gehasht.
+                    Die globalen Parameter werden aus parameter.py gelesen (alle Namen in Großbuchstaben) und mit den Überschreibungen aktualisiert.
+                    Der Hash des Quelltexts der Engine (quellen_hash) stellt sicher, dass nach Änderungen der Simulationslogik keine alten Blöcke verwendet werden.
+"""
+def kombinationsschluessel(szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen=None):
+    parameterwerte = {name: wert for name, wert in vars(parameter).items() if name.isupper()}
+    parameterwerte.update(ueberschreibungen or {})
+    beschreibung = {
+        "szenario": szenario,
+        "handlungsoption": handlungsoption,
+        "parameter": parameterwerte,
+        "engine": engine,
+        "engine_version": ENGINE_VERSIONEN[engine],
+        "engine_quellen": quellen_hash(engine),
+        "varianzreduktion": varianzreduktion,
+        "format_version": FORMAT_VERSION,
+    }
+    text = json.dumps(beschreibung, sort_keys=True, default=str)
+    schluessel = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    return schluessel, beschreibung
+
+
+
+"""
+Funktion:           Serialisierung eines Teilergebnisses
+Input:              teilergebnis (Teilergebnis eines Blocks)
+Output:             daten (Bytes im .npz-Format)
+Funktionsweise:     Die Summen pro Simulationslauf (falls aufbewahrt) werden als float64-Arrays gespeichert.
+                    Die Klassen der Quantilskizzen werden als Arrays von Klassenindex und Anzahl gespeichert, die Anzahlen der Histogramme als Array.
+                    Der Zustand des Statistik-Akkumulators und die übrigen Werte der Skizzen werden als JSON-Text gespeichert
+                    (exakte Darstellung der Gleitkommazahlen, Ganzzahlen bleiben Ganzzahlen).
+"""
+def teilergebnis_speichern(teilergebnis):
+    arrays = {f"laufsumme_{name}": werte for name, werte in teilergebnis.laufsummen.items()}
+    skizzen = {}
+    for name, skizze in teilergebnis.skizzen.items():
+        arrays[f"skizze_{name}_index"] = np.array(list(skizze.klassen), dtype=np.int64)
+        arrays[f"skizze_{name}_anzahl"] = np.array(list(skizze.klassen.values()), dtype=np.int64)
+        skizzen[name] = {"relative_genauigkeit": skizze.relative_genauigkeit, "nullwerte": skizze.nullwerte, "anzahl": skizze.anzahl, "minimum": skizze.minimum, "maximum": skizze.maximum}
+    arrays["skizzen"] = np.array(json.dumps(skizzen))
+    histogramme = {}
+    for name, histogramm in teilergebnis.histogramme.items():
+        arrays[f"histogramm_{name}_anzahl"] = histogramm.anzahlen
+        histogramme[name] = {"exponent": histogramm.exponent, "offset": histogramm.offset, "anzahl": histogramm.anzahl, "minimum": histogramm.minimum, "maximum": histogramm.maximum}
+    arrays["histogramme"] = np.array(json.dumps(histogramme))
+    arrays["statistik"] = np.array(json.dumps(teilergebnis.statistik.werte))
+    puffer = io.BytesIO()
+    np.savez_compressed(puffer, **arrays)
+    return puffer.getvalue()
+
+
+
+"""
+Funktion:           Deserialisierung eines Teilergebnisses
+Input:              pfad (Pfad der .npz-Datei oder Datei-Objekt)
+Output:             teilergebnis (Teilergebnis des Blocks)
+"""
+def teilergebnis_laden(pfad):
+    teilergebnis = Teilergebnis()
+    with np.load(pfad, allow_pickle=False) as daten:
+        teilergebnis.statistik.werte = json.loads(str(daten["statistik"]))
+        skizzen = json.loads(str(daten["skizzen"]))
+        histogramme = json.loads(str(daten["histogramme"]))
+        for name in teilergebnis.laufsummen:
+            teilergebnis.laufsummen[name] = daten[f"laufsumme_{name}"]
+            skizze = Quantilskizze(skizzen[name]["relative_genauigkeit"])
+            skizze.klassen = dict(zip(daten[f"skizze_{name}_index"].tolist(), daten[f"skizze_{name}_anzahl"].tolist()))
+            for attribut in ("nullwerte", "anzahl", "minimum", "maximum"):
+                setattr(skizze, attribut, skizzen[name][attribut])
+            teilergebnis.skizzen[name] = skizze
+            histogramm = Histogramm()
+            histogramm.anzahlen = daten[f"histogramm_{name}_anzahl"]
+            for attribut in ("exponent", "offset", "anzahl", "minimum", "maximum"):
+                setattr(histogramm, attribut, histogramme[name][attribut])
+            teilergebnis.histogramme[name] = histogramm
+    return teilergebnis
+
+
+# ------------------------------------------------
+# ---------- Klassenmodell (Ergebniscache) ----------
+"""
+Verzeichnisstruktur:
+    <verzeichnis>/<kombinationsschluessel>/kombination.json     (lesbare Beschreibung der Kombination)
+    <verzeichnis>/<kombinationsschluessel>/<erster seed>_<anzahl>.npz     (Teilergebnis eines Seed-Blocks)
+Die Änderungszeit einer Blockdatei wird bei jedem Zugriff aktualisiert und dient als Zeitpunkt der letzten Verwendung für die LRU-Verdrängung.
+Dateien werden zunächst unter einem temporären Namen geschrieben und anschließend umbenannt, sodass keine unvollständigen Blöcke gelesen werden.
+"""
+class Ergebniscache:
+    def __init__(self, verzeichnis="cache", max_mb=500):
+        self.verzeichnis = Path(verzeichnis)
+        self.max_bytes = max_mb * 1024 * 1024 if max_mb is not None else None
+        self.treffer = 0
+        self.fehlschlaege = 0
+
+    def _pfad(self, seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen):
+        schluessel, beschreibung = kombinationsschluessel(szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen)
+        ordner = self.verzeichnis / schluessel
+        return ordner / f"{seeds[0]}_{len(seeds)}.npz", ordner, beschreibung
+
+    """
+    Funktion:           Laden eines Blocks aus dem Cache
+    Input:              seeds (Zufallsstartwerte des Blocks, aufeinanderfolgend)
+                        szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen (Bestandteile des Schlüssels)
+    Output:             teilergebnis (Teilergebnis des Blocks oder None, falls nicht vorhanden)
+    """
+    def laden(self, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, ueberschreibungen=None):
+        pfad, _, _ = self._pfad(seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen)
+        if not pfad.exists():
+            self.fehlschlaege += 1
+            return None
+        try:
+            teilergebnis = teilergebnis_laden(pfad)
+        except (OSError, ValueError, KeyError):
+            # Beschädigte Datei: löschen und wie nicht vorhanden behandeln, der Block wird neu simuliert
+            pfad.unlink(missing_ok=True)
+            self.fehlschlaege += 1
+            return None
+        os.utime(pfad) # Zeitpunkt der letzten Verwendung
+        self.treffer += 1
+        return teilergebnis
+
+    """
+    Funktion:           Speichern eines Blocks im Cache (bereits vorhandene Blöcke werden nicht erneut geschrieben)
+    Input:              teilergebnis (Teilergebnis des Blocks)
+                        seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen (Bestandteile des Schlüssels)
+    """
+    def speichern(self, teilergebnis, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, ueberschreibungen=None):
+        pfad, ordner, beschreibung = self._pfad(seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen)
+        if pfad.exists():
+            return
+        ordner.mkdir(parents=True, exist_ok=True)
+        if not (ordner / "kombination.json").exists():
+            (ordner / "kombination.json").write_text(json.dumps(beschreibung, indent=2, default=str, ensure_ascii=False), encoding="utf-8")
+        temporaer = pfad.with_suffix(f".{os.getpid()}.tmp")
+        temporaer.write_bytes(teilergebnis_speichern(teilergebnis))
+        os.replace(temporaer, pfad)
+
+    """
+    Funktion:           Übersicht über alle Kombinationen im Cache
+    Output:             eintraege (Liste mit Schlüssel, Beschreibung, Anzahl Blöcke, Anzahl Simulationsläufe, Größe und letzter Verwendung pro Kombination)
+    """
+    def eintraege(self):
+        eintraege = []
+        if not self.verzeichnis.exists():
+            return eintraege
+        for ordner in sorted(self.verzeichnis.iterdir()):
+            if not ordner.is_dir():
+                continue
+            bloecke = list(ordner.glob("*.npz"))
+            beschreibung = json.loads((ordner / "kombination.json").read_text(encoding="utf-8")) if (ordner / "kombination.json").exists() else {}
+            eintraege.append({
+                "schluessel": ordner.name,
+                "beschreibung": beschreibung,
+                "bloecke": len(bloecke),
+                "durchlaeufe": sum(int(block.stem.split("_")[1]) for block in bloecke),
+                "bytes": sum(block.stat().st_size for block in bloecke),
+                "letzte_verwendung": max((block.stat().st_mtime for block in bloecke), default=0.0),
+            })
+        return eintraege
+
+    """
+    Funktion:           Begrenzung der Cache-Größe (LRU-Verdrängung)
+    Input:              max_bytes (Obergrenze in Bytes, None = Obergrenze des Caches)
+    Output:             geloescht (Anzahl der gelöschten Blöcke)
+    Funktionsweise:     Solange die Gesamtgröße aller Blöcke die Obergrenze überschreitet, wird der am längsten nicht verwendete Block gelöscht.
+                        Leere Kombinationsordner werden entfernt.
+    """
+    def begrenzen(self, max_bytes=None):
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None or not self.verzeichnis.exists():
+            return 0
+        bloecke = sorted(((block.stat().st_mtime, block.stat().st_size, block) for block in self.verzeichnis.glob("*/*.npz")), key=lambda eintrag: eintrag[0])
+        gesamt = sum(groesse for _, groesse, _ in bloecke)
+        geloescht = 0
+        for _, groesse, block in bloecke:
+            if gesamt <= max_bytes:
+                break
+            block.unlink(missing_ok=True)
+            gesamt -= groesse
+            geloescht += 1
+        self._leere_ordner_entfernen()
+        return geloescht
+
+    """
+    Funktion:           Löschen von Kombinationen
+    Input:              schluessel (Schlüssel einer Kombination, None = alle Kombinationen)
+    Output:             geloescht (Anzahl der gelöschten Blöcke)
+    """
+    def leeren(self, schluessel=None):
+        if not self.verzeichnis.exists():
+            return 0
+        muster = f"{schluessel}/*" if schluessel else "*/*"
+        geloescht = 0
+        for datei in self.verzeichnis.glob(muster):
+            geloescht += datei.suffix == ".npz"
+            datei.unlink(missing_ok=True)
+        self._leere_ordner_entfernen()
+        return geloescht
+
+    def _leere_ordner_entfernen(self):
+        for ordner in self.verzeichnis.iterdir():
+            if ordner.is_dir() and not any(ordner.glob("*.npz")):
+                for datei in ordner.iterdir():
+                    datei.unlink(missing_ok=True)
+                ordner.rmdir()
+
+
+# ------------------------------------
+# ---------- Kommandozeile ----------
+"""
+Funktion:           Kommandozeile zur Anzeige und Bereinigung des Caches
+Funktionsweise:     info: Übersicht über alle Kombinationen (Schlüssel, Szenario, Handlungsoption, Engine, Blöcke, Durchläufe, Größe, letzte Verwendung)
+                    purge: Löschen aller Kombinationen, einer Kombination (--kombination) oder der ältesten Blöcke bis zur Obergrenze (--max-mb)
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Ergebnis-Cache der Simulation anzeigen und bereinigen")
+    parser.add_argument("befehl", choices=["info", "purge"])
+    parser.add_argument("--verzeichnis", default="cache", help="Cache-Verzeichnis (Standard: cache)")
+    parser.add_argument("--kombination", default=None, help="purge: nur diese Kombination (Schlüssel) löschen")
+    parser.add_argument("--max-mb", type=float, default=None, help="purge: nur die am längsten nicht verwendeten Blöcke bis zu dieser Größe löschen")
+    argumente = parser.parse_args()
+
+    cache = Ergebniscache(argumente.verzeichnis, max_mb=None)
+    if argumente.befehl == "info":
+        eintraege = cache.eintraege()
+        for eintrag in eintraege:
+            beschreibung = eintrag["beschreibung"]
+            print(f"{eintrag['schluessel']}  {beschreibung.get('szenario')}  {beschreibung.get('handlungsoption')}  engine={beschreibung.get('engine')}  "
+                  f"varianzreduktion={beschreibung.get('varianzreduktion')}  Blöcke={eintrag['bloecke']}  Durchläufe={eintrag['durchlaeufe']}  "
+                  f"{eintrag['bytes'] / 1024:.1f} KB  zuletzt {time.strftime('%Y-%m-%d %H:%M', time.localtime(eintrag['letzte_verwendung']))}")
+        print(f"[Info] {len(eintraege)} Kombinationen, {sum(eintrag['bytes'] for eintrag in eintraege) / 1024 / 1024:.2f} MB")
+    elif argumente.max_mb is not None:
+        print(f"[Info] {cache.begrenzen(int(argumente.max_mb * 1024 * 1024))} Blöcke gelöscht.")
+    else:
+        print(f"[Info] {cache.leeren(argumente.kombination)} Blöcke gelöscht.")
+
+
+if __name__ == "__main__":
+    main()
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,149 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet den Checkpoint für lange Simulationskampagnen.
+Jeder abgeschlossene Seed-Block einer Szenario-Handlungsoption-Kombination wird sofort an eine lokale Datei angehängt (nur Anhängen, kein Überschreiben).
+Wird die Simulation abgebrochen (Absturz, Strg+C) und mit derselben Konfiguration neu gestartet, werden die abgeschlossenen Blöcke
+aus der Datei geladen und nur die fehlenden Blöcke simuliert. Da die Teilergebnisse exakt gespeichert und in der Reihenfolge der Blöcke
+zusammengeführt werden, sind die Ergebnisse identisch zu einer ununterbrochenen Ausführung.
+Der Checkpoint hat dieselbe Schnittstelle wie der Ergebniscache (cache.py) und kann einen Ergebniscache einschließen.
+Im Gegensatz zum Cache wird der Checkpoint nie verkleinert.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import hashlib
+import io
+import json
+import os
+import threading
+from pathlib import Path
+from cache import kombinationsschluessel, teilergebnis_speichern, teilergebnis_laden
+
+
+# ------------------------------------------------
+# ---------- Klassenmodell (Checkpoint) ----------
+"""
+Dateiformat (<verzeichnis>/bloecke.log), ein Eintrag pro abgeschlossenem Block:
+    Kopfzeile (JSON mit Kombinationsschlüssel, erstem Seed, Anzahl Seeds, Länge und SHA-256 der Daten), Zeilenumbruch
+    Daten (Teilergebnis im .npz-Format, siehe teilergebnis_speichern)
+Ein Eintrag wird unter einer Sperre vollständig angehängt und anschließend mit fsync auf den Datenträger geschrieben.
+Beim Öffnen wird die Datei von vorne gelesen. Ein unvollständiger oder beschädigter Eintrag am Ende (Abbruch während des Schreibens)
+wird abgeschnitten, alle vorherigen Einträge bleiben gültig.
+Einträge anderer Konfigurationen (andere Parameter, Engine, ...) bleiben erhalten, werden aber nicht verwendet, da sich ihr Schlüssel unterscheidet.
+"""
+class Checkpoint:
+    DATEI = "bloecke.log"
+
+    def __init__(self, verzeichnis="checkpoint", cache=None):
+        self.verzeichnis = Path(verzeichnis)
+        self.pfad = self.verzeichnis / self.DATEI
+        self.cache = cache # Optionaler Ergebniscache für Blöcke, die nicht im Checkpoint vorhanden sind
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self.bloecke = {} # (Kombinationsschlüssel, erster Seed, Anzahl) -> (Position, Länge) der Daten in der Datei
+        self._sperre = threading.Lock() # Blöcke werden bei paralleler Ausführung aus einem Hintergrund-Thread gespeichert
+        self.verzeichnis.mkdir(parents=True, exist_ok=True)
+        self._einlesen()
+
+    """
+    Funktion:           Einlesen der vorhandenen Einträge
+    Funktionsweise:     Die Kopfzeilen werden nacheinander gelesen und die Daten über den SHA-256-Hash geprüft.
+                        Ab dem ersten ungültigen Eintrag wird die Datei abgeschnitten.
+    """
+    def _einlesen(self):
+        if not self.pfad.exists():
+            return
+        gueltig = 0
+        with open(self.pfad, "rb") as datei:
+            while True:
+                kopf = datei.readline()
+                if not kopf.endswith(b"\n"):
+                    break
+                try:
+                    eintrag = json.loads(kopf)
+                    position = datei.tell()
+                    daten = datei.read(eintrag["bytes"])
+                except (ValueError, KeyError, TypeError):
+                    break
+                if len(daten) != eintrag["bytes"] or hashlib.sha256(daten).hexdigest() != eintrag["sha256"]:
+                    break
+                self.bloecke[(eintrag["kombination"], eintrag["erster_seed"], eintrag["anzahl"])] = (position, eintrag["bytes"])
+                gueltig = datei.tell()
+        if gueltig < self.pfad.stat().st_size:
+            print( f"[Info] Checkpoint: unvollständigen Eintrag am Ende von {self.pfad} entfernt." )
+            os.truncate(self.pfad, gueltig)
+
+    def _schluessel(self, seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen):
+        kombination, _ = kombinationsschluessel(szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen)
+        return (kombination, seeds[0], len(seeds))
+
+    """
+    Funktion:           Laden eines Blocks aus dem Checkpoint (bzw. aus dem eingeschlossenen Ergebniscache)
+    Input:              seeds (Zufallsstartwerte des Blocks, aufeinanderfolgend)
+                        szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen (Bestandteile des Schlüssels)
+    Output:             teilergebnis (Teilergebnis des Blocks oder None, falls nicht vorhanden)
+    Funktionsweise:     Ein Block aus dem Ergebniscache wird zusätzlich im Checkpoint gespeichert, damit der Checkpoint auch nach
+                        einer Verkleinerung des Caches alle abgeschlossenen Blöcke der Kampagne enthält.
+    """
+    def laden(self, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, ueberschreibungen=None):
+        schluessel = self._schluessel(seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen)
+        if schluessel in self.bloecke:
+            position, laenge = self.bloecke[schluessel]
+            with open(self.pfad, "rb") as datei:
+                datei.seek(position)
+                teilergebnis = teilergebnis_laden(io.BytesIO(datei.read(laenge)))
+            self.treffer += 1
+            return teilergebnis
+        teilergebnis = self.cache.laden(seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen) if self.cache is not None else None
+        if teilergebnis is None:
+            self.fehlschlaege += 1
+            return None
+        self._anhaengen(schluessel, teilergebnis)
+        self.treffer += 1
+        return teilergebnis
+
+    """
+    Funktion:           Speichern eines abgeschlossenen Blocks (bereits vorhandene Blöcke werden nicht erneut geschrieben)
+    Input:              teilergebnis (Teilergebnis des Blocks)
+                        seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen (Bestandteile des Schlüssels)
+    """
+    def speichern(self, teilergebnis, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, ueberschreibungen=None):
+        self._anhaengen(self._schluessel(seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen), teilergebnis)
+        if self.cache is not None:
+            self.cache.speichern(teilergebnis, seeds, szenario, handlungsoption, engine, varianzreduktion, ueberschreibungen)
+
+    def _anhaengen(self, schluessel, teilergebnis):
+        daten = teilergebnis_speichern(teilergebnis)
+        kombination, erster_seed, anzahl = schluessel
+        kopf = {"kombination": kombination, "erster_seed": erster_seed, "anzahl": anzahl, "bytes": len(daten), "sha256": hashlib.sha256(daten).hexdigest()}
+        eintrag = json.dumps(kopf).encode("utf-8") + b"\n" + daten
+        with self._sperre:
+            if schluessel in self.bloecke:
+                return
+            deskriptor = os.open(self.pfad, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                position = os.lseek(deskriptor, 0, os.SEEK_END) + len(eintrag) - len(daten)
+                rest = memoryview(eintrag)
+                while rest: # os.write kann weniger Bytes schreiben als übergeben
+                    rest = rest[os.write(deskriptor, rest):]
+                os.fsync(deskriptor)
+            finally:
+                os.close(deskriptor)
+            self.bloecke[schluessel] = (position, len(daten))
+
+    """
+    Funktion:           Begrenzung der Größe des eingeschlossenen Ergebniscaches (der Checkpoint selbst wird nicht verkleinert)
+    Output:             geloescht (Anzahl der gelöschten Cache-Blöcke)
+    """
+    def begrenzen(self, max_bytes=None):
+        return self.cache.begrenzen(max_bytes) if self.cache is not None else 0
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
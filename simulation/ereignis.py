@@ -0,0 +1,360 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die ereignisgesteuerte Simulationslogik (Ereignis-Engine).
+Der Zustand der Mülltonne ändert sich nur an Ereignistagen (reguläre Leertermine inkl. Ausfall, Sonderentleerung, Kapazitätsausbau).
+Anstatt jeden Tag einzeln zu simulieren, springt die Engine von Ereignis zu Ereignis: Die tägliche Müllmenge wird über ganze Intervalle
+aufsummiert (kumulierte Summe) und der Tag, an dem der Schwellenwert der Sonderentleerung erreicht wird, per binärer Suche bestimmt.
+Die Regeln und Zufallszahlen entsprechen der NumPy-Engine (vektorisiert.py), die Ergebnisse stimmen bis auf Rundungsdifferenzen überein.
+Für die Statistik werden pro Simulationslauf und Metrik nur Summe, Quadratsumme, Minimum und Maximum der Tageswerte intervallweise
+aus den kumulierten Summen bestimmt. Die Tageswerte selbst werden nur bei Bedarf (tageswerte(), z.B. für den Export der Trajektorien)
+aus den Ereignissen rekonstruiert.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import math
+import numpy as np
+# Globale Paramter importieren
+from parameter import TAGE, START_JAHR, modellparameter
+from kalender import kalender_tabelle
+from ergebnisspeicher import METRIKEN
+from vektorisiert import zufallszahlen, STROM_ABWESEND, STROM_ABWESEND_ANZAHL, STROM_BESUCH, STROM_BESUCH_ANZAHL, STROM_AUSFALL
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Tägliche Müllproduktion eines Simulationslaufs
+Input:              zufall (Zufallszahlen des Laufs der Form (ANZAHL_STROEME x tage))
+                    szenario (betrachteten Szenario)
+                    parameter (Modellparameter aus modellparameter())
+Output:             anzahl_bewohner, anzahl_gaeste (Anzahl pro Tag)
+                    muell (Müllmenge pro Tag in Liter)
+"""
+def muellproduktion(zufall, szenario, parameter):
+    bewohner, menge_pro_person = parameter["ANZAHL_BEWOHNER"], parameter["RESTMUELL_MENGE_PRO_PERSON_TAG"]
+    anzahl_bewohner = np.where(zufall[STROM_ABWESEND] < parameter["P_ABWESEND"], np.minimum(np.floor(zufall[STROM_ABWESEND_ANZAHL] * (bewohner + 1)), bewohner), bewohner)
+    anzahl_gaeste = np.where(zufall[STROM_BESUCH] < szenario["P_BESUCH"], np.minimum(1 + np.floor(zufall[STROM_BESUCH_ANZAHL] * 10), 10), 0)
+    muell = anzahl_bewohner * menge_pro_person + anzahl_gaeste * menge_pro_person * 0.25
+    return anzahl_bewohner, anzahl_gaeste, muell
+
+
+
+"""
+Funktion:           Kennzahlen der Tageswerte einer Metrik
+Input:              werte (Array der Tageswerte)
+Output:             kennzahlen (Liste [Summe, Quadratsumme, Minimum, Maximum])
+"""
+def kennzahlen_werte(werte):
+    kennzahlen = [float(werte.sum()), float((werte ** 2).sum()), float(werte.min()), float(werte.max())]
+    return kennzahlen
+
+
+"""
+Funktion:           Kennzahlen von Füllstand, Kapazität und Überfüllungsrate eines Simulationslaufs
+Input:              abschnitte (Liste von (von, bis, letzte Leerung, Kapazitätsindex) der Tage ohne Ereignis)
+                    termintage (Liste von (Füllstand, Kapazität) der Leertermine)
+                    kumuliert, kumuliert_summe, kumuliert_quadrat (kumulierte Müllmenge, deren kumulierte Summe und kumulierte Quadratsumme)
+                    staffel (Tonnenstaffel)
+Output:             kennzahlen (Dictionary Metrik -> [Summe, Quadratsumme, Minimum, Maximum])
+Funktionsweise:     Innerhalb eines Abschnitts ist die Kapazität konstant und der Füllstand kumuliert[t + 1] - kumuliert[letzte Leerung + 1] steigt monoton.
+                    Summe und Quadratsumme ergeben sich aus den kumulierten Summen, Minimum und Maximum aus dem ersten und letzten Tag.
+                    Die Tage mit Überfüllung bilden das Ende des Abschnitts (binäre Suche), ihre Überfüllungsrate wird ebenso über die kumulierten Summen bestimmt.
+                    Alle Abschnitte werden gemeinsam als Arrays berechnet.
+"""
+def kennzahlen_abschnitte(abschnitte, termintage, kumuliert, kumuliert_summe, kumuliert_quadrat, staffel):
+    von, bis, letzte_leerung, kapazitaet_index = np.array(abschnitte, dtype=np.int64).reshape(-1, 4).T
+    basis, kapazitaet = kumuliert[letzte_leerung + 1], np.asarray(staffel, dtype=float)[kapazitaet_index]
+    termin_fuellstand, termin_kapazitaet = np.array(termintage, dtype=float).reshape(-1, 2).T
+
+    def summen(von, bis):
+        anzahl = bis - von + 1
+        summe_kumuliert = kumuliert_summe[bis + 2] - kumuliert_summe[von + 1]
+        quadratsumme = (kumuliert_quadrat[bis + 2] - kumuliert_quadrat[von + 1]) - 2 * basis * summe_kumuliert + anzahl * basis ** 2
+        return anzahl, summe_kumuliert - anzahl * basis, np.maximum(0.0, quadratsumme)
+
+    anzahl, summe, quadratsumme = summen(von, bis)
+    ueberfuellt_ab = np.maximum(von, np.searchsorted(kumuliert, basis + kapazitaet, side="right") - 1) # erster Tag mit Füllstand > Kapazität
+    ueberfuellt_ab = np.minimum(ueberfuellt_ab, bis + 1)
+    anzahl_ueberfuellt, summe_ueberfuellt, quadratsumme_ueberfuellt = summen(ueberfuellt_ab, bis)
+    faktor = 100 / kapazitaet
+    rate_summe = np.where(anzahl_ueberfuellt > 0, (summe_ueberfuellt - anzahl_ueberfuellt * kapazitaet) * faktor, 0.0)
+    rate_quadratsumme = np.where(anzahl_ueberfuellt > 0, np.maximum(0.0, quadratsumme_ueberfuellt - 2 * kapazitaet * summe_ueberfuellt + anzahl_ueberfuellt * kapazitaet ** 2) * faktor ** 2, 0.0)
+    rate_erster = np.maximum(0.0, (kumuliert[von + 1] - basis - kapazitaet) * faktor)
+    rate_letzter = np.maximum(0.0, (kumuliert[bis + 1] - basis - kapazitaet) * faktor)
+    termin_rate = np.maximum(0.0, (termin_fuellstand - termin_kapazitaet) / termin_kapazitaet * 100)
+
+    def kennzahl(summe, quadratsumme, minima, maxima, werte):
+        return [float(summe.sum() + werte.sum()), float(quadratsumme.sum() + (werte ** 2).sum()),
+                float(min(minima.min(initial=np.inf), werte.min(initial=np.inf))), float(max(maxima.max(initial=-np.inf), werte.max(initial=-np.inf)))]
+
+    kennzahlen = {
+        "fuellmenge_tag": kennzahl(summe, quadratsumme, kumuliert[von + 1] - basis, kumuliert[bis + 1] - basis, termin_fuellstand),
+        "kapazitaet_tag": kennzahl(anzahl * kapazitaet, anzahl * kapazitaet ** 2, kapazitaet, kapazitaet, termin_kapazitaet),
+        "ueberfuellungsrate_tag": kennzahl(rate_summe, rate_quadratsumme, rate_erster, rate_letzter, termin_rate),
+    }
+    return kennzahlen
+
+
+# ----------------------------------------------------
+# ---------- Klassenmodell (Ereignislauf) ----------
+"""
+Ergebnis eines ereignisgesteuerten Simulationslaufs.
+Gespeichert werden nur die Ereignisse als Tupel (tag, art, wert) sowie die Gesamtkennzahlen:
+- "leerung": reguläre Leerung (wert = Tonnenkosten)
+- "ueberfuellung": Überfüllungskosten bei der regulären Leerung (wert = Kosten)
+- "ausfall": Ausfall der regulären Leerung (wert = 0)
+- "sonderentleerung": Sonderentleerung (wert = Kosten)
+- "ausbau": Kapazitätsausbau nach der Leerung (wert = neue Kapazität)
+Zusätzlich werden pro Metrik Summe, Quadratsumme, Minimum und Maximum der Tageswerte geführt (kennzahlen, bei ausfall_tag nur die Anzahl der Ausfälle).
+"""
+class Ereignislauf:
+    def __init__(self, seed, szenario, varianzreduktion, leertag, parameter):
+        self.seed = seed
+        self.szenario = szenario
+        self.varianzreduktion = varianzreduktion
+        self.parameter = parameter
+        self.leertag = leertag
+        self.ereignisse = []
+        self.gesamtkosten = 0.0
+        self.gesamtfuellmenge = 0.0
+        self.kennzahlen = {} # Metrik -> [Summe, Quadratsumme, Minimum, Maximum] der Tageswerte
+
+    """
+    Funktion:           Rekonstruktion der Tageswerte aller Metriken (nur bei Bedarf)
+    Output:             metriken (Dictionary der Metriken als Arrays der Länge TAGE, gleiche Schlüssel wie simulation_einzeln)
+    Funktionsweise:     Die Zufallszahlen werden aus dem Zufallsstartwert neu erzeugt.
+                        Der Füllstand pro Tag ergibt sich aus der kumulierten Müllmenge seit der letzten Leerung,
+                        Kapazität und Kosten aus den gespeicherten Ereignissen.
+    """
+    def tageswerte(self):
+        _, zufall = zufallszahlen([self.seed], TAGE, self.varianzreduktion)
+        anzahl_bewohner, anzahl_gaeste, muell = muellproduktion(zufall[:, 0, :], self.szenario, self.parameter)
+        kumuliert = np.concatenate([[0.0], np.cumsum(muell)])
+
+        metriken = {metrik: np.zeros(TAGE, dtype=datentyp) for metrik, datentyp in METRIKEN.items()}
+        metriken["anzahl_bewohner_tag"][:] = anzahl_bewohner
+        metriken["anzahl_besuch_tag"][:] = anzahl_gaeste
+
+        # Tage, an denen die Tonne geleert wurde (Füllstand ab dem Folgetag wieder bei 0)
+        letzte_leerung = np.full(TAGE, -1)
+        kapazitaet = np.full(TAGE, self.parameter["REST_MUELLTONE_STAFFEL"][0])
+        for tag, art, wert in self.ereignisse:
+            if art in ("leerung", "sonderentleerung") and tag + 1 < TAGE:
+                letzte_leerung[tag + 1] = tag
+            if art == "ausbau" and tag + 1 < TAGE:
+                kapazitaet[tag + 1:] = wert
+            if art == "ausfall":
+                metriken["ausfall_tag"][tag] = True
+            if art == "sonderentleerung":
+                metriken["sonderentleerung_kosten_tag"][tag] += wert
+            if art == "ueberfuellung":
+                metriken["ueberfuellung_kosten_tag"][tag] += wert
+            if art in ("leerung", "ueberfuellung", "sonderentleerung"):
+                metriken["kosten_tag"][tag] += wert
+        letzte_leerung = np.maximum.accumulate(letzte_leerung)
+
+        fuellstand = kumuliert[1:] - kumuliert[letzte_leerung + 1]
+        metriken["fuellmenge_tag"][:] = fuellstand
+        metriken["kapazitaet_tag"][:] = kapazitaet
+        metriken["ueberfuellungsrate_tag"][:] = np.maximum(0.0, (fuellstand - kapazitaet) / kapazitaet * 100)
+        return metriken
+
+
+
+"""
+Funktion:           Ereignisgesteuerte Simulation eines einzelnen Simulationslaufs
+Input:              seed (Zufallsstartwert)
+                    szenario (betrachteten Szenario)
+                    handlungsoption (betrachtete Handlungsoption)
+                    varianzreduktion (None, "crn" oder "antithetisch")
+                    parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+Output:             lauf (Ereignislauf mit Ereignissen, Gesamtkosten und Gesamtfüllmenge)
+Funktionsweise:     Die reguläre Leerung ist nur an den (kalenderabhängigen) Leerterminen möglich. Zwischen zwei Terminen wächst der Füllstand
+                    ausschließlich durch die Müllproduktion, der Füllstand eines Tages ist daher die Differenz der kumulierten Müllmenge.
+                    Bei der Handlungsoption Sonderentleerung wird der erste Tag, an dem der Schwellenwert erreicht wird, per binärer Suche
+                    in der kumulierten Müllmenge bestimmt. An den Leerterminen werden Ausfall, Überfüllungskosten, Kapazitätsausbau und Leerung ausgewertet.
+                    Die Gesamtfüllmenge (Summe der täglichen Füllstände) wird über die zweifach kumulierte Müllmenge intervallweise berechnet.
+                    Die Intervalle werden gesammelt, um am Ende die Kennzahlen von Füllstand, Kapazität und Überfüllungsrate zu bestimmen (kennzahlen_abschnitte).
+                    Die Kennzahlen der Kosten ergeben sich aus den Ereignissen (an allen anderen Tagen 0).
+"""
+def simulation_ereignis_lauf(seed, szenario, handlungsoption, varianzreduktion=None, parameter=None):
+    parameter = modellparameter(parameter)
+    staffel, staffel_kosten = parameter["REST_MUELLTONE_STAFFEL"], parameter["REST_MUELLTONE_KOSTEN_STAFFEL"]
+    schwellenwert, menge_pro_person = parameter["SONDERENTLEERUNG_FUELLMENGE_PROZENT"], parameter["RESTMUELL_MENGE_PRO_PERSON_TAG"]
+    leertage, zufall = zufallszahlen([seed], TAGE, varianzreduktion)
+    leertag, zufall = int(leertage[0]), zufall[:, 0, :]
+    anzahl_bewohner, anzahl_gaeste, muell = muellproduktion(zufall, szenario, parameter)
+    # Zuwachs in der Reihenfolge der täglichen Müllproduktion (Bewohner, Gäste) für den exakten Füllstand am Leertermin
+    zuwachs = np.column_stack([anzahl_bewohner * menge_pro_person, anzahl_gaeste * menge_pro_person * 0.25]).ravel()
+    kumuliert = np.concatenate([[0.0], np.cumsum(muell)]) # kumuliert[t + 1] = Müllmenge der Tage 0 bis t
+    kumuliert_summe = np.concatenate([[0.0], np.cumsum(kumuliert)]) # kumuliert_summe[k] = Summe kumuliert[0] bis kumuliert[k - 1]
+    kumuliert_quadrat = np.concatenate([[0.0], np.cumsum(kumuliert ** 2)]) # kumuliert_quadrat[k] = Summe kumuliert[0]^2 bis kumuliert[k - 1]^2
+    termine = np.flatnonzero(kalender_tabelle(TAGE, START_JAHR).leerungstermine[leertag])
+
+    lauf = Ereignislauf(seed, szenario, varianzreduktion, leertag, parameter)
+    kapazitaet_index = 0 # Startkapazität (kleinste Tonnengröße)
+    wochen_ueberfuellt = 0
+    letzte_leerung = -1 # Tag der letzten Leerung (Füllstand am Tag t = kumuliert[t + 1] - kumuliert[letzte_leerung + 1])
+    tag = 0 # erster noch nicht ausgewerteter Tag
+
+    abschnitte = [] # Tage ohne Ereignis: (von, bis, letzte Leerung, Kapazitätsindex), Kennzahlen werden am Ende gemeinsam bestimmt
+    termintage = [] # Leertermine: (Füllstand, Kapazität)
+
+    # Summe der Füllstände der Tage von bis (einschließlich) seit der letzten Leerung
+    def fuellsumme(von, bis):
+        basis = kumuliert[letzte_leerung + 1]
+        abschnitte.append((von, bis, letzte_leerung, kapazitaet_index))
+        return (kumuliert_summe[bis + 2] - kumuliert_summe[von + 1]) - (bis - von + 1) * basis
+
+    for termin in list(termine) + [TAGE]: # TAGE als Abschluss des letzten Intervalls
+        # Intervall bis zum nächsten Termin: nur Sonderentleerungen möglich
+        while handlungsoption["sonderentleerung"] and tag < termin:
+            grenze = kumuliert[letzte_leerung + 1] + schwellenwert * staffel[kapazitaet_index] / 100
+            schwelle_tag = max(tag, int(np.searchsorted(kumuliert, grenze, side="left")) - 1)
+            if schwelle_tag >= termin:
+                break
+            lauf.gesamtfuellmenge += fuellsumme(tag, schwelle_tag)
+            kosten = staffel_kosten[staffel[kapazitaet_index]] * 1.4
+            lauf.ereignisse.append((schwelle_tag, "sonderentleerung", kosten))
+            lauf.gesamtkosten += kosten
+            letzte_leerung, tag = schwelle_tag, schwelle_tag + 1
+        if tag < termin:
+            lauf.gesamtfuellmenge += fuellsumme(tag, termin - 1)
+        if termin == TAGE:
+            break
+
+        # Leertermin
+        # Füllstand wird Tag für Tag aufaddiert (wie in der NumPy-Engine), damit die Überfüllungskosten (Rundung auf 70 Liter) identisch sind
+        fuellstand = float(np.cumsum(zuwachs[2 * (letzte_leerung + 1):2 * (termin + 1)])[-1])
+        kapazitaet = staffel[kapazitaet_index]
+        lauf.gesamtfuellmenge += fuellstand
+        termintage.append((fuellstand, kapazitaet))
+        if zufall[STROM_AUSFALL, termin] <= szenario["P_AUSFALL"]:
+            lauf.ereignisse.append((termin, "ausfall", 0.0))
+            # Am Ausfalltag ist eine Sonderentleerung möglich
+            if handlungsoption["sonderentleerung"] and fuellstand / kapazitaet * 100 >= schwellenwert:
+                kosten = staffel_kosten[kapazitaet] * 1.4
+                lauf.ereignisse.append((termin, "sonderentleerung", kosten))
+                lauf.gesamtkosten += kosten
+                letzte_leerung = termin
+        else:
+            # Überfüllungskosten und Anzahl der Überfüllungen
+            kosten_ueberfuellung = math.ceil(max(0.0, fuellstand - kapazitaet) / 70) * 9
+            if kosten_ueberfuellung:
+                lauf.ereignisse.append((termin, "ueberfuellung", kosten_ueberfuellung))
+            wochen_ueberfuellt = wochen_ueberfuellt + 1 if fuellstand > kapazitaet else 0
+            # Kapazitätsausbau nach drei (UEBERFUELLUNGEN_KAPAZITAETSAUSBAU) aufeinanderfolgenden Überfüllungen
+            if handlungsoption["kapazitaetsausbau"] and wochen_ueberfuellt >= parameter["UEBERFUELLUNGEN_KAPAZITAETSAUSBAU"]:
+                if kapazitaet_index + 1 < len(staffel):
+                    kapazitaet_index += 1
+                    lauf.ereignisse.append((termin, "ausbau", staffel[kapazitaet_index]))
+                wochen_ueberfuellt = 0
+            tonnen_kosten = staffel_kosten[staffel[kapazitaet_index]]
+            lauf.ereignisse.append((termin, "leerung", tonnen_kosten))
+            lauf.gesamtkosten += tonnen_kosten + kosten_ueberfuellung
+            letzte_leerung = termin
+        tag = termin + 1
+
+    lauf.kennzahlen = kennzahlen_abschnitte(abschnitte, termintage, kumuliert, kumuliert_summe, kumuliert_quadrat, staffel)
+    # Kennzahlen der übrigen Metriken (Müllproduktion aus den Tageswerten, Kosten und Ausfälle aus den Ereignissen)
+    lauf.kennzahlen["anzahl_bewohner_tag"] = kennzahlen_werte(anzahl_bewohner)
+    lauf.kennzahlen["anzahl_besuch_tag"] = kennzahlen_werte(anzahl_gaeste)
+    tageskosten = {"kosten_tag": {}, "sonderentleerung_kosten_tag": {}, "ueberfuellung_kosten_tag": {}}
+    for ereignis_tag, art, wert in lauf.ereignisse:
+        if art in ("leerung", "ueberfuellung", "sonderentleerung"):
+            tageskosten["kosten_tag"][ereignis_tag] = tageskosten["kosten_tag"].get(ereignis_tag, 0.0) + wert
+        if art in ("ueberfuellung", "sonderentleerung"):
+            tageskosten[f"{art}_kosten_tag"][ereignis_tag] = tageskosten[f"{art}_kosten_tag"].get(ereignis_tag, 0.0) + wert
+    for metrik, kosten in tageskosten.items():
+        werte = np.array(list(kosten.values()) + ([0.0] if len(kosten) < TAGE else []))
+        lauf.kennzahlen[metrik] = kennzahlen_werte(werte)
+    lauf.kennzahlen["kosten_tag"][0] = lauf.gesamtkosten # gleiche Summe wie die laufend berechneten Gesamtkosten
+    lauf.kennzahlen["fuellmenge_tag"][0] = lauf.gesamtfuellmenge
+    lauf.kennzahlen["ausfall_tag"] = [sum(1 for _, art, _ in lauf.ereignisse if art == "ausfall")]
+    return lauf
+
+
+
+"""
+Funktion:           Ereignisgesteuerte Simulation eines Blocks von Simulationsläufen
+Input:              seeds (Zufallsstartwerte der Simulationsläufe)
+                    szenario (betrachteten Szenario)
+                    handlungsoption (betrachtete Handlungsoption)
+                    speicher (Ergebnisspeicher für die Tageswerte; None = nur Ereignisse und Gesamtkennzahlen)
+                    start (Zeile des ersten Simulationslaufs im Ergebnisspeicher)
+                    varianzreduktion (None, "crn" oder "antithetisch")
+                    parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+Output:             laeufe (Liste der Ereignisläufe)
+Funktionsweise:     Jeder Simulationslauf wird ereignisgesteuert simuliert.
+                    Nur wenn ein Ergebnisspeicher übergeben wird, werden die Tageswerte rekonstruiert und in den Speicher geschrieben.
+"""
+def simulation_ereignis(seeds, szenario, handlungsoption, speicher=None, start=0, varianzreduktion=None, parameter=None):
+    parameter = modellparameter(parameter)
+    laeufe = [simulation_ereignis_lauf(seed, szenario, handlungsoption, varianzreduktion, parameter) for seed in seeds]
+    if speicher is not None:
+        for i, lauf in enumerate(laeufe):
+            for metrik, werte in lauf.tageswerte().items():
+                speicher[metrik][start + i] = werte
+    return laeufe
+
+
+
+# ------------------------------------------------------
+# ---------- Klassenmodell (Ereignisspeicher) ----------
+"""
+Ergebnis eines Blocks von Ereignisläufen ohne Tageswerte.
+Bietet die Teile der Schnittstelle des Ergebnisspeichers, die für das Teilergebnis benötigt werden:
+summe() liefert die Summe einer Metrik pro Simulationslauf, kennzahlen() die Kennzahlen des Blocks im Format des StatistikAkkumulators.
+"""
+class Ereignisspeicher:
+    def __init__(self, laeufe):
+        self.laeufe = laeufe
+        self.durchlaeufe = len(laeufe)
+        self.tage = TAGE
+
+    def __len__(self):
+        return self.durchlaeufe
+
+    """
+    Funktion:           Summe einer Metrik pro Simulationslauf (z.B. Gesamtkosten)
+    Input:              metrik (Name der Metrik)
+    Output:             summen (Array der Länge durchlaeufe)
+    """
+    def summe(self, metrik):
+        summen = np.array([lauf.kennzahlen[metrik][0] for lauf in self.laeufe], dtype=float)
+        return summen
+
+    """
+    Funktion:           Kennzahlen aller Metriken des Blocks
+    Output:             kennzahlen (Dictionary Metrik -> Anzahl, Mittelwert, M2, Minimum und Maximum bzw. Anzahl und Anzahl True)
+    Funktionsweise:     Die Summen und Quadratsummen der Simulationsläufe werden addiert, M2 = Quadratsumme - Summe^2 / Anzahl.
+                        Minimum und Maximum werden im Datentyp des Ergebnisspeichers ausgegeben (z.B. ganzzahlige Kapazität).
+    """
+    def kennzahlen(self):
+        anzahl = self.durchlaeufe * TAGE
+        kennzahlen = {}
+        for metrik, datentyp in METRIKEN.items():
+            werte = np.array([lauf.kennzahlen[metrik] for lauf in self.laeufe], dtype=float)
+            if datentyp == np.bool_:
+                kennzahlen[metrik] = {"anzahl": anzahl, "anzahl_true": int(werte[:, 0].sum())}
+                continue
+            summe, quadratsumme = werte[:, 0].sum(), werte[:, 1].sum()
+            kennzahlen[metrik] = {
+                "anzahl": anzahl,
+                "mittelwert": float(summe / anzahl),
+                "m2": float(max(0.0, quadratsumme - summe ** 2 / anzahl)),
+                "minimum": np.dtype(datentyp).type(werte[:, 2].min()).item(),
+                "maximum": np.dtype(datentyp).type(werte[:, 3].max()).item(),
+            }
+        return kennzahlen
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,93 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet den spaltenorientierten Ergebnisspeicher der Simulation.
+Anstatt pro Simulationslauf neun wachsende Python-Listen zu füllen, wird pro Metrik ein zusammenhängendes, typisiertes Array
+der Form (Durchläufe x TAGE) vorab angelegt, in das die Simulation über den Index schreibt.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import numpy as np
+
+
+# Metriken der Simulation und ihr Datentyp im Speicher (Boolean-Werte werden als ein Byte gespeichert)
+METRIKEN = {
+    "kosten_tag": np.float64, # Kosten
+    "anzahl_bewohner_tag": np.int32, # Anzahl der Bewohner
+    "anzahl_besuch_tag": np.int32, # Anzahl der Besucher
+    "fuellmenge_tag": np.float64, # Füllmenge der Tonne
+    "kapazitaet_tag": np.int32, # Kapazität der Tonne
+    "ueberfuellungsrate_tag": np.float64, # Überfüllungsrate
+    "sonderentleerung_kosten_tag": np.float64, # Kosten für die Sonderentleerung
+    "ueberfuellung_kosten_tag": np.float64, # Kosten bei Überfüllung
+    "ausfall_tag": np.bool_, # Indikator, ob Ausfall stattgefunden hat
+}
+
+
+# ------------------------------------------------------
+# ---------- Klassenmodell (Ergebnisspeicher) ----------
+"""
+Der Ergebnisspeicher enthält pro Metrik ein Array der Form (durchlaeufe x tage).
+Zeile = Simulationslauf, Spalte = Simulationstag.
+Ein einzelner Simulationslauf erhält über lauf() Sichten (Views) auf seine Zeilen und schreibt direkt in den gemeinsamen Speicher.
+Statistiken, Histogramme und Export lesen die Arrays ohne Kopie.
+"""
+class Ergebnisspeicher:
+    def __init__(self, durchlaeufe, tage):
+        self.durchlaeufe = durchlaeufe
+        self.tage = tage
+        self.daten = {metrik: np.zeros((durchlaeufe, tage), dtype=datentyp) for metrik, datentyp in METRIKEN.items()}
+
+    def __getitem__(self, metrik):
+        return self.daten[metrik]
+
+    def __iter__(self):
+        return iter(self.daten)
+
+    def __len__(self):
+        return self.durchlaeufe
+
+    """
+    Funktion:           Sichten auf die Zeilen eines Simulationslaufs
+    Input:              index (Zeile des Simulationslaufs)
+    Output:             metriken (Dictionary mit einer Sicht pro Metrik, Länge tage)
+    """
+    def lauf(self, index):
+        metriken = {metrik: werte[index] for metrik, werte in self.daten.items()}
+        return metriken
+
+    """
+    Funktion:           Summe einer Metrik pro Simulationslauf (z.B. Gesamtkosten)
+    Input:              metrik (Name der Metrik)
+    Output:             summen (Array der Länge durchlaeufe)
+    """
+    def summe(self, metrik):
+        summen = self.daten[metrik].sum(axis=1)
+        return summen
+
+    """
+    Funktion:           Übernahme der Simulationsläufe eines anderen Ergebnisspeichers (z.B. eines Arbeitspakets)
+    Input:              start (Zeile, ab der die Simulationsläufe eingefügt werden)
+                        anderer (Ergebnisspeicher mit gleicher Anzahl an Tagen)
+    """
+    def einfuegen(self, start, anderer):
+        for metrik, werte in self.daten.items():
+            werte[start:start + anderer.durchlaeufe] = anderer.daten[metrik]
+
+    """
+    Funktion:           Speicherbedarf aller Metrik-Arrays
+    Output:             anzahl_bytes (Speicherbedarf in Bytes)
+    """
+    def speicherbedarf(self):
+        anzahl_bytes = sum(werte.nbytes for werte in self.daten.values())
+        return anzahl_bytes
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,307 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Flottensimulation (Stadtteil mit vielen Wohnhäusern).
+Jedes Gebäude hat eine eigene Anzahl an Bewohnern und eine eigene Tonne. Die Gebäude sind Abfuhrtouren zugeordnet:
+Alle Gebäude einer Tour teilen sich den Leertag und damit Feiertage und Ausfälle der Entsorgung (ein Ausfall trifft die ganze Tour).
+Die Simulation erfolgt als eine vektorisierte Simulation aller Gebäude gleichzeitig (Tag für Tag, Zustand als Arrays der Länge Anzahl Gebäude).
+Gespeichert werden nur Summen pro Gebäude und pro Tag, der Speicherbedarf wächst daher nicht mit Gebäude x Tage.
+Ausführung über die Kommandozeile, z.B.:
+    python simulation/flotte.py --gebaeude 10000 --touren 40 --szenario Ausfall --handlungsoption Kapazitaetsausbau
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from parameter import TAGE, START_JAHR, modellparameter, arbeitsprozess_initialisieren
+from kalender import kalender_tabelle
+
+
+# ---------------------------------------------
+# ---------- Klassenmodell (Flotte) ----------
+"""
+Beschreibung der Gebäude eines Stadtteils (Index = Gebäude):
+- bewohner: Anzahl der Bewohner pro Gebäude
+- kapazitaet: Kapazität der Tonne zu Beginn (muss in REST_MUELLTONE_STAFFEL enthalten sein)
+- tour: Abfuhrtour des Gebäudes (0 bis anzahl_touren - 1)
+"""
+class Flotte:
+    def __init__(self, bewohner, kapazitaet, tour):
+        self.bewohner = np.asarray(bewohner, dtype=np.int64)
+        self.kapazitaet = np.asarray(kapazitaet, dtype=np.int64)
+        self.tour = np.asarray(tour, dtype=np.int64)
+        if not (len(self.bewohner) == len(self.kapazitaet) == len(self.tour)):
+            raise ValueError("bewohner, kapazitaet und tour müssen gleich lang sein")
+        self.anzahl_touren = int(self.tour.max()) + 1 if len(self.tour) else 0
+
+    def __len__(self):
+        return len(self.bewohner)
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Erzeugung eines zufälligen Stadtteils
+Input:              anzahl_gebaeude (Anzahl der Gebäude)
+                    anzahl_touren (Anzahl der Abfuhrtouren, die Gebäude werden reihum verteilt)
+                    seed (Zufallsstartwert für die Gebäude)
+                    bewohner_min, bewohner_max (Bereich der Anzahl der Bewohner pro Gebäude)
+                    parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+Output:             flotte (Flotte)
+Funktionsweise:     Die Tonne jedes Gebäudes ist die kleinste Tonne, die das erwartete Müllaufkommen von zwei Wochen aufnimmt
+                    (bzw. die größte Tonne, wenn keine ausreicht).
+"""
+def flotte_erzeugen(anzahl_gebaeude, anzahl_touren, seed=0, bewohner_min=1, bewohner_max=40, parameter=None):
+    parameter = modellparameter(parameter)
+    rng = np.random.default_rng(seed)
+    bewohner = rng.integers(bewohner_min, bewohner_max + 1, anzahl_gebaeude)
+    staffel = np.array(parameter["REST_MUELLTONE_STAFFEL"])
+    bedarf = bewohner * parameter["RESTMUELL_MENGE_PRO_PERSON_TAG"] * 14
+    kapazitaet = staffel[np.minimum(np.searchsorted(staffel, bedarf), len(staffel) - 1)]
+    tour = np.arange(anzahl_gebaeude) % anzahl_touren
+    return Flotte(bewohner, kapazitaet, tour)
+
+
+
+"""
+Funktion:           Einlesen eines Stadtteils aus einer CSV-Datei
+Input:              pfad (CSV-Datei mit den Spalten Bewohner, Kapazitaet und Tour; eine Zeile pro Gebäude)
+Output:             flotte (Flotte)
+"""
+def flotte_laden(pfad):
+    import pandas as pd # Import zur Laufzeit (nur für die Ein- und Ausgabe benötigt)
+    df = pd.read_csv(pfad)
+    return Flotte(df["Bewohner"], df["Kapazitaet"], df["Tour"])
+
+
+
+"""
+Funktion:           Kopie eines Zufallsgenerators ab einer Position seiner Folge gleichverteilter Zufallszahlen
+Input:              rng (Zufallsgenerator mit PCG64, wird nicht verändert)
+                    position (Anzahl der übersprungenen Zufallszahlen)
+Output:             strom (Zufallsgenerator, dessen erste Zufallszahl der Zufallszahl an der Position entspricht)
+Funktionsweise:     Der Generator wird ohne Ziehen der übersprungenen Zufallszahlen vorgespult (eine Zufallszahl = ein 64-Bit-Schritt).
+"""
+def zufallsstrom_ab(rng, position):
+    generator = np.random.PCG64()
+    generator.state = rng.bit_generator.state
+    generator.advance(position)
+    return np.random.Generator(generator)
+
+
+
+"""
+Funktion:           Simulation eines Stadtteils (ein Simulationslauf)
+Input:              flotte (Flotte)
+                    szenario (betrachteten Szenario)
+                    handlungsoption (betrachtete Handlungsoption, gilt für alle Gebäude)
+                    seed (Zufallsstartwert des Simulationslaufs)
+                    parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py; ANZAHL_BEWOHNER wird durch die Flotte ersetzt)
+Output:             ergebnis (Dictionary mit Summen pro Gebäude ("gebaeude") und Summen über alle Gebäude pro Tag ("tage"))
+Funktionsweise:     Zu Beginn wird pro Tour der Leertag gezogen. Pro Tag werden die Zufallszahlen aller Gebäude (Abwesenheit, Besuch)
+                    und aller Touren (Ausfall) gezogen. Die Zufallszahlen folgen der Anordnung der NumPy-Engine (vektorisiert.zufallszahlen):
+                    nach dem Leertag pro Prozess (Abwesenheit, Anzahl, Besuch, Anzahl, Ausfall) die Zufallszahlen aller Tage, innerhalb
+                    eines Tages aller Gebäude bzw. Touren. Jeder Prozess erhält dazu eine Kopie des Generators, die an den Beginn seiner
+                    Zufallszahlen vorgespult wird (zufallsstrom_ab). Ein Stadtteil mit einem Gebäude und einer Tour entspricht daher
+                    einem Simulationslauf der NumPy-Engine mit demselben Zufallsstartwert. Die Reihenfolge der Prozesse innerhalb eines Tages entspricht der Methode
+                    muellzyklus_taeglich des Klassenmodells: Müllproduktion, Leertermin und Ausfall der Tour, Sonderentleerung,
+                    Überfüllung und Kapazitätsausbau, reguläre Leerung.
+"""
+def simulation_flotte(flotte, szenario, handlungsoption, seed=1000, parameter=None):
+    parameter = modellparameter(parameter)
+    anzahl = len(flotte)
+    rng = np.random.default_rng(seed)
+    staffel = np.array(parameter["REST_MUELLTONE_STAFFEL"], dtype=np.int64)
+    staffel_kosten = np.array([parameter["REST_MUELLTONE_KOSTEN_STAFFEL"][kapa] for kapa in parameter["REST_MUELLTONE_STAFFEL"]])
+    kapazitaet_index = np.searchsorted(staffel, flotte.kapazitaet)
+    if np.any(kapazitaet_index >= len(staffel)) or np.any(staffel[np.minimum(kapazitaet_index, len(staffel) - 1)] != flotte.kapazitaet):
+        raise ValueError("Die Kapazitäten der Gebäude müssen in REST_MUELLTONE_STAFFEL enthalten sein")
+    bewohner, menge_pro_person = flotte.bewohner, parameter["RESTMUELL_MENGE_PRO_PERSON_TAG"]
+
+    # Leertag pro Tour und Leertermine (Feiertage sind in der gemeinsamen Kalendertabelle berücksichtigt)
+    leertage = rng.integers(0, 5, flotte.anzahl_touren)
+    termine = kalender_tabelle(TAGE, START_JAHR).leerungstermine[leertage] # (Touren x TAGE)
+    # Zufallsströme der Prozesse (Position in der Folge der Zufallszahlen nach dem Leertag)
+    rng_abwesend, rng_abwesend_anzahl, rng_besuch, rng_besuch_anzahl = (zufallsstrom_ab(rng, prozess * TAGE * anzahl) for prozess in range(4))
+    rng_ausfall = zufallsstrom_ab(rng, 4 * TAGE * anzahl)
+
+    # Zustand der Gebäude
+    fuellstand = np.zeros(anzahl)
+    wochen_ueberfuellt = np.zeros(anzahl, dtype=np.int64)
+
+    # Summen pro Gebäude und pro Tag
+    gebaeude = {
+        "gesamtkosten": np.zeros(anzahl), "gesamtfuellmenge": np.zeros(anzahl), "ueberfuellungskosten": np.zeros(anzahl),
+        "ueberfuellungsrate": np.zeros(anzahl), "ueberfuellte_tage": np.zeros(anzahl, dtype=np.int64),
+        "sonderentleerungen": np.zeros(anzahl, dtype=np.int64), "ausbauten": np.zeros(anzahl, dtype=np.int64),
+    }
+    tage = {"kosten": np.zeros(TAGE), "ueberfuellte_gebaeude": np.zeros(TAGE, dtype=np.int64), "ausgefallene_touren": np.zeros(TAGE, dtype=np.int64)}
+
+    for tag in range(TAGE):
+        abwesend, abwesend_anzahl, besuch, besuch_anzahl = rng_abwesend.random(anzahl), rng_abwesend_anzahl.random(anzahl), rng_besuch.random(anzahl), rng_besuch_anzahl.random(anzahl)
+        ausfall_zufall = rng_ausfall.random(flotte.anzahl_touren)
+
+        # Prozess: Müllproduktion
+        anzahl_bewohner = np.where(abwesend < parameter["P_ABWESEND"], np.minimum(np.floor(abwesend_anzahl * (bewohner + 1)), bewohner), bewohner)
+        anzahl_gaeste = np.where(besuch < szenario["P_BESUCH"], np.minimum(1 + np.floor(besuch_anzahl * 10), 10), 0)
+        fuellstand += anzahl_bewohner * menge_pro_person
+        fuellstand += anzahl_gaeste * menge_pro_person * 0.25
+        kapazitaet = staffel[kapazitaet_index]
+        ueberfuellt = fuellstand > kapazitaet
+        gebaeude["ueberfuellungsrate"] += np.maximum(0.0, (fuellstand - kapazitaet) / kapazitaet * 100)
+        gebaeude["ueberfuellte_tage"] += ueberfuellt
+        gebaeude["gesamtfuellmenge"] += fuellstand
+        tage["ueberfuellte_gebaeude"][tag] = np.count_nonzero(ueberfuellt)
+
+        # Prozess: reguläre Leerung - Teil 1: Leertermin und Ausfall der Tour
+        ist_ausfall_tour = termine[:, tag] & (ausfall_zufall <= szenario["P_AUSFALL"])
+        findet_regulaere_leerung_statt = (termine[:, tag] & ~ist_ausfall_tour)[flotte.tour]
+        tage["ausgefallene_touren"][tag] = np.count_nonzero(ist_ausfall_tour)
+
+        # Prozess: Sonderentleerung
+        kosten_sonderentleerung = 0.0
+        if handlungsoption["sonderentleerung"]:
+            sonderentleerung = ~findet_regulaere_leerung_statt & ((fuellstand / kapazitaet * 100) >= parameter["SONDERENTLEERUNG_FUELLMENGE_PROZENT"])
+            fuellstand[sonderentleerung] = 0.0
+            kosten_sonderentleerung = np.where(sonderentleerung, staffel_kosten[kapazitaet_index] * 1.4, 0.0)
+            gebaeude["sonderentleerungen"] += sonderentleerung
+
+        # Prozess: Überfüllung
+        ueber_liter = np.maximum(0.0, fuellstand - kapazitaet)
+        kosten_ueberfuellung = np.where(findet_regulaere_leerung_statt, np.ceil(ueber_liter / 70) * 9, 0.0)
+        wochen_ueberfuellt = np.where(findet_regulaere_leerung_statt, np.where(fuellstand > kapazitaet, wochen_ueberfuellt + 1, 0), wochen_ueberfuellt)
+        if handlungsoption["kapazitaetsausbau"]:
+            ausbau = findet_regulaere_leerung_statt & (wochen_ueberfuellt >= parameter["UEBERFUELLUNGEN_KAPAZITAETSAUSBAU"])
+            gebaeude["ausbauten"] += ausbau & (kapazitaet_index + 1 < len(staffel))
+            kapazitaet_index = np.where(ausbau, np.minimum(kapazitaet_index + 1, len(staffel) - 1), kapazitaet_index)
+            wochen_ueberfuellt[ausbau] = 0
+
+        # Prozess: reguläre Leerung - Teil 2: Tatsächliche Leerung inkl. Kostenbestimmung
+        tonnen_kosten = np.where(findet_regulaere_leerung_statt, staffel_kosten[kapazitaet_index], 0.0)
+        fuellstand[findet_regulaere_leerung_statt] = 0.0
+
+        # Gesamtkosten (Basiskosten + Überfüllung + Sonderleerung)
+        kosten = tonnen_kosten + kosten_ueberfuellung + kosten_sonderentleerung
+        gebaeude["gesamtkosten"] += kosten
+        gebaeude["ueberfuellungskosten"] += kosten_ueberfuellung
+        tage["kosten"][tag] = kosten.sum()
+
+    gebaeude["ueberfuellungsrate"] /= TAGE # mittlere tägliche Überfüllungsrate
+    gebaeude["endkapazitaet"] = staffel[kapazitaet_index]
+    ergebnis = {"gebaeude": gebaeude, "tage": tage}
+    return ergebnis
+
+
+
+"""
+Funktion:           Durchführung mehrerer Simulationsläufe eines Stadtteils
+Input:              flotte, szenario, handlungsoption, parameter (siehe simulation_flotte)
+                    durchlaeufe (Anzahl der Simulationsläufe mit den Zufallsstartwerten 1000, 1001, ...)
+                    anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+Output:             laeufe (Liste der Ergebnisse von simulation_flotte in der Reihenfolge der Zufallsstartwerte)
+"""
+def monte_carlo_flotte(flotte, szenario, handlungsoption, durchlaeufe=1, anzahl_prozesse=1, parameter=None):
+    seeds = [1000 + i for i in range(durchlaeufe)]
+    if anzahl_prozesse <= 1 or durchlaeufe <= 1:
+        return [simulation_flotte(flotte, szenario, handlungsoption, seed, parameter) for seed in seeds]
+    kalender_tabelle(TAGE, START_JAHR) # Kalendertabelle vor dem Start der Prozesse erstellen (wird beim Forken übernommen)
+    with ProcessPoolExecutor(max_workers=anzahl_prozesse, initializer=arbeitsprozess_initialisieren, initargs=(TAGE, START_JAHR)) as pool:
+        futures = [pool.submit(simulation_flotte, flotte, szenario, handlungsoption, seed, parameter) for seed in seeds]
+        return [future.result() for future in futures]
+
+
+
+"""
+Funktion:           Auswertung der Simulationsläufe eines Stadtteils
+Input:              flotte (Flotte)
+                    laeufe (Ergebnisse von monte_carlo_flotte)
+Output:             df_gebaeude (DataFrame mit einer Zeile pro Gebäude: Beschreibung und Mittelwerte der Summen über die Simulationsläufe)
+                    df_zusammenfassung (DataFrame mit den Kennzahlen des Stadtteils)
+Funktionsweise:     Für den Stadtteil werden die Gesamtkosten (Summe aller Gebäude) inkl. 95%-Konfidenzintervall über die Simulationsläufe,
+                    die Verteilung der Kosten pro Gebäude sowie die Gleichzeitigkeit von Überfüllungen und Ausfällen (pro Tag) bestimmt.
+"""
+def auswertung_flotte(flotte, laeufe):
+    import pandas as pd # Import zur Laufzeit (nur für die Ein- und Ausgabe benötigt)
+    df_gebaeude = pd.DataFrame({"Gebaeude": np.arange(len(flotte)), "Tour": flotte.tour, "Bewohner": flotte.bewohner, "Kapazitaet": flotte.kapazitaet})
+    for name in laeufe[0]["gebaeude"]:
+        df_gebaeude[name] = np.mean([lauf["gebaeude"][name] for lauf in laeufe], axis=0)
+
+    stadtteil_kosten = np.array([lauf["gebaeude"]["gesamtkosten"].sum() for lauf in laeufe])
+    halbbreite = 1.96 * stadtteil_kosten.std(ddof=1) / math.sqrt(len(laeufe)) if len(laeufe) > 1 else math.nan
+    ueberfuellte_gebaeude = np.concatenate([lauf["tage"]["ueberfuellte_gebaeude"] for lauf in laeufe])
+    ausgefallene_touren = np.concatenate([lauf["tage"]["ausgefallene_touren"] for lauf in laeufe])
+    kennzahlen = {
+        "Gebäude": len(flotte),
+        "Touren": flotte.anzahl_touren,
+        "Bewohner": int(flotte.bewohner.sum()),
+        "Durchläufe": len(laeufe),
+        "Gesamtkosten Stadtteil (Durchschnitt)": stadtteil_kosten.mean(),
+        "Gesamtkosten Stadtteil (95%-KI Halbbreite)": halbbreite,
+        "Gesamtkosten pro Gebäude (Durchschnitt)": df_gebaeude["gesamtkosten"].mean(),
+        "Gesamtkosten pro Gebäude (Median)": df_gebaeude["gesamtkosten"].median(),
+        "Gesamtkosten pro Gebäude (95%-Quantil)": df_gebaeude["gesamtkosten"].quantile(0.95),
+        "Gesamtkosten pro Bewohner (Durchschnitt)": stadtteil_kosten.mean() / flotte.bewohner.sum(),
+        "Überfüllungskosten Stadtteil (Durchschnitt)": df_gebaeude["ueberfuellungskosten"].sum(),
+        "Anteil überfüllter Gebäude-Tage": df_gebaeude["ueberfuellte_tage"].sum() / (len(flotte) * TAGE),
+        "Überfüllungsrate (Durchschnitt)": df_gebaeude["ueberfuellungsrate"].mean(),
+        "Überfüllte Gebäude pro Tag (Durchschnitt)": ueberfuellte_gebaeude.mean(),
+        "Überfüllte Gebäude pro Tag (Maximum)": int(ueberfuellte_gebaeude.max()),
+        "Ausgefallene Touren (Summe pro Durchlauf)": ausgefallene_touren.sum() / len(laeufe),
+        "Sonderentleerungen pro Gebäude (Durchschnitt)": df_gebaeude["sonderentleerungen"].mean(),
+        "Kapazitätsausbauten pro Gebäude (Durchschnitt)": df_gebaeude["ausbauten"].mean(),
+    }
+    df_zusammenfassung = pd.DataFrame({"Kennzahl": list(kennzahlen), "Wert": [round(float(wert), 4) for wert in kennzahlen.values()]})
+    return df_gebaeude, df_zusammenfassung
+
+
+
+"""
+Funktion:           Kommandozeile der Flottensimulation
+Funktionsweise:     Szenario und Handlungsoption werden aus main.py übernommen. Die Gebäude werden zufällig erzeugt oder aus einer CSV-Datei gelesen.
+                    Die Ergebnisse werden in output/flotte_gebaeude.csv und output/flotte_zusammenfassung.csv gespeichert.
+"""
+def main():
+    from main import SZENARIEN, HANDLUNGSOPTIONEN
+
+    parser = argparse.ArgumentParser(description="Flottensimulation eines Stadtteils")
+    parser.add_argument("--gebaeude", type=int, default=1000, help="Anzahl der zufällig erzeugten Gebäude")
+    parser.add_argument("--touren", type=int, default=10, help="Anzahl der Abfuhrtouren")
+    parser.add_argument("--eingabe", default=None, help="CSV-Datei mit den Spalten Bewohner, Kapazitaet und Tour (anstelle zufälliger Gebäude)")
+    parser.add_argument("--szenario", default="Normal", choices=list(SZENARIEN))
+    parser.add_argument("--handlungsoption", default="feste Abholintervalle", choices=list(HANDLUNGSOPTIONEN))
+    parser.add_argument("--durchlaeufe", type=int, default=1)
+    parser.add_argument("--prozesse", type=int, default=1)
+    parser.add_argument("--ausgabe", default="output")
+    argumente = parser.parse_args()
+
+    flotte = flotte_laden(argumente.eingabe) if argumente.eingabe is not None else flotte_erzeugen(argumente.gebaeude, argumente.touren)
+    print( f"[Info] Flottensimulation gestartet: {len(flotte)} Gebäude, {flotte.anzahl_touren} Touren, {TAGE} Tage, {argumente.durchlaeufe} Durchläufe" )
+    beginn = time.perf_counter()
+    laeufe = monte_carlo_flotte(flotte, SZENARIEN[argumente.szenario], HANDLUNGSOPTIONEN[argumente.handlungsoption], argumente.durchlaeufe, argumente.prozesse)
+    df_gebaeude, df_zusammenfassung = auswertung_flotte(flotte, laeufe)
+    print( f"[Info] Simulation beendet nach {time.perf_counter() - beginn:.1f} s." )
+    print(df_zusammenfassung.to_string(index=False, float_format="{:.4f}".format))
+
+    os.makedirs(argumente.ausgabe, exist_ok=True)
+    df_gebaeude.to_csv(os.path.join(argumente.ausgabe, "flotte_gebaeude.csv"), index=False)
+    df_zusammenfassung.to_csv(os.path.join(argumente.ausgabe, "flotte_zusammenfassung.csv"), index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -12,16 +12,8 @@ In dieser Datei sind die Hilfunktionen definiert.
 # -----------------------------
 # ---------- Imports ----------
 import math
-import holidays
-import statistics as stats
-import pandas as pd
-import matplotlib.pyplot as plt
-import os
-from datetime import date, timedelta
-import matplotlib.image as mpimg
-from pathlib import Path
-# Globale Paramter importieren
-from parameter import TAGE, START_JAHR,  P_ABWESEND, RESTMUELL_MENGE_PRO_PERSON_TAG, REST_MUELLTONE_STAFFEL, REST_MUELLTONE_KOSTEN_STAFFEL, SONDERENTLEERUNG_FUELLMENGE_PROZENT
+from kalender import kalender_tabelle
+from statistik import StatistikAkkumulator, Teilergebnis
 
 
 """
@@ -59,27 +51,11 @@ Input:              leertag (Wochentag, an dem die Müll geleert wird)
                     tage (Anzahl der Tage, die in der Simulation betrachtet werden)
                     start_jahr (das Jahr in dem die Simulation beginnt)
 Output:             leertag_feiertage (Liste der Feiertage, auf denen der Leertag fällt)
-Funktionsweise:     Abhängig von der betrachteten Tage, wird der betrachtete Zeitraum bestimmt.
-                    Für jedes betrachtete Jahr werden die Feiertage bestimmt. 
-                    Es wird angenommen, dass das Wohnhaus in München, Bayern steht. Dadurch gelten die bayerischen Feiertage.
-                    Für jeden Tag wird geprüft, ob dieser auf den Leertag fällt und ob es sich um einen Feiertag handelt. 
-                    Jene Tage, für welche beiden Bedingungen erfüllt sind, wird das Datum in die Ausgabeliste hinzugefügt.
+Funktionsweise:     Es wird angenommen, dass das Wohnhaus in München, Bayern steht. Dadurch gelten die bayerischen Feiertage.
+                    Die Feiertage werden aus der gemeinsamen Kalendertabelle (kalender.py) gelesen, die pro (tage, start_jahr) nur einmal berechnet wird.
 """
 def berechne_feiertage(leertag, tage, start_jahr):
-    start_date = date(start_jahr, 1, 1) # Startdatum
-    end_date = start_date + timedelta(days=tage-1) # Enddatum
-
-    jahre = range(start_date.year, end_date.year + 1) # Bestimme die betracheteten Jahre
-
-    feiertage = holidays.Germany(years=jahre, subdiv="BY") # Liste der bayerischen Feiertage
-    leertag_feiertage = set()
-
-    for t in range(tage): # Prüfung der einzelnen Tage
-        aktuelles_datum = start_date + timedelta(days=t)
-
-        if aktuelles_datum.weekday() == leertag and aktuelles_datum in feiertage: # Tag ist Leertag und Feiertag
-            leertag_feiertage.add(aktuelles_datum) # Tag wird in die Ausgabeliste hinzugefügt
-
+    leertag_feiertage = kalender_tabelle(tage, start_jahr).leertag_feiertage(leertag)
     return leertag_feiertage
 
 
@@ -87,72 +63,23 @@ def berechne_feiertage(leertag, tage, start_jahr):
 
 """
 Funktion:           Berechnung der Statistiken für die einzelnen Metriken
-Input:              ergebnisse (Liste der Simulationsergebnisse)
+Input:              ergebnisse (Ergebnisspeicher der Simulationsergebnisse, bereits befüllter StatistikAkkumulator oder Teilergebnis)
 Output:             statstiken (Statistik-Werte der einzelnen Metriken)
 Funktionsweise:     Für die numerische Metriken wird der Durschnitt, der Maximalwert sowie der Minimalwert berechnet.
                     Für die Boolean Metrik wird die Anzahl der Ausfallfälle und die Quote in Prozent berechnet.
+                    Die Werte werden laufend in einem StatistikAkkumulator (statistik.py) berechnet, es wird keine gemeinsame Werteliste aufgebaut.
+                    Während der Simulation wird der Akkumulator bereits blockweise befüllt, sodass keine Tageswerte aufbewahrt werden müssen.
+                    Bei einem Teilergebnis werden zusätzlich Gesamtkosten und Gesamtfüllmenge pro Simulationslauf inkl. der Quantile P50, P90 und P99
+                    aus der Quantilskizze ausgewiesen.
 """
 def berechnung_statistiken(ergebnisse):
-    statstiken = {}
-
-    # Metriken der Simulationsergebnisse
-    metriken = [k for k in ergebnisse[0].keys()] 
-
-    for metrik in metriken:
-        # Zusammenführung der Werte zu einer gesamten Liste
-        werte = []
-        for ergebnis in ergebnisse:
-            werte.extend(ergebnis[metrik])
-        metrik = metrik.removesuffix("_tag") # Suffix entfernen (für eine schönere Ausgabe)
-        
-        # Boolean Metrik (ausfall_tag)
-        if werte and isinstance(werte[0], bool):
-            statstiken[metrik] = {
-                "Anzahl Ausfälle": sum(werte),
-                "Quote": round((sum(werte) / len(werte)*100), 3),  
-            }
-            continue
-        
-        # Numerische Metrik
-        statstiken[metrik] = {
-            "Durchchschnitt": round(stats.mean(werte),3),
-            "Minimalwert": round(min(werte),3),
-            "Maximalwert": round(max(werte), 3),
-        }
+    if not isinstance(ergebnisse, (StatistikAkkumulator, Teilergebnis)):
+        ergebnisse = StatistikAkkumulator().erfassen(ergebnisse)
+    statstiken = ergebnisse.statistiken()
     return statstiken
 
 
 
-"""
-Funktion:           Erstellung eines Histogramms für die Metriken Gesamtkosten und Gesamtfüllmenge
-Input:              ergebnisse (Simulationsergebnisse)
-                    szenario_name (Szenarioname)
-                    handlungsoption_name (Handlungsoptionsname)
-Funktionsweise:     Für die beiden Metriken kosten_tag (Gesamtkosten) und fuellmenge_tag (Gesamtfüllmenge) werden die gesamten Simulationswerte aggregiert.
-                    Für jede Metrik wird ein Histogramm erzeugt und als png-Datei gespeichert
-"""
-def grafik_histogramme(ergebnisse, szenario_name, handlungsoption_name):
-    # Aggregation der Werte
-    gesamtkosten = [sum(ergebnis["kosten_tag"]) for ergebnis in ergebnisse]  # Gesamtkosten
-    gesamtfuellmenge = [sum(ergebnis["fuellmenge_tag"]) for ergebnis in ergebnisse] # Gesamtfüllmenge
-
-    list_plot_info = [
-        (gesamtkosten, "Gesamtkosten", "EUR", "gesamtkosten"),
-        (gesamtfuellmenge, "Gesamtfüllmenge", "Liter", "gesamtfuellmenge"),
-    ]
-
-    # Histogramm
-    for daten, titel, xlabel, metrik in list_plot_info:
-        plt.figure(figsize=(10, 6))
-        plt.hist(daten, bins=40)
-        plt.xlabel(xlabel)
-        plt.ylabel("Häufigkeit")
-        plt.title(f"{titel} \nSzenario = {szenario_name} | Handlungsoption = {handlungsoption_name}")
-        plt.savefig(os.path.join("output",f"histogramm_{metrik}_{szenario_name}_{handlungsoption_name}.png")) # Bild speichern
-        plt.close()
-
-
-
 """
 Funktion:           Die Simulationsergebnisse werden in einem DataFrame formartiert.
 Input:              results_summary (zusammengefasste Simulationsergebnisse)
@@ -161,6 +88,7 @@ Funktionsweise:     Die Ergebnisstruktur wird in eine flache Struktur überführ
                     Anschließend werden die Werte in einen DataFrame umgewandelt und in eine Pivot-Tabelle umstrukturiert.
 """
 def ausgabe_csv(results_summary):
+    import pandas as pd # Import zur Laufzeit (nur für die Auswertung benötigt)
     element = []
     for (szenario, handlungsoption), stats_dict in results_summary.items():
         for metrik, kennzahlen in stats_dict.items():
@@ -172,35 +100,10 @@ def ausgabe_csv(results_summary):
                         "Handlungsoption": handlungsoption,
                         "Wert": wert,
             })
-    df_out = pd.DataFrame(element)
+    df_out = pd.DataFrame(element, columns=["Metrik", "Kennzahl", "Szenario", "Handlungsoption", "Wert"]) # Spalten auch ohne Simulationsläufe
     df_out = df_out.pivot_table(index=["Metrik", "Kennzahl"], columns=["Szenario", "Handlungsoption"],values="Wert")
     return df_out
 
-
-
-"""
-Funktion:           Zusammenführung der einzelnen Histogramme zu einer Gesamtgrafik
-Input:              metrik_name (Name der Metrik)
-Funktionsweise:     Für alle erzeugten Grafiken der Gesamtkosten und Gesamtfüllmenge werden die Kombinationen aus Szenarien und Handlungsoptionen pro Metrik geladen und in einer 3×3-Subplot-Grafik zusammengeführt und gespeichert.
-"""
-def gerniere_subplot(metrik_name):
-    szenarien = ["Normal", "Besuch", "Ausfall"]
-    handlungsoptionen = ["feste Abholintervalle","Kapazitaetsausbau", "Sonderentleerung"]
-    fig, axes = plt.subplots(nrows=3, ncols=3, figsize=(20, 10))
-
-    for z, zustand in enumerate(szenarien):
-        for m, massnahme in enumerate(handlungsoptionen):
-            ax = axes[z, m]
-            img_path =  f"output/histogramm_{metrik_name}_{zustand}_{massnahme}.png" # Bild laden
-            img = mpimg.imread(img_path)
-            ax.imshow(img)
-            ax.axis("off")
-            # Spalten Titel
-            if z == 0:
-                ax.set_title(massnahme, fontsize=12)
-    plt.tight_layout()
-    plt.savefig(os.path.join("output",f"histogramm_{metrik_name}.png")) # Bild speichern
-
 # --------------------------
 # ---------- Ende ----------
 # --------------------------
\ No newline at end of file
@@ -0,0 +1,184 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Erstellung der Grafiken (Histogramme der Gesamtkosten und Gesamtfüllmenge).
+Die Häufigkeiten (höchstens 40 Klassen) werden pro Kombination einmalig aus dem Histogramm der Summen pro Simulationslauf (statistik.py) bestimmt,
+das die Häufigkeiten bereits während der Simulation exakt zählt. Die Summen der einzelnen Simulationsläufe werden dafür nicht benötigt.
+Die Einzelgrafiken und die 3x3-Gesamtgrafiken werden anschließend direkt aus den Häufigkeiten mit der objektorientierten
+Matplotlib-Schnittstelle (Figure + Agg-Canvas, ohne globalen pyplot-Zustand) gezeichnet, ohne die Einzelbilder erneut einzulesen.
+Grafiken, deren Eingangsdaten sich seit der letzten Ausführung nicht geändert haben, werden übersprungen.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from instrumentierung import zaehlen
+
+
+# Dargestellte Summen pro Simulationslauf: Name -> (Titel, Einheit)
+GRAFIK_METRIKEN = {
+    "gesamtkosten": ("Gesamtkosten", "EUR"),
+    "gesamtfuellmenge": ("Gesamtfüllmenge", "Liter"),
+}
+ANZAHL_KLASSEN = 40
+MANIFEST = ".grafiken.json" # Hash der Eingangsdaten pro Grafik (im Ausgabeordner)
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Häufigkeiten der Summen pro Simulationslauf
+Input:              histogramme (Dictionary Name -> Histogramm der Summen pro Simulationslauf einer Kombination, siehe Teilergebnis)
+Output:             daten (Dictionary Name -> (Häufigkeiten, Klassengrenzen))
+Funktionsweise:     Die gleich breiten Klassen reichen von der festen Klasse des kleinsten bis zu der des größten Werts (Grenzen wie bei np.histogram),
+                    die Häufigkeiten sind exakt.
+"""
+def histogramm_daten(histogramme):
+    daten = {}
+    for name in GRAFIK_METRIKEN:
+        haeufigkeiten, grenzen = histogramme[name].haeufigkeiten(ANZAHL_KLASSEN)
+        daten[name] = (haeufigkeiten, grenzen)
+    return daten
+
+
+
+"""
+Funktion:           Zeichnen eines Histogramms aus vorab bestimmten Häufigkeiten
+Input:              ax (Achse)
+                    haeufigkeiten, grenzen (Häufigkeiten und Klassengrenzen)
+Funktionsweise:     Das Histogramm wird als eine gefüllte Treppenfläche gezeichnet (ein Zeichenobjekt anstatt eines Balkens pro Klasse).
+"""
+def histogramm_zeichnen(ax, haeufigkeiten, grenzen):
+    ax.stairs(haeufigkeiten, grenzen, fill=True)
+    ax.set_ylim(bottom=0)
+
+
+
+"""
+Funktion:           Erstellung und Speicherung einer Grafik
+Input:              auftrag (Dictionary mit Art "einzeln" oder "raster", Dateipfad und Daten der Grafik)
+Output:             pfad (Pfad der gespeicherten Grafik)
+Funktionsweise:     Einzelgrafik: Histogramm einer Kombination (10x6 Zoll).
+                    Rastergrafik: Histogramme aller Kombinationen (Zeilen = Szenarien, Spalten = Handlungsoptionen, 20x10 Zoll).
+                    Die Funktion ist auf Modulebene definiert, damit sie in einem Prozess-Pool ausgeführt werden kann.
+"""
+def grafik_rendern(auftrag):
+    from matplotlib.figure import Figure # Import zur Laufzeit (nur für die Erstellung der Grafiken benötigt)
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    titel, einheit = GRAFIK_METRIKEN[auftrag["metrik"]]
+    if auftrag["art"] == "einzeln":
+        fig = Figure(figsize=(10, 6))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        histogramm_zeichnen(ax, *auftrag["histogramm"])
+        ax.set_xlabel(einheit)
+        ax.set_ylabel("Häufigkeit")
+        ax.set_title(f"{titel} \nSzenario = {auftrag['szenario']} | Handlungsoption = {auftrag['handlungsoption']}")
+    else:
+        szenarien, handlungsoptionen = auftrag["szenarien"], auftrag["handlungsoptionen"]
+        fig = Figure(figsize=(20, 10))
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(nrows=len(szenarien), ncols=len(handlungsoptionen), squeeze=False)
+        for z, szenario in enumerate(szenarien):
+            for m, handlungsoption in enumerate(handlungsoptionen):
+                ax = axes[z, m]
+                histogramm_zeichnen(ax, *auftrag["histogramme"][(szenario, handlungsoption)])
+                if z == 0:
+                    ax.set_title(handlungsoption, fontsize=12) # Spalten Titel
+                if m == 0:
+                    ax.set_ylabel(f"{szenario}\nHäufigkeit") # Zeilen Titel
+                if z == len(szenarien) - 1:
+                    ax.set_xlabel(einheit)
+        fig.suptitle(titel)
+        fig.subplots_adjust(left=0.06, right=0.98, bottom=0.07, top=0.92, wspace=0.15, hspace=0.25) # feste Ränder (schneller als tight_layout)
+    fig.savefig(auftrag["pfad"]) # Bild speichern
+    return auftrag["pfad"]
+
+
+
+"""
+Funktion:           Hash der Eingangsdaten einer Grafik
+Input:              auftrag (Grafikauftrag)
+Output:             hash (SHA-256 als Hexadezimalzeichenkette)
+"""
+def auftrag_hash(auftrag):
+    def serialisieren(wert):
+        if isinstance(wert, np.ndarray):
+            return wert.tolist()
+        if isinstance(wert, dict):
+            return {str(schluessel): serialisieren(inhalt) for schluessel, inhalt in wert.items()}
+        if isinstance(wert, (list, tuple)):
+            return [serialisieren(inhalt) for inhalt in wert]
+        return wert
+    text = json.dumps(serialisieren(auftrag), sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+
+"""
+Funktion:           Erstellung aller Grafiken (Einzelgrafiken und 3x3-Gesamtgrafik pro Metrik)
+Input:              histogramme (Dictionary (Szenario, Handlungsoption) -> Häufigkeiten aus histogramm_daten)
+                    szenarien (Namen der Szenarien in Zeilenreihenfolge)
+                    handlungsoptionen (Namen der Handlungsoptionen in Spaltenreihenfolge)
+                    verzeichnis (Ausgabeordner, wird bei Bedarf angelegt)
+                    anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+Output:             erstellt (Anzahl der neu erstellten Grafiken)
+Funktionsweise:     Pro Grafik wird ein Auftrag mit allen Eingangsdaten erstellt. Stimmt der Hash eines Auftrags mit dem Hash der letzten
+                    Ausführung überein und ist die Datei vorhanden, wird die Grafik übersprungen. Die übrigen Grafiken werden seriell
+                    oder in einem Prozess-Pool erstellt und die Hashes anschließend im Manifest des Ausgabeordners gespeichert.
+"""
+def grafiken_erstellen(histogramme, szenarien, handlungsoptionen, verzeichnis="output", anzahl_prozesse=1):
+    os.makedirs(verzeichnis, exist_ok=True)
+    szenarien, handlungsoptionen = list(szenarien), list(handlungsoptionen)
+    auftraege = []
+    for metrik in GRAFIK_METRIKEN:
+        for szenario in szenarien:
+            for handlungsoption in handlungsoptionen:
+                auftraege.append({
+                    "art": "einzeln", "metrik": metrik, "szenario": szenario, "handlungsoption": handlungsoption,
+                    "histogramm": histogramme[(szenario, handlungsoption)][metrik],
+                    "pfad": os.path.join(verzeichnis, f"histogramm_{metrik}_{szenario}_{handlungsoption}.png"),
+                })
+        auftraege.append({
+            "art": "raster", "metrik": metrik, "szenarien": szenarien, "handlungsoptionen": handlungsoptionen,
+            "histogramme": {(szenario, handlungsoption): histogramme[(szenario, handlungsoption)][metrik] for szenario in szenarien for handlungsoption in handlungsoptionen},
+            "pfad": os.path.join(verzeichnis, f"histogramm_{metrik}.png"),
+        })
+
+    # Unveränderte Grafiken überspringen
+    manifest_pfad = os.path.join(verzeichnis, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_pfad):
+        with open(manifest_pfad, encoding="utf-8") as datei:
+            manifest = json.load(datei)
+    hashes = {auftrag["pfad"]: auftrag_hash(auftrag) for auftrag in auftraege}
+    offen = [auftrag for auftrag in auftraege if manifest.get(os.path.basename(auftrag["pfad"])) != hashes[auftrag["pfad"]] or not os.path.exists(auftrag["pfad"])]
+
+    zaehlen("grafiken_erstellt", len(offen))
+    zaehlen("grafiken_uebersprungen", len(auftraege) - len(offen))
+
+    # Erstellung
+    if anzahl_prozesse > 1 and len(offen) > 1:
+        with ProcessPoolExecutor(max_workers=anzahl_prozesse) as pool:
+            list(pool.map(grafik_rendern, offen))
+    else:
+        for auftrag in offen:
+            grafik_rendern(auftrag)
+
+    manifest.update({os.path.basename(pfad): wert for pfad, wert in hashes.items()})
+    with open(manifest_pfad, "w", encoding="utf-8") as datei:
+        json.dump(manifest, datei, indent=2, ensure_ascii=False)
+    return len(offen)
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
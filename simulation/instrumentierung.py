@@ -0,0 +1,247 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Instrumentierung der Simulation (Zeitmessung pro Phase, Zähler, Profiling).
+- phase(name): Zeitmessung eines Abschnitts (z.B. Simulation eines Blocks, Statistik, Grafiken, Export) als Kontextmanager
+- zaehlen(name): Zähler (z.B. Anzahl Simulationsläufe, Cache-Treffer)
+- profil(kombination): cProfile und tracemalloc für eine ausgewählte Szenario-Handlungsoption-Kombination
+Die Messungen werden als Trace im Chrome-Trace-Format (chrome://tracing bzw. https://ui.perfetto.dev) gespeichert und als Tabelle zusammengefasst.
+Ist die Instrumentierung nicht aktiviert, liefert phase() einen leeren Kontextmanager und zaehlen() kehrt sofort zurück (nahezu kein Mehraufwand).
+Bei paralleler Ausführung messen die Arbeitsprozesse ihre Phasen und Zähler pro Block selbst (arbeitsprozess_aktivieren, messungen_entnehmen).
+Die Messungen werden mit dem Teilergebnis des Blocks zurückgegeben und im Hauptprozess übernommen (messungen_uebernehmen).
+Die Zeitpunkte beziehen sich auf den Start im Hauptprozess (perf_counter ist systemweit monoton), im Trace erscheint jeder Arbeitsprozess als eigener Prozess.
+Das Profiling (cProfile, tracemalloc) erfasst nur den eigenen Prozess, die profilierte Kombination wird daher immer im Hauptprozess (seriell) simuliert.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import nullcontext
+
+
+# Globaler Zustand der Instrumentierung
+_aktiv = False
+_profil_kombination = None
+_ereignisse = [] # Chrome-Trace-Ereignisse
+_zaehler = defaultdict(int)
+_start_ns = time.perf_counter_ns()
+_LEER = nullcontext()
+
+
+# ---------------------------------------------------
+# ---------- Klassenmodell (Phase) ----------
+"""
+Zeitmessung eines Abschnitts. Beim Verlassen wird ein vollständiges Ereignis ("ph": "X") mit Beginn und Dauer in Mikrosekunden erfasst.
+"""
+class Phase:
+    def __init__(self, name, argumente):
+        self.name = name
+        self.argumente = argumente
+
+    def __enter__(self):
+        self.beginn = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *fehler):
+        ende = time.perf_counter_ns()
+        _ereignisse.append({
+            "name": self.name, "ph": "X", "pid": os.getpid(), "tid": threading.get_ident(),
+            "ts": (self.beginn - _start_ns) / 1000, "dur": (ende - self.beginn) / 1000, "args": self.argumente,
+        })
+        return False
+
+
+# ---------------------------------------------------
+# ---------- Klassenmodell (Profil) ----------
+"""
+cProfile und tracemalloc für einen Abschnitt. Beim Verlassen werden Profildatei und Textzusammenfassung gespeichert.
+"""
+class Profil:
+    def __init__(self, pfad):
+        self.pfad = pfad
+
+    def __enter__(self):
+        tracemalloc.start()
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *fehler):
+        self.profiler.disable()
+        speicher = tracemalloc.take_snapshot()
+        _, spitze = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.profiler.dump_stats(f"{self.pfad}.prof")
+        text = io.StringIO()
+        pstats.Stats(self.profiler, stream=text).sort_stats("cumulative").print_stats(25)
+        text.write(f"\nSpitzenwert der Speicherallokationen (tracemalloc): {spitze / 1024 / 1024:.1f} MB\n")
+        for statistik in speicher.statistics("lineno")[:15]:
+            text.write(f"{statistik}\n")
+        with open(f"{self.pfad}.txt", "w", encoding="utf-8") as datei:
+            datei.write(text.getvalue())
+        return False
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Aktivierung der Instrumentierung
+Input:              profil_kombination ((Szenario, Handlungsoption), für die cProfile und tracemalloc ausgeführt werden; None = kein Profiling)
+Funktionsweise:     Bisher erfasste Ereignisse und Zähler werden verworfen.
+"""
+def aktivieren(profil_kombination=None):
+    global _aktiv, _profil_kombination, _start_ns
+    _aktiv = True
+    _profil_kombination = tuple(profil_kombination) if profil_kombination is not None else None
+    _ereignisse.clear()
+    _zaehler.clear()
+    _start_ns = time.perf_counter_ns()
+
+
+
+"""
+Funktion:           Startzeitpunkt der Instrumentierung für die Arbeitsprozesse
+Output:             start_ns (Startzeitpunkt in Nanosekunden, None = Instrumentierung nicht aktiviert)
+"""
+def arbeitsprozess_start():
+    return _start_ns if _aktiv else None
+
+
+
+"""
+Funktion:           Aktivierung der Instrumentierung in einem Arbeitsprozess
+Input:              start_ns (Startzeitpunkt des Hauptprozesses, siehe arbeitsprozess_start)
+Funktionsweise:     Bisher erfasste Ereignisse und Zähler werden verworfen, Profiling ist im Arbeitsprozess nicht aktiv.
+"""
+def arbeitsprozess_aktivieren(start_ns):
+    global _start_ns
+    aktivieren()
+    _start_ns = start_ns
+
+
+
+"""
+Funktion:           Entnahme der erfassten Ereignisse und Zähler (im Arbeitsprozess)
+Output:             messungen (Dictionary mit den Ereignissen und Zählern seit der Aktivierung)
+Funktionsweise:     Ereignisse und Zähler werden anschließend zurückgesetzt, damit jeder Block nur seine eigenen Messungen zurückgibt.
+"""
+def messungen_entnehmen():
+    messungen = {"ereignisse": list(_ereignisse), "zaehler": dict(_zaehler)}
+    _ereignisse.clear()
+    _zaehler.clear()
+    return messungen
+
+
+
+"""
+Funktion:           Übernahme der Messungen eines Arbeitsprozesses (im Hauptprozess)
+Input:              messungen (Ergebnis von messungen_entnehmen, None = keine Messungen)
+"""
+def messungen_uebernehmen(messungen):
+    if not _aktiv or messungen is None:
+        return
+    _ereignisse.extend(messungen["ereignisse"])
+    for name, wert in messungen["zaehler"].items():
+        _zaehler[name] += wert
+
+
+
+"""
+Funktion:           Zeitmessung eines Abschnitts
+Input:              name (Name der Phase)
+                    argumente (zusätzliche Angaben, z.B. Szenario und Handlungsoption)
+Output:             kontext (Kontextmanager; ohne Instrumentierung ein leerer Kontextmanager)
+"""
+def phase(name, **argumente):
+    if not _aktiv:
+        return _LEER
+    return Phase(name, argumente)
+
+
+
+"""
+Funktion:           Erhöhung eines Zählers
+Input:              name (Name des Zählers)
+                    wert (Erhöhung)
+"""
+def zaehlen(name, wert=1):
+    if not _aktiv:
+        return
+    _zaehler[name] += wert
+
+
+
+"""
+Funktion:           Prüfung, ob eine Szenario-Handlungsoption-Kombination profiliert wird
+Input:              szenario_key, handlungsoption_key (betrachtete Kombination)
+Output:             profiliert (True, wenn die Instrumentierung aktiviert und die Kombination ausgewählt ist)
+"""
+def profiliert(szenario_key, handlungsoption_key):
+    return _aktiv and _profil_kombination == (szenario_key, handlungsoption_key)
+
+
+
+"""
+Funktion:           Profiling einer Szenario-Handlungsoption-Kombination
+Input:              szenario_key, handlungsoption_key (betrachtete Kombination)
+                    verzeichnis (Ausgabeordner)
+Output:             kontext (Kontextmanager; nur für die ausgewählte Kombination aktiv)
+Funktionsweise:     Für die ausgewählte Kombination werden cProfile (Laufzeit pro Funktion) und tracemalloc (Speicherallokationen pro Codezeile) ausgeführt.
+                    Gespeichert werden die Profildatei (profil_<Szenario>_<Handlungsoption>.prof, z.B. für snakeviz) und eine Textzusammenfassung
+                    der 25 Funktionen mit der höchsten kumulierten Laufzeit sowie der 15 Codezeilen mit dem höchsten Speicherbedarf.
+"""
+def profil(szenario_key, handlungsoption_key, verzeichnis="output"):
+    if not profiliert(szenario_key, handlungsoption_key):
+        return _LEER
+    return Profil(os.path.join(verzeichnis, f"profil_{szenario_key}_{handlungsoption_key}"))
+
+
+
+"""
+Funktion:           Speicherung des Traces im Chrome-Trace-Format
+Input:              pfad (Dateipfad der JSON-Datei)
+Funktionsweise:     Die Zähler werden als Zählerereignisse ("ph": "C") am Ende des Traces ergänzt.
+"""
+def trace_speichern(pfad):
+    ende = (time.perf_counter_ns() - _start_ns) / 1000
+    zaehler = [{"name": name, "ph": "C", "pid": os.getpid(), "ts": ende, "args": {name: wert}} for name, wert in _zaehler.items()]
+    with open(pfad, "w", encoding="utf-8") as datei:
+        json.dump({"traceEvents": _ereignisse + zaehler, "displayTimeUnit": "ms"}, datei, ensure_ascii=False)
+
+
+
+"""
+Funktion:           Zusammenfassung der Phasen und Zähler als Tabelle
+Output:             tabelle (Text: Anzahl, Gesamt- und Durchschnittsdauer pro Phase sowie alle Zähler)
+Funktionsweise:     Phasen gleichen Namens werden zusammengefasst. Verschachtelte Phasen (z.B. Simulation innerhalb einer Kombination)
+                    sind in der Dauer der äußeren Phase enthalten.
+"""
+def zusammenfassung():
+    phasen = defaultdict(lambda: [0, 0.0])
+    for ereignis in _ereignisse:
+        phasen[ereignis["name"]][0] += 1
+        phasen[ereignis["name"]][1] += ereignis["dur"] / 1e6
+    zeilen = [f"{'Phase':<28}{'Anzahl':>8}{'Gesamt (s)':>13}{'Mittel (ms)':>13}"]
+    for name, (anzahl, sekunden) in sorted(phasen.items(), key=lambda eintrag: -eintrag[1][1]):
+        zeilen.append(f"{name:<28}{anzahl:>8}{sekunden:>13.3f}{sekunden / anzahl * 1000:>13.2f}")
+    for name, wert in sorted(_zaehler.items()):
+        zeilen.append(f"{name:<28}{wert:>8}")
+    tabelle = "\n".join(zeilen)
+    return tabelle
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,94 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Kalendertabellen der Simulation.
+Wochentage, Feiertage und reguläre Leerungstermine hängen nur vom Startjahr und der Anzahl der Tage ab.
+Sie werden daher pro (tage, start_jahr) einmalig berechnet und von allen Simulationsläufen gemeinsam genutzt.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+from functools import lru_cache
+from datetime import date, timedelta
+import numpy as np
+from instrumentierung import phase
+
+
+# ------------------------------------------------------
+# ---------- Klassenmodell (Kalendertabelle) ----------
+"""
+Die Kalendertabelle enthält für jeden Simulationstag (Index = Tag seit Simulationsbeginn):
+- wochentag: Wochentag (Montag=0 ... Sonntag=6)
+- feiertag: Indikator, ob der Tag ein bayerischer Feiertag ist
+- leerungstermine: Für jeden möglichen Leertag (Montag bis Freitag) ein Indikator, ob am Tag eine reguläre Leerung geplant ist (Array der Form (5 x tage))
+Die Tabellen sind unveränderlich (Tupel bzw. schreibgeschützte Arrays) und können daher gefahrlos zwischen Simulationsläufen und Prozessen geteilt werden.
+"""
+class Kalender:
+    def __init__(self, tage, start_jahr):
+        self.tage = tage
+        self.start_jahr = start_jahr
+        self.start_datum = date(start_jahr, 1, 1) # Startdatum
+        end_datum = self.start_datum + timedelta(days=tage-1) # Enddatum
+
+        # Es wird angenommen, dass das Wohnhaus in München, Bayern steht. Dadurch gelten die bayerischen Feiertage.
+        import holidays # Import zur Laufzeit (nur bei der Erstellung der Kalendertabelle benötigt)
+        feiertage = holidays.Germany(years=range(self.start_datum.year, end_datum.year + 1), subdiv="BY")
+
+        start_ordinal = self.start_datum.toordinal()
+        self.wochentag = tuple((start_ordinal + tag - 1) % 7 for tag in range(tage)) # date.weekday() über die Ordinalzahl
+        self.feiertag = tuple(date.fromordinal(start_ordinal + tag) in feiertage for tag in range(tage))
+        self.leerungstermine = self._berechne_leerungstermine()
+
+    """
+    Funktion:           Bestimmung der regulären Leerungstermine für alle möglichen Leertage
+    Output:             termine (Boolean-Array der Form (5 x tage), True = reguläre Leerung geplant)
+    Funktionsweise:     Die Leertage hängen nur vom Kalender ab (Wochentag, Zwei-Wochen-Zähler, Feiertage) und nicht vom Zufall.
+                        Der Zwei-Wochen-Zähler wird, wie im Klassenmodell, nur an Leertagen zurückgesetzt, die nicht auf einen Feiertag fallen.
+    """
+    def _berechne_leerungstermine(self):
+        termine = np.zeros((5, self.tage), dtype=bool)
+        for leertag in range(5):
+            tage_seit_letzter_leerung = 0
+            for tag in range(self.tage):
+                tage_seit_letzter_leerung += 1
+                if self.wochentag[tag] == leertag and tage_seit_letzter_leerung >= 14 and not self.feiertag[tag]:
+                    termine[leertag, tag] = True
+                    tage_seit_letzter_leerung = 0
+        termine.setflags(write=False)
+        return termine
+
+    """
+    Funktion:           Bestimmung aller Feiertage, die auf den Leertag fallen
+    Input:              leertag (Wochentag, an dem die Müll geleert wird)
+    Output:             leertag_feiertage (Menge der Feiertage, auf denen der Leertag fällt)
+    """
+    @lru_cache(maxsize=None)
+    def leertag_feiertage(self, leertag):
+        leertag_feiertage = frozenset(self.start_datum + timedelta(days=tag) for tag in range(self.tage) if self.feiertag[tag] and self.wochentag[tag] == leertag)
+        return leertag_feiertage
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Gemeinsame Kalendertabelle für alle Simulationsläufe
+Input:              tage (Anzahl der Tage, die in der Simulation betrachtet werden)
+                    start_jahr (das Jahr in dem die Simulation beginnt)
+Output:             kalender (Kalendertabelle)
+Funktionsweise:     Die Kalendertabelle wird pro (tage, start_jahr) nur einmal pro Prozess erstellt und anschließend aus dem Zwischenspeicher geladen.
+                    Wird die Tabelle vor dem Start eines Prozess-Pools erstellt, übernehmen die Prozesse sie beim Forken ohne erneute Berechnung.
+"""
+@lru_cache(maxsize=None)
+def kalender_tabelle(tage, start_jahr):
+    with phase("kalender", tage=tage, start_jahr=start_jahr):
+        kalender = Kalender(tage, start_jahr)
+    return kalender
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -13,8 +13,13 @@ Diese Datei beinhaltet den Simulationsstart. Zum Starten der Simulation muss die
 import os
 # Globale Paramter importieren
 from parameter import TAGE, START_JAHR, ANZAHL_BEWOHNER, P_ABWESEND,  RESTMUELL_MENGE_PRO_PERSON_TAG, REST_MUELLTONE_STAFFEL, REST_MUELLTONE_KOSTEN_STAFFEL, SONDERENTLEERUNG_FUELLMENGE_PROZENT
-from funktionen import ausgabe_csv, gerniere_subplot
+from funktionen import ausgabe_csv
 from simulation import simulationslauf
+from cache import Ergebniscache
+from checkpoint import Checkpoint
+from trajektorien import TrajektorienExport
+from sweep import parameterpunkte, parameterstudie, ausgabe_parameterstudie
+import instrumentierung
 
 # ----------------------------------------------------
 # ---------- Szenarien und Handlungsptionen ----------
@@ -41,22 +46,50 @@ HANDLUNGSOPTIONEN = {
 
 # --------------------------------
 # ---------- Simulation ----------
-ANZAHL_DURCHLAEUFE = 1000 # Anzahl der Simulationsdurchläufe
+ANZAHL_DURCHLAEUFE = 1000 # Anzahl der Simulationsdurchläufe (bei adaptiver Anzahl die Höchstanzahl pro Kombination)
+PRAEZISION = None # Adaptive Anzahl: geforderte relative Halbbreite des 95%-Konfidenzintervalls von Gesamtkosten und Gesamtfüllmenge (z.B. 0.01 = 1%), None = feste Anzahl
+MIN_DURCHLAEUFE = 100 # Adaptive Anzahl: Mindestanzahl an Simulationsdurchläufen pro Kombination
+VARIANZREDUKTION = None # None, "crn" (gemeinsame Zufallszahlen für alle Handlungsoptionen) oder "antithetisch" (zusätzlich antithetische Paare), inkl. paarweisem Kostenvergleich
+ANZAHL_PROZESSE = 1 # Anzahl der parallelen Prozesse (1 = serielle Ausführung, z.B. os.cpu_count() für alle Kerne)
+CHUNK_GROESSE = 50 # Anzahl der Simulationsdurchläufe pro Arbeitspaket bei paralleler Ausführung
+ENGINE = "simpy" # Simulationslogik: "simpy" (Klassenmodell, Tag für Tag), "numpy" (vektorisierte Simulation eines ganzen Blocks) oder "ereignis" (ereignisgesteuert von Leertermin zu Leertermin)
+CACHE_VERZEICHNIS = "cache" # Ergebnis-Cache: bereits simulierte Seed-Blöcke werden wiederverwendet (None = ohne Cache)
+CACHE_MAX_MB = 500 # Maximale Größe des Ergebnis-Caches in MB (am längsten nicht verwendete Blöcke werden gelöscht)
+CHECKPOINT_VERZEICHNIS = None # Checkpoint für lange Läufe: abgeschlossene Seed-Blöcke werden sofort gesichert und nach einem Abbruch beim Neustart übersprungen (z.B. "checkpoint"), None = ohne Checkpoint
+INSTRUMENTIERUNG = False # Zeitmessung pro Phase und Kombination inkl. Zähler (Trace in output/trace.json, Zusammenfassung in der Konsole)
+PROFIL_KOMBINATION = None # cProfile und tracemalloc für eine Kombination, z.B. ("Normal", "Sonderentleerung") (nur mit INSTRUMENTIERUNG)
+TRAJEKTORIEN_VERZEICHNIS = None # Export der Tageswerte aller Simulationsläufe (Lauf x Tag x Metrik) für weitere Auswertungen, z.B. "output/trajektorien" (Lesen mit trajektorien.Trajektorien), None = kein Export
+PARAMETERSTUDIE = None # Parameterstudie anstelle der Simulation: Raster, z.B. {"SONDERENTLEERUNG_FUELLMENGE_PROZENT": [60, 70, 80, 90], "ANZAHL_BEWOHNER": [14, 18, 22]}, oder Liste von Überschreibungen (Ergebnis in output/parameterstudie.csv), None = keine Parameterstudie
 
 
 if __name__ == "__main__": 
     os.makedirs("output", exist_ok=True) # Output-Ordner anlegen (falls nicht schon vorhanden ist) zur Speicherung der Ergebnisdateien (Bilder, CSV)
     print("[Info] Simulation gestartet.")
+    if INSTRUMENTIERUNG:
+        instrumentierung.aktivieren(PROFIL_KOMBINATION)
     # Simulation
-    summary = simulationslauf(SZENARIEN, HANDLUNGSOPTIONEN, ANZAHL_DURCHLAEUFE) 
-    # Simulationsergebnisse
-    df_results = ausgabe_csv(summary) 
-    df_results.to_csv("output/simulation_ergebnisse.csv") # Speicherung der Ergebnistabelle als CSV
+    cache = Ergebniscache(CACHE_VERZEICHNIS, CACHE_MAX_MB) if CACHE_VERZEICHNIS is not None else None
+    if CHECKPOINT_VERZEICHNIS is not None:
+        cache = Checkpoint(CHECKPOINT_VERZEICHNIS, cache)
+        print( f"   Checkpoint mit {len(cache.bloecke)} abgeschlossenen Blöcken" )
+    if PARAMETERSTUDIE is not None:
+        # Parameterstudie (alle Parameterpunkte in einem Auftrag)
+        punkte = parameterpunkte(PARAMETERSTUDIE)
+        print( f"   Parameterstudie mit {len(punkte)} Parameterpunkten" )
+        ergebnisse = parameterstudie(punkte, SZENARIEN, HANDLUNGSOPTIONEN, ANZAHL_DURCHLAEUFE, ANZAHL_PROZESSE, CHUNK_GROESSE, ENGINE, VARIANZREDUKTION, cache)
+        with instrumentierung.phase("export"):
+            ausgabe_parameterstudie(punkte, ergebnisse, VARIANZREDUKTION).to_csv("output/parameterstudie.csv", index=False) # Speicherung der Ergebnistabelle (Langformat) als CSV
+    else:
+        trajektorien = TrajektorienExport(TRAJEKTORIEN_VERZEICHNIS) if TRAJEKTORIEN_VERZEICHNIS is not None else None
+        summary = simulationslauf(SZENARIEN, HANDLUNGSOPTIONEN, ANZAHL_DURCHLAEUFE, ANZAHL_PROZESSE, CHUNK_GROESSE, ENGINE, PRAEZISION, MIN_DURCHLAEUFE, VARIANZREDUKTION, cache, trajektorien=trajektorien) 
+        # Simulationsergebnisse
+        with instrumentierung.phase("export"):
+            df_results = ausgabe_csv(summary) 
+            df_results.to_csv("output/simulation_ergebnisse.csv") # Speicherung der Ergebnistabelle als CSV
     print("[Info] Simulation beendet.")
-
-    # Die einzelnen Plots der Gesamtkosten und der Gesamtfüllmenge werden in einem 3x3 Plot gespeichert
-    gerniere_subplot("gesamtkosten")
-    gerniere_subplot("gesamtfuellmenge")
+    if INSTRUMENTIERUNG:
+        instrumentierung.trace_speichern("output/trace.json")
+        print(instrumentierung.zusammenfassung())
 
 # --------------------------
 # ---------- Ende ----------
@@ -0,0 +1,226 @@
+"""
+Digital Business University of Applied Sciences 
+Data Science und Management (M. Sc.) 
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet das Klassenmodell der Simulationslogik (SimPy) und die Durchführung eines einzelnen Simulationslaufs.
+Die Datei importiert nur die Bibliotheken der Simulation (SimPy, NumPy) und keine Bibliotheken der Auswertung (pandas, Matplotlib),
+damit Arbeitsprozesse und kurze Simulationen schnell starten.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import random
+import simpy
+# Globale Paramter importieren
+from parameter import TAGE, START_JAHR, modellparameter
+from funktionen import ueberfuellungskosten, ueberfuellungsrate
+from kalender import kalender_tabelle
+from ergebnisspeicher import Ergebnisspeicher
+from zufall import zufallsstroeme
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:       Durchführung eines einzelnen Simulationslaufs      
+Input:          seed (Reproduzierbarkeitswert) 
+                szenario (betrachteten Szenario)   
+                handlungsoption (betrachtete Handlungsoption)  
+                speicher (Ergebnisspeicher, in den geschrieben wird; None = eigener Speicher für einen Lauf)
+                lauf (Zeile des Simulationslaufs im Ergebnisspeicher)
+                varianzreduktion (None = ein Zufallsstrom, "crn" = getrennte Ströme pro Prozess, "antithetisch" = zusätzlich antithetische Paare)
+                parameter (Modellparameter inkl. Überschreibungen, None = Standardwerte aus parameter.py)
+Output:         simulation_ergebnisse_metrik (Werte der erfassten Metriken)
+Funktionsweise: Zunächst wird eine SimPy-Umgebung initialisiert.
+                Anschließend wird das Müllentsorgungssystem-Modell erzeugt. 
+                Weiter wird die Simulation über den gesamten Betrachtungszeitraum ausgeführt.
+                Die erfassten Metriken werden direkt in die Zeile des Ergebnisspeichers geschrieben und als Dictionary (Sichten auf die Zeile) zurückgegeben.
+"""
+def simulation_einzeln(seed, szenario, handlungsoption, speicher=None, lauf=0, varianzreduktion=None, parameter=None):
+    env = simpy.Environment() # Initialisierung der SimPy-Umgebung
+    model = MuellentsorgungsSystem(env, szenario, handlungsoption, seed, speicher, lauf, varianzreduktion, parameter) # Müllentsorgungssystem-Modell 
+    env.run(until=TAGE)  # Ausführung Simulation
+
+    # Metriken
+    simulation_ergebnisse_metrik = model.speicher.lauf(model.lauf)
+
+    return simulation_ergebnisse_metrik
+
+
+# ------------------------------------------------------
+# ---------- Klassenmodell (Simulationslogik) ----------
+"""
+Jeder Simulationsschritt entspricht einen Kalendertag.  
+Der Leertag der Mülltage wird zu Beginn der Simulation per Zufall gefällt.
+Jeden Tag wird Müll durch die Bewohner und ggf. den Gästen erzeugt. Die Anzahl der Besucher wird per Zufall betsimmt. 
+Der Müll wird in die Mülltonne geschmissen (Füllstand hinzugefügt).
+Alle 14 Tage erfolgt eine reguläre Leerung, solange der Leertag nicht auf einen Feiertag oder Ausfalltag fällt.
+Kommt es zu einer Überfüllung (Müllmenge > Kapazität), so entstehen Überfüllungszusatzkosten bei der Abholung.
+Bei mehrfacher Überfüllung kann, wenn die Kapazitäten es hergeben, die Tonnenkapazität erhöht werden. 
+Bei der Handlungsoption Sonderentleerung wird beim Erreichen eines bestimmten Füllstands die Leerung ausgelöst. Diese verusacht zusätzliche Kosten.
+"""
+class MuellentsorgungsSystem:
+    def __init__(self, env, szenario, handlungsoption, seed, speicher=None, lauf=0, varianzreduktion=None, parameter=None):
+        self.env = env
+        self.szenario = szenario
+        self.handlungsoption = handlungsoption
+        self.parameter = modellparameter(parameter) # Modellparameter (Standardwerte aus parameter.py inkl. Überschreibungen)
+        self.varianzreduktion = varianzreduktion
+
+        # Zufallszahlen: ein gemeinsamer Strom (Standard) oder getrennte Ströme pro Prozess (Varianzreduktion, siehe zufall.py)
+        if varianzreduktion is None:
+            self.rng = random.Random(seed)
+            self.rng_leertag = self.rng_abwesend = self.rng_besuch = self.rng_ausfall = self.rng
+        else:
+            stroeme = zufallsstroeme(seed, varianzreduktion)
+            self.rng_leertag, self.rng_abwesend, self.rng_besuch, self.rng_ausfall = stroeme["leertag"], stroeme["abwesend"], stroeme["besuch"], stroeme["ausfall"]
+
+        # Wochentag der Leertag der Mülltonne
+        self.leertag = self.rng_leertag.randint(0, 4) # Montag=0/Dienstag=1/Mittwoch=2/Donnerstag=3/Freitag=4
+        # Gemeinsame Kalendertabelle (Wochentage und Feiertage pro Tag)
+        self.kalender = kalender_tabelle(TAGE, START_JAHR)
+        # Feiertage, die auf den Leertag fallen
+        self.feiertage = self.kalender.leertag_feiertage(self.leertag)
+        # Tageszähler: Tage seit letzter Leerung
+        self.tage_seit_letzter_leerung = 0
+
+        # Mülltonnen Startwerte
+        self.kapazitaet = self.parameter["REST_MUELLTONE_STAFFEL"][0] # Kapazität (kleinste Tonnengröße)
+        self.fuellstand = 0.0 # Füllstand 
+        self.wochen_ueberfuellt = 0 # Überfüllungsindikator
+
+        # Metriken (Sichten auf die Zeile des Simulationslaufs im Ergebnisspeicher, Index = Tag)
+        self.speicher = speicher if speicher is not None else Ergebnisspeicher(1, TAGE)
+        self.lauf = lauf
+        self.kosten_tag = self.speicher["kosten_tag"][lauf] # Kosten
+        self.anzahl_bewohner_tag = self.speicher["anzahl_bewohner_tag"][lauf] # Anzahl der Bewohner
+        self.anzahl_besuch_tag = self.speicher["anzahl_besuch_tag"][lauf] # Anzahl der Besucher
+        self.ausfall_tag = self.speicher["ausfall_tag"][lauf] # Indikator, ob Ausfall stattgefunden hat
+        self.fuellmenge_tag = self.speicher["fuellmenge_tag"][lauf] # Füllmenge der Tonne
+        self.kapazitaet_tag = self.speicher["kapazitaet_tag"][lauf] # Kapazität der Tonne
+        self.ueberfuellungsrate_tag = self.speicher["ueberfuellungsrate_tag"][lauf] # Überfüllungsrate
+        self.sonderentleerung_kosten_tag = self.speicher["sonderentleerung_kosten_tag"][lauf] # Kosten für die Sonderentleerung
+        self.ueberfuellung_kosten_tag = self.speicher["ueberfuellung_kosten_tag"][lauf] # Kosten bei Überfüllung 
+
+        # Prozess starten 
+        self.env.process(self.muellzyklus_taeglich()) # Müllzyklus (Entstehung bis Entsorgung)
+
+    """
+    Funktion:           Zufällige Anzahl, die nur mit einer Wahrscheinlichkeit eintritt (Abwesenheit, Besuch)
+    Input:              strom (Zufallsstrom des Prozesses)
+                        wahrscheinlichkeit (Wahrscheinlichkeit des Ereignisses)
+                        a, b (Grenzen der Anzahl)
+    Output:             anzahl (Anzahl zwischen a und b, None = Ereignis tritt nicht ein)
+    Funktionsweise:     Ohne Varianzreduktion wird die Anzahl nur bei Eintritt des Ereignisses gezogen (ein gemeinsamer Strom).
+                        Mit Varianzreduktion werden immer zwei Zufallszahlen gezogen (Zufallsstrom.bedingte_anzahl),
+                        damit antithetische Paare über den gesamten Zeitraum gespiegelt bleiben.
+    """
+    def bedingte_anzahl(self, strom, wahrscheinlichkeit, a, b):
+        if self.varianzreduktion is not None:
+            return strom.bedingte_anzahl(wahrscheinlichkeit, a, b)
+        if strom.random() < wahrscheinlichkeit:
+            return strom.randint(a, b)
+        return None
+
+    def muellzyklus_taeglich(self):
+        p = self.parameter
+        while True:
+            tag = int(self.env.now)
+            self.tage_seit_letzter_leerung += 1
+
+            # Indikator, ob Tag ein Leertag ist (Wenn Tag auf Wochen-Leertag fällt und zwei Wochen seit der letzten Leerung vergangen sind)
+            ist_leertag = (self.kalender.wochentag[tag] == self.leertag and self.tage_seit_letzter_leerung >= 14)
+            # Indikator, ob Tag ein Feiertag ist (Nachschlagen in der Kalendertabelle)
+            ist_feiertag = self.kalender.feiertag[tag]
+
+
+            # -------------------------
+            # Prozess: Müllproduktion  
+
+            # Müll der Bewohner (Szenario: Normales Müllaufkommen):
+            anzahl_bewohner = p["ANZAHL_BEWOHNER"]
+            # Mit eines Wahrscheinlichkeit sind die Bewohner aus dem Haus
+            abwesend = self.bedingte_anzahl(self.rng_abwesend, p["P_ABWESEND"], 0, anzahl_bewohner)
+            if abwesend is not None:
+                anzahl_bewohner = abwesend
+            self.fuellstand += anzahl_bewohner * p["RESTMUELL_MENGE_PRO_PERSON_TAG"]
+
+            # Müll der Gäste (Szenario: erhöhter Besuch)
+            anzahl_gaeste = 0
+            besuch = self.bedingte_anzahl(self.rng_besuch, self.szenario["P_BESUCH"], 1, 10) # Besucheranzahl zwischen 1 und 10
+            if besuch is not None:
+                anzahl_gaeste = besuch
+                self.fuellstand += anzahl_gaeste * p["RESTMUELL_MENGE_PRO_PERSON_TAG"] * 0.25 # Müllmenge der Gäste entspricht lediglich 25 Prozent des reguläten Müllaufkommen pro Person
+            
+            self.anzahl_bewohner_tag[tag] = anzahl_bewohner # Metrik (Anzahl der Bewohner)
+            self.anzahl_besuch_tag[tag] = anzahl_gaeste # Metrik (Anzahl der Besucher)
+            self.ueberfuellungsrate_tag[tag] = ueberfuellungsrate(self.fuellstand, self.kapazitaet) # Metrik (Überfüllungsrate)
+            self.fuellmenge_tag[tag] = self.fuellstand # Metrik (Füllmenge der Tonne )
+            self.kapazitaet_tag[tag] = self.kapazitaet # Metrik (Kapazität der Tonne)
+
+            # -------------------------
+            # Prozess: reguläre Leerung (Szenario: Normales Müllaufkommen/Ausfall) - Teil 1: Indikator
+            # Wenn Tag auf Leertag fällt, Tag keine Feiertag ist und an dem Tag kein Ausfall stattfindet (Szenario: Ausfall) wird geleert 
+            ist_ausfall = False
+            findet_regulaere_leerung_statt = False
+            if ist_leertag and (not ist_feiertag):
+                if self.rng_ausfall.random() <= self.szenario["P_AUSFALL"]:
+                    ist_ausfall = True
+                else:
+                    findet_regulaere_leerung_statt = True
+                self.tage_seit_letzter_leerung = 0 # Zwei Wochen Zähler wird zurückgesetzte
+            self.ausfall_tag[tag] = ist_ausfall # Metriken (Indikator, ob Ausfall stattgefunden hat)
+
+            # -------------------------
+            # Prozess: Sonderentleerung (Handlungsoption: Sonderentleerung)
+            kosten_sonderentleerung = 0
+            # Wenn die Handlungsoption Sonderentleerung in der Simulation betrachtet wird, keine reguläre Leerung stattfindet und der Schwellenwert für die Sonderentleerung erreicht ist, findet eine Sonderentleerung statt
+            if (not findet_regulaere_leerung_statt and self.handlungsoption["sonderentleerung"] and (self.fuellstand / self.kapazitaet * 100) >= p["SONDERENTLEERUNG_FUELLMENGE_PROZENT"]):
+                self.fuellstand = 0 # Tonne wird geleert --> Füllstand wird zurückgesetzt, auf 0 
+                kosten_sonderentleerung = p["REST_MUELLTONE_KOSTEN_STAFFEL"][self.kapazitaet] * 1.4 # Sonderkosten liegen 140 Prozent über den normal Kosten
+                # Quelle: Abfallwirtschaft Hohenlohekreis. Qualitätsoffensive. Abgerufen am 25.01.2026 von https://www.abfallwirtschaft-hohenlohekreis.de/leistungen-gebühren/qualitätsoffensive
+            self.sonderentleerung_kosten_tag[tag] = kosten_sonderentleerung # Metrik (Kosten für die Sonderentleerung)
+
+            # -------------------------
+            # Prozess: Überfuellung
+            kosten_ueberfuellung = 0
+            if findet_regulaere_leerung_statt:
+                # Überfüllungskosten:
+                ueber_liter = max(0, self.fuellstand - self.kapazitaet) # Überfüllungsmenge in Liter
+                kosten_ueberfuellung = ueberfuellungskosten(ueber_liter) # Überfüllungskosten
+                
+                # Anzahl der Überfülllungen:
+                if self.fuellstand > self.kapazitaet:
+                    self.wochen_ueberfuellt += 1
+                else:
+                    self.wochen_ueberfuellt = 0
+
+                # Wenn die Handlungsoption Kapazitaetsausbau in der Simulation betrachtet wird und in nach drei (UEBERFUELLUNGEN_KAPAZITAETSAUSBAU) aufeianderfolgendenden Leerungen es zu einer Überfüllung kam, wird die Kapazität erweitert.
+                if self.handlungsoption["kapazitaetsausbau"] and self.wochen_ueberfuellt >= p["UEBERFUELLUNGEN_KAPAZITAETSAUSBAU"]:
+                    # Bestimmung der möglichen Kapazitätsgrößen
+                    potenzielle_tonnen_kapa = [kapa for kapa in p["REST_MUELLTONE_STAFFEL"] if kapa > self.kapazitaet]
+                    if potenzielle_tonnen_kapa:
+                        self.kapazitaet = min(potenzielle_tonnen_kapa) # Auswahl der nächst größeren Kapazität
+                    self.wochen_ueberfuellt = 0 # Zähler für Überfüllungsanzahl auf 0 setzten
+            self.ueberfuellung_kosten_tag[tag] = kosten_ueberfuellung # Metrik (Kosten bei Überfüllung) 
+
+            # -------------------------
+            # Prozess: reguläre Leerung (Szenario: Normales Müllaufkommen/Ausfall) - Teil 2: Tatsächliche Leerung inkl. Kostenbestimmung
+            tonnen_kosten = 0
+            if findet_regulaere_leerung_statt:
+                self.fuellstand = 0
+                tonnen_kosten = p["REST_MUELLTONE_KOSTEN_STAFFEL"][self.kapazitaet]
+
+            # Gesamtkosten (Basiskosten + Überfüllung + Sonderleerung)
+            self.kosten_tag[tag] = tonnen_kosten + kosten_ueberfuellung + kosten_sonderentleerung # Metrik (Kosten)
+
+            # Zeitfortschritt (1 Zeiteinheit = 1 Tag)
+            yield self.env.timeout(1) 
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,262 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Optimierung der Entleerungsstrategie (Schwellenwert der Sonderentleerung und Regel für den Kapazitätsausbau).
+Gesucht wird die Kombination aus SONDERENTLEERUNG_FUELLMENGE_PROZENT und UEBERFUELLUNGEN_KAPAZITAETSAUSBAU mit den geringsten
+erwarteten Gesamtkosten, optional unter Einhaltung einer maximalen mittleren Überfüllungsrate.
+Verwendet wird Successive Halving mit Racing: Alle Kandidaten starten mit wenigen Simulationsläufen. Nach jeder Runde scheiden
+Kandidaten aus, die im paarweisen Vergleich (gemeinsame Zufallszahlen) signifikant teurer als der beste Kandidat sind oder die
+Überfüllungsrate signifikant überschreiten, sowie die schlechtere Hälfte. Die verbleibenden Kandidaten erhalten doppelt so viele Läufe.
+Ausführung über die Kommandozeile, z.B.:
+    python simulation/optimierung.py --szenario Besuch --max-ueberfuellungsrate 1.0 --prozesse 4
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import argparse
+import itertools
+import json
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+from parameter import TAGE, START_JAHR, modellparameter, arbeitsprozess_initialisieren
+from kalender import kalender_tabelle
+from simulation import simulation_rohdaten, seed_bloecke
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Kandidaten der Entleerungsstrategie
+Input:              handlungsoption (betrachtete Handlungsoption)
+                    schwellenwerte (Werte für SONDERENTLEERUNG_FUELLMENGE_PROZENT)
+                    ueberfuellungen (Werte für UEBERFUELLUNGEN_KAPAZITAETSAUSBAU)
+Output:             kandidaten (Liste von Überschreibungen der Modellparameter)
+Funktionsweise:     Variiert werden nur die Parameter, die für die Handlungsoption wirksam sind
+                    (Schwellenwert nur mit Sonderentleerung, Ausbauregel nur mit Kapazitätsausbau).
+"""
+def kandidaten_strategie(handlungsoption, schwellenwerte, ueberfuellungen):
+    raster = {}
+    if handlungsoption["sonderentleerung"]:
+        raster["SONDERENTLEERUNG_FUELLMENGE_PROZENT"] = list(schwellenwerte)
+    if handlungsoption["kapazitaetsausbau"]:
+        raster["UEBERFUELLUNGEN_KAPAZITAETSAUSBAU"] = list(ueberfuellungen)
+    kandidaten = [dict(zip(raster, werte)) for werte in itertools.product(*raster.values())]
+    for kandidat in kandidaten:
+        modellparameter(kandidat)
+    return kandidaten
+
+
+
+"""
+Funktion:           Bewertung eines Kandidaten auf einem Block von Simulationsläufen
+Input:              seeds (Zufallsstartwerte des Blocks)
+                    szenario, handlungsoption (betrachtete Kombination)
+                    engine (Simulationslogik)
+                    parameter (Überschreibungen der Modellparameter des Kandidaten)
+Output:             kosten (Gesamtkosten pro Simulationslauf)
+                    ueberfuellungsrate (mittlere tägliche Überfüllungsrate pro Simulationslauf in Prozent)
+Funktionsweise:     Die Simulation erfolgt mit gemeinsamen Zufallszahlen ("crn"), damit Kandidaten mit gleichem Zufallsstartwert
+                    dieselben Bewohner, Gäste und Ausfälle erleben und paarweise verglichen werden können.
+"""
+def bewertung_block(seeds, szenario, handlungsoption, engine, parameter):
+    speicher = simulation_rohdaten(seeds, szenario, handlungsoption, engine, "crn", parameter, tageswerte=False)
+    return speicher.summe("kosten_tag"), speicher.summe("ueberfuellungsrate_tag") / TAGE
+
+
+
+"""
+Funktion:           Mittelwert und Konfidenzintervall
+Input:              werte (Werte pro Simulationslauf)
+                    z_wert (Quantil der Standardnormalverteilung, 1.96 = 95%-Konfidenzintervall)
+Output:             mittelwert, halbbreite
+"""
+def konfidenz(werte, z_wert=1.96):
+    mittelwert = float(np.mean(werte))
+    halbbreite = z_wert * float(np.std(werte, ddof=1)) / math.sqrt(len(werte)) if len(werte) > 1 else math.inf
+    return mittelwert, halbbreite
+
+
+
+"""
+Funktion:           Optimierung der Entleerungsstrategie mit Successive Halving
+Input:              kandidaten (Liste von Überschreibungen der Modellparameter, siehe kandidaten_strategie)
+                    szenario, handlungsoption (betrachtete Kombination)
+                    start_durchlaeufe (Simulationsläufe pro Kandidat in der ersten Runde)
+                    max_durchlaeufe (Höchstanzahl an Simulationsläufen pro Kandidat)
+                    eta (Faktor: Anteil 1/eta der Kandidaten verbleibt pro Runde, Anzahl der Läufe wächst um eta)
+                    max_ueberfuellungsrate (maximale mittlere Überfüllungsrate in Prozent, None = ohne Nebenbedingung)
+                    z_wert (Quantil für die ausgewiesenen Konfidenzintervalle, 1.96 = 95%)
+                    alpha (Irrtumswahrscheinlichkeit für das Ausscheiden pro Runde, Bonferroni-korrigiert über die Anzahl der Vergleiche)
+                    engine (Simulationslogik, Standard "numpy")
+                    anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+                    chunk_groesse (Anzahl der Simulationsläufe pro Arbeitspaket)
+Output:             ergebnis (Dictionary mit bester Strategie inkl. Konfidenzintervallen, Verlauf der Runden, Rangliste und verbrauchtem Budget)
+Funktionsweise:     Alle Kandidaten verwenden dieselben Zufallsstartwerte 1000, 1001, ..., in jeder Runde werden nur die neuen Läufe simuliert.
+                    Nach jeder Runde werden die Kandidaten bewertet: zuerst nach der Überschreitung der maximalen Überfüllungsrate
+                    (mittlere Überfüllungsrate abzüglich der Grenze, 0 für zulässige Kandidaten), dann nach mittleren Gesamtkosten.
+                    Ist kein Kandidat zulässig, ist damit der Kandidat mit der geringsten Überschreitung der beste.
+                    Ausgeschieden werden Kandidaten, deren Überfüllungsrate auch an der unteren Konfidenzgrenze über der Grenze liegt,
+                    Kandidaten, deren gepaarte Kostendifferenz zum besten Kandidaten signifikant positiv ist (Racing, Niveau alpha / Anzahl Vergleiche),
+                    und anschließend alle bis auf die besten ceil(n / eta) Kandidaten (Successive Halving).
+                    Der Kostenvergleich erfolgt nur zwischen zulässigen bzw. zwischen unzulässigen Kandidaten. Da der beste Kandidat die geringste
+                    Überschreitung hat, scheidet über die Kosten und die Rangfolge nie ein Kandidat mit geringerer Überschreitung zugunsten
+                    eines günstigeren Kandidaten mit höherer Überschreitung aus.
+                    Die Optimierung endet, wenn ein Kandidat verbleibt oder die Höchstanzahl an Läufen erreicht ist.
+"""
+def successive_halving(kandidaten, szenario, handlungsoption, start_durchlaeufe=50, max_durchlaeufe=1000, eta=2, max_ueberfuellungsrate=None, z_wert=1.96, alpha=0.05, engine="numpy", anzahl_prozesse=1, chunk_groesse=50):
+    kosten = [np.empty(0) for _ in kandidaten]
+    raten = [np.empty(0) for _ in kandidaten]
+    ausgeschieden = {} # Kandidat -> Runde des Ausscheidens
+    aktiv = list(range(len(kandidaten)))
+    runden = []
+    budget = 0
+    durchlaeufe = 0
+    ziel = min(start_durchlaeufe, max_durchlaeufe)
+
+    def ueberschreitung(i):
+        return 0.0 if max_ueberfuellungsrate is None else max(0.0, float(raten[i].mean()) - max_ueberfuellungsrate)
+
+    def zulaessig(i):
+        return ueberschreitung(i) == 0.0
+
+    def rangfolge(kandidat_nr):
+        return (ueberschreitung(kandidat_nr), float(kosten[kandidat_nr].mean()))
+
+    pool = None
+    if anzahl_prozesse > 1:
+        kalender_tabelle(TAGE, START_JAHR) # Kalendertabelle vor dem Start der Prozesse erstellen (wird beim Forken übernommen)
+        pool = ProcessPoolExecutor(max_workers=anzahl_prozesse, initializer=arbeitsprozess_initialisieren, initargs=(TAGE, START_JAHR))
+    try:
+        while True:
+            # Simulation der neuen Läufe aller aktiven Kandidaten (gemeinsame Zufallsstartwerte)
+            bloecke = [[seed + durchlaeufe for seed in seeds] for seeds in seed_bloecke(ziel - durchlaeufe, chunk_groesse)]
+            aufgaben = [(i, seeds) for i in aktiv for seeds in bloecke]
+            if pool is None:
+                teilergebnisse = [bewertung_block(seeds, szenario, handlungsoption, engine, kandidaten[i]) for i, seeds in aufgaben]
+            else:
+                futures = [pool.submit(bewertung_block, seeds, szenario, handlungsoption, engine, kandidaten[i]) for i, seeds in aufgaben]
+                teilergebnisse = [future.result() for future in futures]
+            for (i, _), (block_kosten, block_raten) in zip(aufgaben, teilergebnisse):
+                kosten[i] = np.concatenate([kosten[i], block_kosten])
+                raten[i] = np.concatenate([raten[i], block_raten])
+            budget += len(aktiv) * (ziel - durchlaeufe)
+            durchlaeufe = ziel
+
+            # Bewertung und Ausscheiden
+            aktiv.sort(key=rangfolge)
+            bester = aktiv[0]
+            runde = {"runde": len(runden) + 1, "durchlaeufe": durchlaeufe, "kandidaten": len(aktiv), "bester": kandidaten[bester], "gesamtkosten": round(float(kosten[bester].mean()), 3)}
+            runden.append(runde)
+            print( f"   Runde {runde['runde']}: {runde['kandidaten']} Kandidaten mit {durchlaeufe} Läufen, bester {kandidaten[bester]} (Gesamtkosten {runde['gesamtkosten']})" )
+            if len(aktiv) == 1 or durchlaeufe >= max_durchlaeufe:
+                break
+            z_ausscheiden = NormalDist().inv_cdf(1 - alpha / (2 * (len(aktiv) - 1))) # Bonferroni-Korrektur
+            verbleibend = []
+            for i in aktiv:
+                if max_ueberfuellungsrate is not None:
+                    mittelwert, halbbreite = konfidenz(raten[i], z_ausscheiden)
+                    if mittelwert - halbbreite > max_ueberfuellungsrate and i != bester:
+                        continue
+                if i != bester and zulaessig(i) == zulaessig(bester):
+                    mittelwert, halbbreite = konfidenz(kosten[i] - kosten[bester], z_ausscheiden)
+                    if mittelwert - halbbreite > 0:
+                        continue
+                verbleibend.append(i)
+            verbleibend = verbleibend[:math.ceil(len(aktiv) / eta)]
+            for i in aktiv:
+                if i not in verbleibend:
+                    ausgeschieden[i] = runde["runde"]
+            aktiv = verbleibend
+            ziel = min(durchlaeufe * eta, max_durchlaeufe)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    bester = aktiv[0]
+    kosten_mittelwert, kosten_halbbreite = konfidenz(kosten[bester], z_wert)
+    rate_mittelwert, rate_halbbreite = konfidenz(raten[bester], z_wert)
+    rangliste = []
+    for i in sorted(range(len(kandidaten)), key=lambda i: (i not in aktiv, -len(kosten[i]), rangfolge(i))):
+        eintrag = {"parameter": kandidaten[i], "durchlaeufe": len(kosten[i]), "gesamtkosten": round(float(kosten[i].mean()), 3),
+                   "ueberfuellungsrate": round(float(raten[i].mean()), 4), "ausgeschieden_in_runde": ausgeschieden.get(i)}
+        if i != bester:
+            anzahl = min(len(kosten[i]), len(kosten[bester]))
+            differenz, halbbreite = konfidenz(kosten[i][:anzahl] - kosten[bester][:anzahl], z_wert)
+            eintrag["differenz_zum_besten"] = {"mittelwert": round(differenz, 3), "halbbreite": round(halbbreite, 3)}
+        rangliste.append(eintrag)
+
+    ergebnis = {
+        "beste_strategie": kandidaten[bester],
+        "zulaessig": zulaessig(bester),
+        "durchlaeufe": len(kosten[bester]),
+        "gesamtkosten": {"mittelwert": round(kosten_mittelwert, 3), "untere_grenze": round(kosten_mittelwert - kosten_halbbreite, 3), "obere_grenze": round(kosten_mittelwert + kosten_halbbreite, 3)},
+        "ueberfuellungsrate": {"mittelwert": round(rate_mittelwert, 4), "untere_grenze": round(rate_mittelwert - rate_halbbreite, 4), "obere_grenze": round(rate_mittelwert + rate_halbbreite, 4)},
+        "max_ueberfuellungsrate": max_ueberfuellungsrate,
+        "budget": {"simulationslaeufe": budget, "vollstaendige_auswertung": len(kandidaten) * max_durchlaeufe},
+        "runden": runden,
+        "rangliste": rangliste,
+    }
+    return ergebnis
+
+
+
+"""
+Funktion:           Kommandozeile der Optimierung
+Funktionsweise:     Szenario und Handlungsoption werden aus main.py übernommen ("kombiniert" = Sonderentleerung und Kapazitätsausbau).
+                    Das Ergebnis wird in der Konsole ausgegeben und als JSON gespeichert.
+"""
+def main():
+    from main import SZENARIEN, HANDLUNGSOPTIONEN
+    handlungsoptionen = dict(HANDLUNGSOPTIONEN, kombiniert={"kapazitaetsausbau": True, "sonderentleerung": True})
+
+    parser = argparse.ArgumentParser(description="Optimierung der Entleerungsstrategie (Successive Halving)")
+    parser.add_argument("--szenario", default="Normal", choices=list(SZENARIEN))
+    parser.add_argument("--handlungsoption", default="kombiniert", choices=list(handlungsoptionen))
+    parser.add_argument("--schwellenwerte", type=float, nargs="+", default=[50, 60, 70, 80, 90, 100], help="Kandidaten für SONDERENTLEERUNG_FUELLMENGE_PROZENT")
+    parser.add_argument("--ueberfuellungen", type=int, nargs="+", default=[1, 2, 3, 4, 5], help="Kandidaten für UEBERFUELLUNGEN_KAPAZITAETSAUSBAU")
+    parser.add_argument("--max-ueberfuellungsrate", type=float, default=None, help="maximale mittlere tägliche Überfüllungsrate in Prozent")
+    parser.add_argument("--start-durchlaeufe", type=int, default=50)
+    parser.add_argument("--max-durchlaeufe", type=int, default=1000)
+    parser.add_argument("--eta", type=int, default=2)
+    parser.add_argument("--engine", default="numpy", choices=["simpy", "numpy", "ereignis"])
+    parser.add_argument("--prozesse", type=int, default=1)
+    parser.add_argument("--ausgabe", default=os.path.join("output", "optimierung.json"))
+    argumente = parser.parse_args()
+
+    handlungsoption = handlungsoptionen[argumente.handlungsoption]
+    kandidaten = kandidaten_strategie(handlungsoption, argumente.schwellenwerte, argumente.ueberfuellungen)
+    if not kandidaten or kandidaten == [{}]:
+        print("[Info] Die Handlungsoption hat keine Parameter der Entleerungsstrategie.")
+        return 1
+    print( f"[Info] Optimierung gestartet: {len(kandidaten)} Kandidaten, Szenario = {argumente.szenario}, Handlungsoption = {argumente.handlungsoption}" )
+    ergebnis = successive_halving(kandidaten, SZENARIEN[argumente.szenario], handlungsoption, argumente.start_durchlaeufe, argumente.max_durchlaeufe,
+                                  argumente.eta, argumente.max_ueberfuellungsrate, engine=argumente.engine, anzahl_prozesse=argumente.prozesse)
+    ergebnis.update({"szenario": argumente.szenario, "handlungsoption": argumente.handlungsoption, "engine": argumente.engine})
+
+    kosten, rate, budget = ergebnis["gesamtkosten"], ergebnis["ueberfuellungsrate"], ergebnis["budget"]
+    print( f"[Info] Beste Strategie: {ergebnis['beste_strategie']}{'' if ergebnis['zulaessig'] else ' (Überfüllungsrate nicht eingehalten)'}" )
+    print( f"       Gesamtkosten = {kosten['mittelwert']} EUR (95%-KI {kosten['untere_grenze']} bis {kosten['obere_grenze']}, {ergebnis['durchlaeufe']} Läufe)" )
+    print( f"       Überfüllungsrate = {rate['mittelwert']}% (95%-KI {rate['untere_grenze']} bis {rate['obere_grenze']})" )
+    print( f"       Budget = {budget['simulationslaeufe']} Simulationsläufe (vollständige Auswertung: {budget['vollstaendige_auswertung']})" )
+    os.makedirs(os.path.dirname(argumente.ausgabe) or ".", exist_ok=True)
+    with open(argumente.ausgabe, "w", encoding="utf-8") as datei:
+        json.dump(ergebnis, datei, indent=2, ensure_ascii=False)
+    print(f"[Info] Ergebnis gespeichert: {argumente.ausgabe}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
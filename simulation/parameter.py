@@ -31,10 +31,53 @@ REST_MUELLTONE_KOSTEN_STAFFEL = { # Kosten für die Entleerung pro Tonnengröße
     240: round(382.20 / 52 * 2, 4), 
     770: round(1021.80 / 52 * 2, 4), 
     1100: round(1416.48 / 52 * 2, 4)}
+UEBERFUELLUNGEN_KAPAZITAETSAUSBAU = 3 # Nach drei aufeinanderfolgenden Leerungen mit Überfüllung wird die Kapazität auf die nächst größere Tonne erhöht
 
 # Handlungsoption: Sonderentleerung
 SONDERENTLEERUNG_FUELLMENGE_PROZENT = 80 # (Schwellenwert) Beim Erreichen eines Füllwerten von 80% wird eine Sonderentleerung veranlasst
 
+# Parameter der Simulationslogik, die an die Simulation übergeben und in einer Parameterstudie (sweep.py) variiert werden können
+MODELLPARAMETER = ["ANZAHL_BEWOHNER", "P_ABWESEND", "RESTMUELL_MENGE_PRO_PERSON_TAG", "REST_MUELLTONE_STAFFEL", "REST_MUELLTONE_KOSTEN_STAFFEL", "UEBERFUELLUNGEN_KAPAZITAETSAUSBAU", "SONDERENTLEERUNG_FUELLMENGE_PROZENT"]
+
+
+"""
+Funktion:           Parameter der Simulationslogik inkl. Überschreibungen
+Input:              ueberschreibungen (Dictionary Parametername -> Wert, None = Standardwerte dieser Datei)
+Output:             parameter (Dictionary aller Modellparameter)
+Funktionsweise:     Nicht angegebene Parameter erhalten den Standardwert aus dieser Datei.
+                    Unbekannte Parameter, eine nicht aufsteigende Tonnenstaffel und Tonnengrößen ohne Kosten führen zu einem ValueError.
+"""
+def modellparameter(ueberschreibungen=None):
+    parameter = {name: globals()[name] for name in MODELLPARAMETER}
+    for name, wert in (ueberschreibungen or {}).items():
+        if name not in parameter:
+            raise ValueError(f"Unbekannter Modellparameter: {name} (möglich: {', '.join(MODELLPARAMETER)})")
+        parameter[name] = wert
+    if list(parameter["REST_MUELLTONE_STAFFEL"]) != sorted(set(parameter["REST_MUELLTONE_STAFFEL"])):
+        raise ValueError("REST_MUELLTONE_STAFFEL muss aufsteigend sortiert sein und darf keine Tonnengröße doppelt enthalten")
+    fehlende_kosten = [kapa for kapa in parameter["REST_MUELLTONE_STAFFEL"] if kapa not in parameter["REST_MUELLTONE_KOSTEN_STAFFEL"]]
+    if fehlende_kosten:
+        raise ValueError(f"Keine Kosten für die Tonnengrößen {fehlende_kosten} in REST_MUELLTONE_KOSTEN_STAFFEL")
+    return parameter
+
+
+
+
+"""
+Funktion:           Initialisierung eines Arbeitsprozesses (Initializer der Prozess-Pools)
+Input:              tage (Anzahl der Tage, die pro Simulationslauf betrachtet werden)
+                    start_jahr (Startjahr der Simulation)
+Funktionsweise:     TAGE und START_JAHR werden auf die Werte des Hauptprozesses gesetzt und die Kalendertabelle wird erstellt.
+                    Die Simulationsmodule übernehmen TAGE beim Import. Beim Starten der Prozesse mit spawn oder forkserver werden sie
+                    im Arbeitsprozess neu importiert (erst mit dem ersten Arbeitspaket, also nach dem Initializer), sodass geänderte Werte
+                    des Hauptprozesses (z.B. parameter.TAGE im Benchmark) auch in den Arbeitsprozessen gelten.
+"""
+def arbeitsprozess_initialisieren(tage, start_jahr):
+    global TAGE, START_JAHR
+    TAGE, START_JAHR = tage, start_jahr
+    from kalender import kalender_tabelle
+    kalender_tabelle(tage, start_jahr)
+
 # --------------------------
 # ---------- Ende ----------
 # --------------------------
\ No newline at end of file
@@ -0,0 +1,339 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die globale Sensitivitätsanalyse der erwarteten Gesamtkosten.
+Über vorgegebene Bereiche der Eingangsgrößen (Wahrscheinlichkeiten des Szenarios und Modellparameter aus parameter.py) werden
+Parameterpunkte als Latin-Hypercube-Stichprobe oder als Saltelli-Stichprobe (Matrizen A, B und A_B^(i)) gezogen.
+Jeder Parameterpunkt wird mit denselben Zufallsstartwerten (gemeinsame Zufallszahlen) simuliert, die Zielgröße ist der Mittelwert der Gesamtkosten.
+Die Auswertung erfolgt mit der NumPy-Engine, wobei viele Parameterpunkte gemeinsam als ein Block (ein Parameterwert pro Simulationslauf) berechnet werden.
+Ausgewiesen werden die Sobol-Indizes erster Ordnung und die Totaleffekte mit Bootstrap-Konfidenzintervallen.
+Ausführung über die Kommandozeile, z.B.:
+    python simulation/sensitivitaet.py --bereich P_BESUCH=0.02:0.2 --bereich P_ABWESEND=0:0.2 --anzahl 1024 --prozesse 8
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+from parameter import TAGE, START_JAHR, MODELLPARAMETER, modellparameter, arbeitsprozess_initialisieren
+from kalender import kalender_tabelle
+from vektorisiert import simulation_batch
+
+
+SZENARIOPARAMETER = ["P_BESUCH", "P_AUSFALL"] # Eingangsgrößen aus dem Szenario, alle anderen sind Modellparameter
+GANZZAHLIG = ["ANZAHL_BEWOHNER", "UEBERFUELLUNGEN_KAPAZITAETSAUSBAU"] # Werte werden gleichverteilt aus den ganzen Zahlen des Bereichs gezogen
+STANDARD_BEREICHE = {
+    "P_BESUCH": (0.02, 0.2),
+    "P_AUSFALL": (0.0, 0.03),
+    "P_ABWESEND": (0.0, 0.2),
+    "RESTMUELL_MENGE_PRO_PERSON_TAG": (3.0, 6.0),
+    "SONDERENTLEERUNG_FUELLMENGE_PROZENT": (50.0, 100.0),
+}
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Prüfung der Bereiche der Eingangsgrößen
+Input:              bereiche (Dictionary Name -> (untere Grenze, obere Grenze))
+Output:             bereiche (geprüfte Bereiche als Dictionary Name -> (float, float))
+Funktionsweise:     Zulässig sind die Wahrscheinlichkeiten des Szenarios und die Zahlenwerte aus MODELLPARAMETER (nicht die Tonnenstaffel).
+                    Unbekannte Namen und leere Bereiche führen zu einem ValueError.
+"""
+def bereiche_pruefen(bereiche):
+    zulaessig = SZENARIOPARAMETER + [name for name, wert in modellparameter().items() if isinstance(wert, (int, float))]
+    geprueft = {}
+    for name, (untere, obere) in bereiche.items():
+        if name not in zulaessig:
+            raise ValueError(f"Unbekannte Eingangsgröße: {name} (möglich: {', '.join(zulaessig)})")
+        if not untere < obere:
+            raise ValueError(f"Leerer Bereich für {name}: {untere} bis {obere}")
+        geprueft[name] = (float(untere), float(obere))
+    return geprueft
+
+
+
+"""
+Funktion:           Latin-Hypercube-Stichprobe im Einheitswürfel
+Input:              anzahl (Anzahl der Punkte)
+                    dimensionen (Anzahl der Dimensionen)
+                    rng (Zufallsgenerator)
+Output:             punkte (Array der Form (anzahl x dimensionen) mit Werten in [0, 1))
+Funktionsweise:     Jede Dimension wird in anzahl gleich große Schichten geteilt. Pro Dimension wird jede Schicht genau einmal
+                    (zufällige Reihenfolge, zufällige Lage innerhalb der Schicht) verwendet.
+"""
+def latin_hypercube(anzahl, dimensionen, rng):
+    schichten = np.argsort(rng.random((dimensionen, anzahl)), axis=1).T
+    punkte = (schichten + rng.random((anzahl, dimensionen))) / anzahl
+    return punkte
+
+
+
+"""
+Funktion:           Umrechnung von Punkten im Einheitswürfel auf die Bereiche der Eingangsgrößen
+Input:              einheit (Array der Form (Punkte x Eingangsgrößen) mit Werten in [0, 1))
+                    bereiche (Dictionary Name -> (untere Grenze, obere Grenze), Reihenfolge = Spalten)
+Output:             werte (Array der Form (Punkte x Eingangsgrößen))
+"""
+def skalieren(einheit, bereiche):
+    werte = np.empty_like(einheit)
+    for spalte, (name, (untere, obere)) in enumerate(bereiche.items()):
+        if name in GANZZAHLIG:
+            werte[:, spalte] = np.floor(math.ceil(untere) + einheit[:, spalte] * (math.floor(obere) - math.ceil(untere) + 1))
+        else:
+            werte[:, spalte] = untere + einheit[:, spalte] * (obere - untere)
+    return werte
+
+
+
+"""
+Funktion:           Stichprobe der Parameterpunkte
+Input:              bereiche (Dictionary Name -> (untere Grenze, obere Grenze))
+                    anzahl (Basisanzahl N der Stichprobe)
+                    methode ("saltelli" = Matrizen A, B und A_B^(i), N x (d + 2) Punkte; "lhs" = Latin Hypercube, N Punkte)
+                    seed (Startwert des Zufallsgenerators der Stichprobe)
+Output:             punkte (Array der Form (Punkte x Eingangsgrößen))
+Funktionsweise:     Bei "saltelli" werden A und B aus einer gemeinsamen Latin-Hypercube-Stichprobe mit 2d Dimensionen gebildet
+                    (A = erste d Spalten, B = letzte d Spalten). Die Matrix A_B^(i) entspricht A mit der i-ten Spalte aus B.
+                    Die Punkte werden in der Reihenfolge A, B, A_B^(1), ..., A_B^(d) zurückgegeben.
+"""
+def stichprobe(bereiche, anzahl, methode="saltelli", seed=0):
+    rng = np.random.default_rng(seed)
+    d = len(bereiche)
+    if methode == "lhs":
+        return skalieren(latin_hypercube(anzahl, d, rng), bereiche)
+    basis = latin_hypercube(anzahl, 2 * d, rng)
+    a, b = basis[:, :d], basis[:, d:]
+    matrizen = [a, b]
+    for i in range(d):
+        ab = a.copy()
+        ab[:, i] = b[:, i]
+        matrizen.append(ab)
+    punkte = skalieren(np.concatenate(matrizen), bereiche)
+    return punkte
+
+
+
+"""
+Funktion:           Auswertung eines Blocks von Parameterpunkten (Arbeitspaket für einen Prozess)
+Input:              punkte (Array der Form (Punkte x Eingangsgrößen))
+                    namen (Namen der Eingangsgrößen, Reihenfolge = Spalten)
+                    szenario (Szenario für die nicht variierten Wahrscheinlichkeiten)
+                    handlungsoption (betrachtete Handlungsoption)
+                    seeds (Zufallsstartwerte der Simulationsläufe pro Parameterpunkt)
+Output:             kosten (mittlere Gesamtkosten pro Parameterpunkt)
+Funktionsweise:     Alle Parameterpunkte des Blocks werden in einer vektorisierten Simulation mit Punkte x Wiederholungen Simulationsläufen berechnet.
+                    Jeder Simulationslauf erhält die Werte seines Parameterpunkts (Arrays mit einem Wert pro Simulationslauf).
+                    Alle Punkte verwenden dieselben Zufallsstartwerte mit gemeinsamen Zufallszahlen ("crn").
+"""
+def auswertung_block(punkte, namen, szenario, handlungsoption, seeds):
+    wiederholungen = len(seeds)
+    szenario_laeufe, parameter_laeufe = dict(szenario), {}
+    for spalte, name in enumerate(namen):
+        werte = np.repeat(punkte[:, spalte], wiederholungen)
+        if name in GANZZAHLIG:
+            werte = werte.astype(np.int64)
+        (szenario_laeufe if name in SZENARIOPARAMETER else parameter_laeufe)[name] = werte
+    speicher = simulation_batch(np.tile(seeds, len(punkte)), szenario_laeufe, handlungsoption, varianzreduktion="crn", parameter=parameter_laeufe)
+    kosten = speicher.summe("kosten_tag").reshape(len(punkte), wiederholungen).mean(axis=1)
+    return kosten
+
+
+
+"""
+Funktion:           Auswertung aller Parameterpunkte
+Input:              punkte (Array der Form (Punkte x Eingangsgrößen))
+                    namen (Namen der Eingangsgrößen)
+                    szenario, handlungsoption (siehe auswertung_block)
+                    wiederholungen (Anzahl der Simulationsläufe pro Parameterpunkt)
+                    anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+                    block_laeufe (Anzahl der Simulationsläufe pro Arbeitspaket, bestimmt den Speicherbedarf)
+Output:             kosten (mittlere Gesamtkosten pro Parameterpunkt)
+Funktionsweise:     Die Parameterpunkte werden in Arbeitspakete mit etwa block_laeufe Simulationsläufen aufgeteilt und seriell bzw. in einem Prozess-Pool ausgewertet.
+                    Die Kalendertabelle wird für alle Arbeitspakete nur einmal pro Prozess erstellt. Die Ergebnisse werden in der Reihenfolge
+                    der Punkte zusammengesetzt und sind daher unabhängig von der Anzahl der Prozesse.
+"""
+def auswertung(punkte, namen, szenario, handlungsoption, wiederholungen=20, anzahl_prozesse=1, block_laeufe=2000):
+    seeds = np.arange(1000, 1000 + wiederholungen)
+    punkte_pro_block = max(1, block_laeufe // wiederholungen)
+    bloecke = [punkte[start:start + punkte_pro_block] for start in range(0, len(punkte), punkte_pro_block)]
+    kalender_tabelle(TAGE, START_JAHR) # Kalendertabelle vor dem Start der Prozesse erstellen (wird beim Forken übernommen)
+    if anzahl_prozesse <= 1:
+        teilergebnisse = [auswertung_block(block, namen, szenario, handlungsoption, seeds) for block in bloecke]
+    else:
+        with ProcessPoolExecutor(max_workers=anzahl_prozesse, initializer=arbeitsprozess_initialisieren, initargs=(TAGE, START_JAHR)) as pool:
+            futures = [pool.submit(auswertung_block, block, namen, szenario, handlungsoption, seeds) for block in bloecke]
+            teilergebnisse = [future.result() for future in futures]
+    kosten = np.concatenate(teilergebnisse)
+    return kosten
+
+
+
+"""
+Funktion:           Sobol-Indizes aus den Ergebnissen einer Saltelli-Stichprobe
+Input:              y_a, y_b (Ergebnisse der Matrizen A und B, Länge N)
+                    y_ab (Ergebnisse der Matrizen A_B^(i), Form (d x N))
+Output:             erste_ordnung, totaleffekt (Arrays der Länge d)
+Funktionsweise:     Schätzer nach Saltelli et al. (2010) für die erste Ordnung: mean(y_B * (y_AB_i - y_A)) / V
+                    und nach Jansen (1999) für den Totaleffekt: mean((y_A - y_AB_i)^2) / (2 V), mit V = Varianz von y_A und y_B.
+                    Alle Ergebnisse werden vorab um den Mittelwert von y_A und y_B verschoben, da der Schätzer der ersten Ordnung nicht
+                    verschiebungsinvariant ist und bei großem Mittelwert im Verhältnis zur Streuung (Gesamtkosten) sonst stark streut.
+                    Die Eingaben können zusätzliche führende Dimensionen haben (z.B. Bootstrap-Stichproben), gerechnet wird über die letzte Achse.
+"""
+def sobol_indizes(y_a, y_b, y_ab):
+    mittelwert = np.mean(np.concatenate([y_a, y_b], axis=-1), axis=-1, keepdims=True)
+    y_a, y_b, y_ab = y_a - mittelwert, y_b - mittelwert, y_ab - mittelwert[..., None, :]
+    varianz = np.var(np.concatenate([y_a, y_b], axis=-1), axis=-1)
+    erste_ordnung = np.mean(y_b[..., None, :] * (y_ab - y_a[..., None, :]), axis=-1) / varianz[..., None]
+    totaleffekt = np.mean((y_a[..., None, :] - y_ab) ** 2, axis=-1) / (2 * varianz[..., None])
+    return erste_ordnung, totaleffekt
+
+
+
+"""
+Funktion:           Sobol-Indizes erster Ordnung aus einer beliebigen Stichprobe (Latin Hypercube)
+Input:              x (Array der Form (N x d) mit den Werten der Eingangsgrößen)
+                    y (Ergebnisse der Punkte, Länge N)
+                    klassen (Anzahl der Klassen pro Eingangsgröße, None = Wurzel aus N)
+Output:             erste_ordnung (Array der Länge d)
+Funktionsweise:     Die Punkte werden pro Eingangsgröße nach ihrem Wert sortiert und in gleich große Klassen eingeteilt.
+                    Der Anteil der Varianz der Klassenmittelwerte an der Gesamtvarianz schätzt Var(E[Y | X_i]) / Var(Y).
+                    Da die Klassenmittelwerte auch ohne Einfluss der Eingangsgröße streuen, wird die Streuung innerhalb der Klassen
+                    abgezogen (Varianzanalyse: (SQ zwischen - (Klassen - 1) * MQ innerhalb) / SQ gesamt).
+                    Totaleffekte lassen sich aus einer einfachen Stichprobe nicht schätzen.
+"""
+def erste_ordnung_klassen(x, y, klassen=None):
+    klassen = klassen or max(2, round(math.sqrt(len(y))))
+    quadratsumme = np.sum((y - y.mean()) ** 2)
+    erste_ordnung = np.empty(x.shape[1])
+    for spalte in range(x.shape[1]):
+        gruppen = np.array_split(y[np.argsort(x[:, spalte], kind="stable")], klassen)
+        zwischen = sum(len(gruppe) * (gruppe.mean() - y.mean()) ** 2 for gruppe in gruppen)
+        innerhalb = sum(np.sum((gruppe - gruppe.mean()) ** 2) for gruppe in gruppen)
+        erste_ordnung[spalte] = (zwischen - (klassen - 1) * innerhalb / (len(y) - klassen)) / quadratsumme
+    return erste_ordnung
+
+
+
+"""
+Funktion:           Sobol-Indizes mit Bootstrap-Konfidenzintervallen
+Input:              punkte (Parameterpunkte, siehe stichprobe)
+                    kosten (Ergebnisse der Parameterpunkte)
+                    anzahl (Basisanzahl N der Stichprobe)
+                    methode ("saltelli" oder "lhs")
+                    bootstrap (Anzahl der Bootstrap-Stichproben)
+                    niveau (Konfidenzniveau der Intervalle)
+                    seed (Startwert des Zufallsgenerators für den Bootstrap)
+Output:             indizes (Array der Form (d x 6): erste Ordnung mit unterer/oberer Grenze, Totaleffekt mit unterer/oberer Grenze)
+Funktionsweise:     Für den Bootstrap werden die N Zeilen der Stichprobe mit Zurücklegen gezogen (bei "saltelli" dieselben Zeilen in A, B und allen A_B^(i)).
+                    Bei "saltelli" sind die Konfidenzgrenzen die Perzentile der Indizes über alle Bootstrap-Stichproben.
+                    Bei "lhs" verschieben doppelt gezogene Punkte den Klassenschätzer, der Bootstrap bestimmt daher nur den Standardfehler
+                    (Normalverteilungs-Intervall um den Schätzwert). Die Totaleffekte sind bei "lhs" NaN.
+"""
+def indizes_bootstrap(punkte, kosten, anzahl, methode="saltelli", bootstrap=1000, niveau=0.95, seed=0):
+    rng = np.random.default_rng(seed)
+    ziehungen = rng.integers(0, anzahl, (bootstrap, anzahl))
+    grenzen = [100 * (1 - niveau) / 2, 100 * (1 + niveau) / 2]
+    if methode == "lhs":
+        erste_ordnung = erste_ordnung_klassen(punkte, kosten)
+        stichproben = np.array([erste_ordnung_klassen(punkte[zeilen], kosten[zeilen]) for zeilen in ziehungen])
+        halbbreite = NormalDist().inv_cdf((1 + niveau) / 2) * np.std(stichproben, axis=0, ddof=1)
+        untere, obere = erste_ordnung - halbbreite, erste_ordnung + halbbreite
+        leer = np.full(len(erste_ordnung), np.nan)
+        return np.column_stack([erste_ordnung, untere, obere, leer, leer, leer])
+    y = kosten.reshape(-1, anzahl) # Zeilen: A, B, A_B^(1), ..., A_B^(d)
+    erste_ordnung, totaleffekt = sobol_indizes(y[0], y[1], y[2:])
+    stichproben_s, stichproben_t = sobol_indizes(y[0][ziehungen], y[1][ziehungen], y[2:][:, ziehungen].transpose(1, 0, 2))
+    untere_s, obere_s = np.percentile(stichproben_s, grenzen, axis=0)
+    untere_t, obere_t = np.percentile(stichproben_t, grenzen, axis=0)
+    return np.column_stack([erste_ordnung, untere_s, obere_s, totaleffekt, untere_t, obere_t])
+
+
+
+"""
+Funktion:           Kommandozeile der Sensitivitätsanalyse
+Funktionsweise:     Bereiche werden als NAME=untere:obere angegeben (ohne Angabe die STANDARD_BEREICHE), Szenario und Handlungsoptionen werden aus main.py übernommen.
+                    Alle Handlungsoptionen werden mit denselben Parameterpunkten ausgewertet.
+                    Die Indizes werden in der Konsole ausgegeben und als JSON gespeichert, die Parameterpunkte mit ihren Ergebnissen als CSV.
+"""
+def main():
+    from main import SZENARIEN, HANDLUNGSOPTIONEN
+
+    parser = argparse.ArgumentParser(description="Globale Sensitivitätsanalyse der Gesamtkosten (Sobol-Indizes)")
+    parser.add_argument("--bereich", action="append", default=None, metavar="NAME=UNTERE:OBERE", help=f"Bereich einer Eingangsgröße (mehrfach möglich), möglich: {', '.join(SZENARIOPARAMETER + MODELLPARAMETER)}")
+    parser.add_argument("--methode", default="saltelli", choices=["saltelli", "lhs"], help="saltelli = erste Ordnung und Totaleffekte, lhs = nur erste Ordnung")
+    parser.add_argument("--anzahl", type=int, default=512, help="Basisanzahl N der Stichprobe (saltelli: N x (d + 2) Parameterpunkte)")
+    parser.add_argument("--wiederholungen", type=int, default=20, help="Simulationsläufe pro Parameterpunkt")
+    parser.add_argument("--szenario", default="Normal", choices=list(SZENARIEN), help="Szenario für nicht variierte Wahrscheinlichkeiten")
+    parser.add_argument("--handlungsoption", nargs="+", default=list(HANDLUNGSOPTIONEN), choices=list(HANDLUNGSOPTIONEN))
+    parser.add_argument("--bootstrap", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="Startwert für Stichprobe und Bootstrap")
+    parser.add_argument("--prozesse", type=int, default=1)
+    parser.add_argument("--block-laeufe", type=int, default=2000, help="Simulationsläufe pro Arbeitspaket")
+    parser.add_argument("--ausgabe", default="output")
+    argumente = parser.parse_args()
+
+    bereiche = STANDARD_BEREICHE
+    if argumente.bereich:
+        bereiche = {}
+        for angabe in argumente.bereich:
+            name, _, grenzen = angabe.partition("=")
+            untere, _, obere = grenzen.partition(":")
+            bereiche[name.strip()] = (float(untere), float(obere))
+    bereiche = bereiche_pruefen(bereiche)
+    namen = list(bereiche)
+    punkte = stichprobe(bereiche, argumente.anzahl, argumente.methode, argumente.seed)
+    print( f"[Info] Sensitivitätsanalyse gestartet: {len(namen)} Eingangsgrößen, {len(punkte)} Parameterpunkte x {argumente.wiederholungen} Läufe x {len(argumente.handlungsoption)} Handlungsoptionen" )
+
+    import pandas as pd # Import zur Laufzeit (nur für die Ausgabe benötigt)
+    ergebnis = {"methode": argumente.methode, "anzahl": argumente.anzahl, "wiederholungen": argumente.wiederholungen, "szenario": argumente.szenario,
+                "bereiche": bereiche, "handlungsoptionen": {}}
+    df_punkte = pd.DataFrame(punkte, columns=namen)
+    for handlungsoption_key in argumente.handlungsoption:
+        beginn = time.perf_counter()
+        kosten = auswertung(punkte, namen, SZENARIEN[argumente.szenario], HANDLUNGSOPTIONEN[handlungsoption_key], argumente.wiederholungen, argumente.prozesse, argumente.block_laeufe)
+        indizes = indizes_bootstrap(punkte, kosten, argumente.anzahl, argumente.methode, argumente.bootstrap, seed=argumente.seed)
+        dauer = time.perf_counter() - beginn
+        df_punkte[f"gesamtkosten ({handlungsoption_key})"] = kosten
+
+        print( f"[Info] {handlungsoption_key}: Gesamtkosten {kosten.mean():.2f} EUR (Standardabweichung {kosten.std():.2f} EUR über die Parameterpunkte), {dauer:.1f} s" )
+        print( f"       {'Eingangsgröße':<38} {'erste Ordnung (95%-KI)':<28} {'Totaleffekt (95%-KI)':<28}" )
+        for name, (s, s_u, s_o, t, t_u, t_o) in zip(namen, indizes):
+            print( f"       {name:<38} {s:6.3f} ({s_u:6.3f} bis {s_o:6.3f})    {t:6.3f} ({t_u:6.3f} bis {t_o:6.3f})" )
+        ergebnis["handlungsoptionen"][handlungsoption_key] = {
+            "gesamtkosten_mittelwert": round(float(kosten.mean()), 4),
+            "gesamtkosten_varianz": round(float(kosten.var()), 4),
+            "laufzeit_s": round(dauer, 2),
+            "indizes": {name: {"erste_ordnung": None if math.isnan(werte[0]) else round(float(werte[0]), 4),
+                               "erste_ordnung_ki": [round(float(werte[1]), 4), round(float(werte[2]), 4)],
+                               "totaleffekt": None if math.isnan(werte[3]) else round(float(werte[3]), 4),
+                               "totaleffekt_ki": None if math.isnan(werte[3]) else [round(float(werte[4]), 4), round(float(werte[5]), 4)]}
+                        for name, werte in zip(namen, indizes)},
+        }
+
+    os.makedirs(argumente.ausgabe, exist_ok=True)
+    with open(os.path.join(argumente.ausgabe, "sensitivitaet.json"), "w", encoding="utf-8") as datei:
+        json.dump(ergebnis, datei, indent=2, ensure_ascii=False)
+    df_punkte.to_csv(os.path.join(argumente.ausgabe, "sensitivitaet_punkte.csv"), index=False)
+    print( f"[Info] Ergebnis gespeichert: {os.path.join(argumente.ausgabe, 'sensitivitaet.json')}" )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
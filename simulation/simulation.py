@@ -6,235 +6,439 @@ Prof. Dr. Marcel Hebing
 Julia Schmid (200022)
 
 
-Diese Datei beinhaltet die Simulationslogik.
+Diese Datei beinhaltet die Durchführung der Simulation (Simulationsläufe, Blöcke, Monte-Carlo Simulation, Prozess-Pool).
+Das Klassenmodell der Simulationslogik befindet sich in modell.py.
 """
 
 # -----------------------------
 # ---------- Imports ----------
-import random
-import simpy
+import functools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, Future
 # Globale Paramter importieren
-from parameter import TAGE, START_JAHR, ANZAHL_BEWOHNER,  P_ABWESEND, RESTMUELL_MENGE_PRO_PERSON_TAG, REST_MUELLTONE_STAFFEL, REST_MUELLTONE_KOSTEN_STAFFEL, SONDERENTLEERUNG_FUELLMENGE_PROZENT
-# Importiere alle Hilfsfunktionen
-from funktionen import *
+from parameter import TAGE, START_JAHR, modellparameter, arbeitsprozess_initialisieren
+from funktionen import berechnung_statistiken, ausgabe_csv
+# Klassenmodell der Simulationslogik (modell.py)
+from modell import MuellentsorgungsSystem, simulation_einzeln
+from vektorisiert import simulation_batch
+from ereignis import simulation_ereignis, Ereignisspeicher
+from grafik import histogramm_daten, grafiken_erstellen
+from kalender import kalender_tabelle
+from ergebnisspeicher import Ergebnisspeicher
+from statistik import Teilergebnis, paarvergleich
+import instrumentierung
+from instrumentierung import phase, zaehlen
 
 
 # --------------------------------
 # ---------- Funktionen ----------
 """
-Funktion:       Durchführung eines einzelnen Simulationslaufs      
-Input:          seed (Reproduzierbarkeitswert) 
+Funktion:       Durchführung eines Blocks von Simulationsläufen mit Speicherung aller Tageswerte
+Input:          seeds (Zufallsstartwerte der Simulationsläufe des Blocks)
                 szenario (betrachteten Szenario)   
                 handlungsoption (betrachtete Handlungsoption)  
-Output:         simulation_ergebnisse_metrik (Werte der erfassten Metriken)
-Funktionsweise: Zunächst wird eine SimPy-Umgebung initialisiert.
-                Anschließend wird das Müllentsorgungssystem-Modell erzeugt. 
-                Weiter wird die Simulation über den gesamten Betrachtungszeitraum ausgeführt.
-                Die erfassten Metriken werden im Dictionary gespeichert und zurückgegeben.
-"""
-def simulation_einzeln(seed, szenario, handlungsoption):
-    env = simpy.Environment() # Initialisierung der SimPy-Umgebung
-    model = MuellentsorgungsSystem(env, szenario, handlungsoption, seed) # Müllentsorgungssystem-Modell 
-    env.run(until=TAGE)  # Ausführung Simulation
-
-    # Metriken
-    simulation_ergebnisse_metrik = {
-        "kosten_tag": model.kosten_tag,
-        "anzahl_bewohner_tag": model.anzahl_bewohner_tag, 
-        "anzahl_besuch_tag": model.anzahl_besuch_tag,
-        "fuellmenge_tag": model.fuellmenge_tag,
-        "kapazitaet_tag": model.kapazitaet_tag,
-        "ueberfuellungsrate_tag": model.ueberfuellungsrate_tag,
-        "sonderentleerung_kosten_tag": model.sonderentleerung_kosten_tag,
-        "ueberfuellung_kosten_tag": model.ueberfuellung_kosten_tag,
-        "ausfall_tag": model.ausfall_tag
-    }
+                engine (Simulationslogik: "simpy" = Klassenmodell, "numpy" = vektorisierte Simulation, "ereignis" = ereignisgesteuerte Simulation)
+                varianzreduktion (None, "crn" oder "antithetisch")
+                parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+                tageswerte (False = Tageswerte werden nicht benötigt, nur Summen pro Lauf und Kennzahlen für die Statistik)
+Output:         speicher (Ergebnisspeicher mit einer Zeile pro Simulationslauf, bei der Ereignis-Engine ohne Tageswerte ein Ereignisspeicher)
+Funktionsweise: Für jeden Zufallsstartwert wird ein einzelner Simulationslauf durchgeführt.
+                Bei der NumPy-Engine wird der gesamte Block gleichzeitig simuliert.
+                Bei der Ereignis-Engine werden die Tageswerte nur bei Bedarf aus den Ereignissen der Simulationsläufe rekonstruiert,
+                ansonsten werden die Summen und Kennzahlen direkt aus den Ereignisläufen übernommen.
+                Die Ergebnisse werden in der Reihenfolge der Zufallsstartwerte in den Ergebnisspeicher geschrieben.
+"""
+def simulation_rohdaten(seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None, tageswerte=True):
+    zaehlen("simulationslaeufe", len(seeds))
+    parameter = modellparameter(parameter)
+    with phase(f"simulation ({engine})", durchlaeufe=len(seeds)):
+        if engine == "ereignis" and not tageswerte:
+            return Ereignisspeicher(simulation_ereignis(seeds, szenario, handlungsoption, varianzreduktion=varianzreduktion, parameter=parameter))
+        speicher = Ergebnisspeicher(len(seeds), TAGE)
+        if engine == "numpy":
+            return simulation_batch(seeds, szenario, handlungsoption, speicher, varianzreduktion=varianzreduktion, parameter=parameter)
+        if engine == "ereignis":
+            simulation_ereignis(seeds, szenario, handlungsoption, speicher, varianzreduktion=varianzreduktion, parameter=parameter)
+            return speicher
+        for lauf, seed in enumerate(seeds):
+            simulation_einzeln(seed, szenario, handlungsoption, speicher, lauf, varianzreduktion, parameter)
+        return speicher
 
-    return simulation_ergebnisse_metrik
+
+
+"""
+Funktion:       Durchführung eines Blocks von Simulationsläufen (Arbeitspaket für einen Prozess)
+Input:          seeds (Zufallsstartwerte der Simulationsläufe des Blocks)
+                szenario (betrachteten Szenario)   
+                handlungsoption (betrachtete Handlungsoption)  
+                engine (Simulationslogik: "simpy" = Klassenmodell, "numpy" = vektorisierte Simulation, "ereignis" = ereignisgesteuerte Simulation)
+                varianzreduktion (None, "crn" oder "antithetisch")
+                parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+                trajektorien (TrajektorienExport für die Tageswerte, None = kein Export)
+Output:         teilergebnis (laufende Statistik, Quantilskizzen und Histogramme der Summen pro Simulationslauf des Blocks)
+Funktionsweise: Der Block wird simuliert und die Tageswerte direkt in ein Teilergebnis übernommen.
+                Tageswerte werden nur für den Export der Trajektorien benötigt (Ereignis-Engine sonst ohne Rekonstruktion der Tageswerte).
+                Bereits vollständig exportierte Blöcke (z.B. bei einem erneuten Lauf ohne Cache) werden nicht erneut geschrieben.
+                Die Tageswerte selbst werden anschließend verworfen (bzw. vorher exportiert), zurückgegeben wird nur das kompakte Teilergebnis.
+                Die Summen der einzelnen Simulationsläufe werden nur bei Varianzreduktion (paarweiser Vergleich) aufbewahrt.
+"""
+def simulation_block(seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None, trajektorien=None):
+    exportieren = trajektorien is not None and not trajektorien.vorhanden(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)
+    speicher = simulation_rohdaten(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, tageswerte=exportieren)
+    if exportieren:
+        with phase("export (trajektorien)", durchlaeufe=len(seeds)):
+            trajektorien.schreiben(speicher, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)
+    with phase("statistik (erfassen)", durchlaeufe=len(seeds)):
+        teilergebnis = Teilergebnis(laufsummen_speichern=varianzreduktion is not None).erfassen(speicher)
+    return teilergebnis
 
 
 
 """
-Funktion:       Durchführung der Monte-Carlo Simulation      
+Funktion:       Durchführung eines Blocks von Simulationsläufen in einem Arbeitsprozess mit Instrumentierung
+Input:          start_ns (Startzeitpunkt der Instrumentierung im Hauptprozess)
+                seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien (siehe simulation_block)
+Output:         teilergebnis (Teilergebnis des Blocks inkl. der Messungen der Phasen und Zähler im Arbeitsprozess)
+Funktionsweise: Die Messungen werden im Hauptprozess beim Abholen des Teilergebnisses übernommen (siehe block_ergebnis).
+"""
+def simulation_block_instrumentiert(start_ns, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None, trajektorien=None):
+    instrumentierung.arbeitsprozess_aktivieren(start_ns)
+    teilergebnis = simulation_block(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien)
+    teilergebnis.messungen = instrumentierung.messungen_entnehmen()
+    return teilergebnis
+
+
+
+"""
+Funktion:       Laden eines Blocks aus dem Ergebnis-Cache
+Input:          cache (Ergebniscache oder Checkpoint, None = ohne Cache)
+                seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien (siehe simulation_block)
+Output:         teilergebnis (Teilergebnis des Blocks oder None, falls der Block simuliert werden muss)
+Funktionsweise: Bei einem Export der Tageswerte wird ein Block nur dann aus dem Cache geladen, wenn seine Tageswerte bereits exportiert sind.
+"""
+def block_laden(cache, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None, trajektorien=None):
+    if cache is None or (trajektorien is not None and not trajektorien.vorhanden(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)):
+        return None
+    return cache.laden(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)
+
+
+
+"""
+Funktion:       Ergebnis eines Blocks aus dem Ergebnis-Cache oder durch Simulation
+Input:          cache (Ergebniscache oder Checkpoint, None = ohne Cache)
+                seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien (siehe simulation_block)
+Output:         teilergebnis (laufende Statistik und Summen pro Simulationslauf des Blocks)
+Funktionsweise: Ist der Block bereits im Cache vorhanden, wird er geladen, ansonsten simuliert und im Cache gespeichert.
+"""
+def simulation_block_cache(cache, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None, trajektorien=None):
+    zaehlen("bloecke")
+    teilergebnis = block_laden(cache, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien)
+    if teilergebnis is None:
+        teilergebnis = simulation_block(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien)
+        if cache is not None:
+            cache.speichern(teilergebnis, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)
+    return teilergebnis
+
+
+
+"""
+Funktion:       Einreichen eines Blocks beim Prozess-Pool
+Input:          pool (ProcessPoolExecutor)
+                cache (Ergebniscache oder Checkpoint, None = ohne Cache)
+                seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien (siehe simulation_block)
+Output:         future (Future mit dem Teilergebnis des Blocks)
+Funktionsweise: Im Cache vorhandene Blöcke werden nicht an den Pool übergeben, sondern direkt als abgeschlossenes Future zurückgegeben.
+                Neu simulierte Blöcke werden im Hauptprozess gespeichert, sobald sie abgeschlossen sind (siehe block_sichern),
+                und nicht erst beim Zusammenführen. Bei einem Abbruch gehen daher nur die gerade laufenden Blöcke verloren.
+                Mit aktivierter Instrumentierung misst der Arbeitsprozess die Phasen des Blocks selbst (siehe simulation_block_instrumentiert).
+"""
+def block_einreichen(pool, cache, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None, trajektorien=None):
+    zaehlen("bloecke")
+    teilergebnis = block_laden(cache, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien)
+    if teilergebnis is None:
+        start_ns = instrumentierung.arbeitsprozess_start()
+        if start_ns is None:
+            future = pool.submit(simulation_block, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien)
+        else:
+            future = pool.submit(simulation_block_instrumentiert, start_ns, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien)
+        if cache is not None:
+            future.add_done_callback(functools.partial(block_sichern, cache, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter))
+        return future
+    future = Future()
+    future.set_result(teilergebnis)
+    return future
+
+
+
+"""
+Funktion:       Speicherung eines abgeschlossenen Blocks im Cache bzw. Checkpoint
+Input:          cache (Ergebniscache oder Checkpoint)
+                seeds, szenario, handlungsoption, engine, varianzreduktion, parameter (siehe simulation_block)
+                future (abgeschlossenes Future des Blocks)
+Funktionsweise: Die Funktion wird vom Prozess-Pool aufgerufen, sobald der Block abgeschlossen ist (in einem Hintergrund-Thread des Hauptprozesses).
+                Abgebrochene oder fehlgeschlagene Blöcke werden nicht gespeichert.
+"""
+def block_sichern(cache, seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, future):
+    if future.cancelled() or future.exception() is not None:
+        return
+    cache.speichern(future.result(), seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)
+
+
+
+"""
+Funktion:       Teilergebnis eines eingereichten Blocks
+Input:          future (Future aus block_einreichen)
+Output:         teilergebnis (laufende Statistik und Summen pro Simulationslauf des Blocks)
+Funktionsweise: Die Messungen der Instrumentierung im Arbeitsprozess werden übernommen und aus dem Teilergebnis entfernt.
+"""
+def block_ergebnis(future):
+    with phase("warten auf block"):
+        teilergebnis = future.result()
+    instrumentierung.messungen_uebernehmen(teilergebnis.messungen)
+    teilergebnis.messungen = None
+    return teilergebnis
+
+
+
+"""
+Funktion:       Aufteilung der Simulationsläufe einer Kombination in Blöcke (Arbeitspakete)
 Input:          durchlaeufe (Anzahl der Simulationsdurchläufe)
+                chunk_groesse (Anzahl der Simulationsläufe pro Block)
+Output:         bloecke (Liste der Zufallsstartwerte pro Block)
+Funktionsweise: Die Zufallsstartwerte 1000, 1001, ... werden der Reihe nach in Blöcke fester Größe aufgeteilt.
+                Die Aufteilung ist unabhängig von der Anzahl der Prozesse, dadurch sind die Ergebnisse reproduzierbar.
+"""
+def seed_bloecke(durchlaeufe, chunk_groesse):
+    seeds = [1000 + i for i in range(durchlaeufe)]
+    bloecke = [seeds[i:i + chunk_groesse] for i in range(0, durchlaeufe, chunk_groesse)]
+    return bloecke
+
+
+
+"""
+Funktion:       Prüfung des Abbruchkriteriums der adaptiven Anzahl an Simulationsläufen
+Input:          ergebnis (bisheriges Teilergebnis einer Kombination)
+                praezision (geforderte relative Genauigkeit, z.B. 0.01 = Halbbreite des 95%-Konfidenzintervalls höchstens 1% des Mittelwerts)
+                min_durchlaeufe (Mindestanzahl an Simulationsläufen)
+Output:         abbruch (True, wenn die geforderte Genauigkeit erreicht ist)
+Funktionsweise: Für die Gesamtkosten und die Gesamtfüllmenge pro Simulationslauf wird das 95%-Konfidenzintervall des Mittelwerts bestimmt.
+                Die Simulation einer Kombination kann beendet werden, sobald die Mindestanzahl erreicht ist und für beide Kennzahlen
+                die Halbbreite des Konfidenzintervalls relativ zum Mittelwert höchstens der geforderten Genauigkeit entspricht.
+"""
+def abbruch_erreicht(ergebnis, praezision, min_durchlaeufe):
+    if praezision is None or ergebnis.durchlaeufe < min_durchlaeufe:
+        return False
+    for name in ergebnis.skizzen:
+        mittelwert, halbbreite = ergebnis.konfidenzintervall(name)
+        if halbbreite > praezision * abs(mittelwert):
+            return False
+    return True
+
+
+
+"""
+Funktion:       Kennzahlen der adaptiven Anzahl an Simulationsläufen für die Ergebnistabelle
+Input:          ergebnis (Teilergebnis einer Kombination)
+Output:         kennzahlen (verwendete Anzahl an Simulationsläufen und erreichte relative Halbbreite der Konfidenzintervalle in Prozent)
+"""
+def kennzahlen_durchlaeufe(ergebnis):
+    kennzahlen = {"Anzahl": ergebnis.durchlaeufe}
+    for name in ergebnis.skizzen:
+        mittelwert, halbbreite = ergebnis.konfidenzintervall(name)
+        kennzahlen[f"KI-Halbbreite {name} (%)"] = round(halbbreite / abs(mittelwert) * 100, 3) if mittelwert else 0.0
+    return kennzahlen
+
+
+
+"""
+Funktion:       Durchführung der Monte-Carlo Simulation      
+Input:          durchlaeufe (Anzahl der Simulationsdurchläufe, bei adaptiver Anzahl die Höchstanzahl)
                 szenario (betrachteten Szenario)   
                 handlungsoption (betrachtete Handlungsoption)  
-Output:         simulation_ergebnisse_metrik (Werte der erfassten Metriken)
+                anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+                chunk_groesse (Anzahl der Simulationsläufe pro Arbeitspaket)
+                engine (Simulationslogik: "simpy" = Klassenmodell, "numpy" = vektorisierte Simulation, "ereignis" = ereignisgesteuerte Simulation)
+                praezision (geforderte relative Genauigkeit der Konfidenzintervalle, None = feste Anzahl an Simulationsläufen)
+                min_durchlaeufe (Mindestanzahl an Simulationsläufen bei adaptiver Anzahl)
+                varianzreduktion (None, "crn" oder "antithetisch")
+                cache (Ergebniscache oder Checkpoint, None = ohne Cache)
+                parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+                trajektorien (TrajektorienExport für die Tageswerte, None = kein Export)
+Output:         ergebnis (Teilergebnis mit laufender Statistik der erfassten Metriken und Summen pro Simulationslauf)
 Funktionsweise: Pro Anzahl der Simulationsdurchläufe wird ein Simulationslauf mit unterschiedlichen Zufallsstartwerten ausgeführt.
-                Die erfassten Metriken werden gemessen und zurückgegeben.
+                Die Simulationsläufe werden blockweise durchgeführt und die Teilergebnisse der Blöcke der Reihe nach zusammengeführt.
+                Bei adaptiver Anzahl wird nach jedem Block geprüft, ob die geforderte Genauigkeit erreicht ist (sequentielles Stichprobenverfahren).
+                Bei mehreren Prozessen werden die Blöcke auf einen Prozess-Pool verteilt.
+                Der Speicherbedarf hängt nur von der Blockgröße und nicht von der Anzahl der Simulationsdurchläufe ab.
+                Mit Ergebnis-Cache werden bereits simulierte Blöcke geladen und nur fehlende Blöcke simuliert.
 
 """
-def monte_carlo(durchlaeufe, szenario, handlungsoption):
-    simulation_ergebnisse_metrik = [simulation_einzeln(1000 + i, szenario, handlungsoption) for i in range(durchlaeufe)]
-    return simulation_ergebnisse_metrik
+def monte_carlo(durchlaeufe, szenario, handlungsoption, anzahl_prozesse=1, chunk_groesse=50, engine="simpy", praezision=None, min_durchlaeufe=100, varianzreduktion=None, cache=None, parameter=None, trajektorien=None):
+    ergebnis = Teilergebnis()
+    aufgaben = [(seeds, szenario, handlungsoption, engine, varianzreduktion, parameter, trajektorien) for seeds in seed_bloecke(durchlaeufe, chunk_groesse)]
+    if anzahl_prozesse <= 1:
+        for aufgabe in aufgaben:
+            ergebnis.zusammenfuehren(simulation_block_cache(cache, *aufgabe))
+            if abbruch_erreicht(ergebnis, praezision, min_durchlaeufe):
+                break
+        return ergebnis
+
+    kalender_tabelle(TAGE, START_JAHR) # Kalendertabelle vor dem Start der Prozesse erstellen (wird beim Forken übernommen)
+    with ProcessPoolExecutor(max_workers=anzahl_prozesse, initializer=arbeitsprozess_initialisieren, initargs=(TAGE, START_JAHR)) as pool:
+        futures = [block_einreichen(pool, cache, *aufgabe) for aufgabe in aufgaben]
+        for future in futures:
+            ergebnis.zusammenfuehren(block_ergebnis(future))
+            if abbruch_erreicht(ergebnis, praezision, min_durchlaeufe):
+                break
+        pool.shutdown(cancel_futures=True)
+    return ergebnis
 
 
 
 """
 Funktion:       Durchführung der Simulation mit den definierten Szenarien und Handlungsoptionen. 
-Input:          durchlaeufe (Anzahl der Simulationsdurchläufe)
+Input:          durchlaeufe (Anzahl der Simulationsdurchläufe, bei adaptiver Anzahl die Höchstanzahl)
                 szenario (betrachteten Szenario)   
                 handlungsoption (betrachtete Handlungsoption)  
+                anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+                chunk_groesse (Anzahl der Simulationsläufe pro Arbeitspaket)
+                engine (Simulationslogik: "simpy" = Klassenmodell, "numpy" = vektorisierte Simulation, "ereignis" = ereignisgesteuerte Simulation)
+                praezision (geforderte relative Genauigkeit der Konfidenzintervalle, None = feste Anzahl an Simulationsläufen)
+                min_durchlaeufe (Mindestanzahl an Simulationsläufen bei adaptiver Anzahl)
+                varianzreduktion (None = ein Zufallsstrom, "crn" = gemeinsame Zufallszahlen, "antithetisch" = zusätzlich antithetische Paare)
+                cache (Ergebniscache oder Checkpoint, None = ohne Cache)
+                parameter (Überschreibungen der Modellparameter, z.B. {"SONDERENTLEERUNG_FUELLMENGE_PROZENT": 70}, None = Standardwerte aus parameter.py)
+                trajektorien (TrajektorienExport für die Tageswerte aller Simulationsläufe, None = kein Export)
+                grafik_verzeichnis (Ausgabeordner der Grafiken, None = keine Grafiken)
 Output:         simulation_ergebnisse_metrik (Werte der erfassten Metriken)
 Funktionsweise: Für jede Szenario-Handlungsoption-Kombination wird eine Monte-Carlo Simulation mit der Anzahl an Durchläufen durchgeführt.
-                Für die erfassten Metriken werden Histogramme erstellt und Statistiken bestimmt und zurückgegeben. 
+                Bei adaptiver Anzahl wird jede Kombination nach jedem Block beendet, sobald die geforderte Genauigkeit erreicht ist.
+                Die verwendete Anzahl an Simulationsläufen wird als Metrik "durchlaeufe" in den Ergebnissen ausgewiesen.
+                Bei mehreren Prozessen werden die (Szenario, Handlungsoption, Seed-Block)-Arbeitspakete aller Kombinationen gemeinsam an einen Prozess-Pool übergeben,
+                sodass die Prozesse auch über die Grenzen der Kombinationen hinweg ausgelastet sind. Bei adaptiver Anzahl werden zunächst nur die Blöcke
+                der Mindestanzahl und anschließend pro Kombination so viele weitere Blöcke wie Prozesse vorausschauend eingereicht.
+                Die Teilergebnisse werden in der Reihenfolge der Zufallsstartwerte zusammengeführt und das Abbruchkriterium in dieser Reihenfolge geprüft.
+                Die Ergebnisse sind daher identisch zur seriellen Ausführung.
+                Für die erfassten Metriken werden Statistiken bestimmt und zurückgegeben.
+                Nach der Simulation aller Kombinationen werden die Histogramme (einzeln und als Gesamtgrafik) aus den Häufigkeiten erstellt (siehe grafik.py).
+                Bei Varianzreduktion werden zusätzlich die Gesamtkosten jeder Handlungsoption paarweise (gleiche Zufallsstartwerte) mit der ersten
+                Handlungsoption verglichen und als Metrik "differenz_gesamtkosten" inkl. Standardfehler ausgewiesen.
+                Mit Ergebnis-Cache werden nur Blöcke simuliert, die noch nicht im Cache vorhanden sind. Die Größe des Caches wird am Ende begrenzt.
+                Mit Trajektorien-Export werden die Tageswerte jedes Blocks geschrieben, sobald er simuliert ist (siehe trajektorien.py).
+                Die profilierte Kombination (siehe instrumentierung.py) wird auch bei mehreren Prozessen seriell im Hauptprozess simuliert,
+                da cProfile und tracemalloc nur den eigenen Prozess erfassen.
 """
-def simulationslauf(szenarien, handlungsoptionen, durchlaeufe):
-    simulation_ergebnisse_metrik = {}
-
-    # Jedes Szenario-Handlungsoption Kombination wird mit durchlaeufe-mal durchgeführt
-    for szenario_key, szenario_value in szenarien.items():
-        for handlungsoption_key, handlungsoption_value in handlungsoptionen.items():
+def simulationslauf(szenarien, handlungsoptionen, durchlaeufe, anzahl_prozesse=1, chunk_groesse=50, engine="simpy", praezision=None, min_durchlaeufe=100, varianzreduktion=None, cache=None, parameter=None, trajektorien=None, grafik_verzeichnis="output"):
+    teilergebnisse = {} # Zusammengeführte Teilergebnisse pro Kombination
+    kombinationen = [(szenario_key, handlungsoption_key) for szenario_key in szenarien for handlungsoption_key in handlungsoptionen]
+    bloecke = seed_bloecke(durchlaeufe, chunk_groesse)
+    # Anzahl der Blöcke, die in jedem Fall simuliert werden
+    start_bloecke = len(bloecke) if praezision is None else min(len(bloecke), math.ceil(min_durchlaeufe / chunk_groesse))
+    if trajektorien is not None:
+        for szenario_key, handlungsoption_key in kombinationen:
+            trajektorien.anmelden(szenario_key, handlungsoption_key, szenarien[szenario_key], handlungsoptionen[handlungsoption_key], engine, varianzreduktion, parameter)
+
+    # Parallele Ausführung: die sicher benötigten Arbeitspakete werden vorab an den Prozess-Pool übergeben
+    pool = None
+    eingereicht = {}
+    if anzahl_prozesse > 1:
+        kalender_tabelle(TAGE, START_JAHR) # Kalendertabelle vor dem Start der Prozesse erstellen (wird beim Forken übernommen)
+        pool = ProcessPoolExecutor(max_workers=anzahl_prozesse, initializer=arbeitsprozess_initialisieren, initargs=(TAGE, START_JAHR))
+        for szenario_key, handlungsoption_key in kombinationen:
+            if instrumentierung.profiliert(szenario_key, handlungsoption_key):
+                continue # Profiling nur im Hauptprozess (seriell)
+            eingereicht[(szenario_key, handlungsoption_key)] = [
+                block_einreichen(pool, cache, seeds, szenarien[szenario_key], handlungsoptionen[handlungsoption_key], engine, varianzreduktion, parameter, trajektorien) for seeds in bloecke[:start_bloecke]
+            ]
+
+    try:
+        # Jedes Szenario-Handlungsoption Kombination wird mit durchlaeufe-mal (bzw. bis zum Erreichen der Genauigkeit) durchgeführt
+        for szenario_key, handlungsoption_key in kombinationen:
             print( f"   Szenario = {szenario_key} \tHandlungsoption = {handlungsoption_key}" )
-            # Simulation
-            ergebnisse = monte_carlo(durchlaeufe, szenario_value, handlungsoption_value) # Anwendung der Funktion monte_carlo
-            # Histogramme der Metriken
-            grafik_histogramme(ergebnisse, szenario_key, handlungsoption_key) # Anwendung der Funktion grafik_histogramme
-            # Statistische Auswertung der Metriken
-            simulation_ergebnisse_metrik[(szenario_key, handlungsoption_key)] = (berechnung_statistiken(ergebnisse)) # Anwendung der Funktion berechnung_statistiken
-
+            # Zeitmessung und ggf. Profiling der Kombination (siehe instrumentierung.py)
+            with phase("kombination", szenario=szenario_key, handlungsoption=handlungsoption_key), instrumentierung.profil(szenario_key, handlungsoption_key):
+                # Simulation
+                if pool is None or instrumentierung.profiliert(szenario_key, handlungsoption_key):
+                    ergebnisse = monte_carlo(durchlaeufe, szenarien[szenario_key], handlungsoptionen[handlungsoption_key], chunk_groesse=chunk_groesse, engine=engine, praezision=praezision, min_durchlaeufe=min_durchlaeufe, varianzreduktion=varianzreduktion, cache=cache, parameter=parameter, trajektorien=trajektorien) # Anwendung der Funktion monte_carlo
+                else:
+                    ergebnisse = Teilergebnis()
+                    futures = eingereicht.pop((szenario_key, handlungsoption_key))
+                    verbraucht = 0 # Anzahl der bereits zusammengeführten Blöcke (0 bei null Durchläufen)
+                    while verbraucht < len(bloecke):
+                        # Vorausschauend weitere Blöcke einreichen, damit die Prozesse ausgelastet bleiben
+                        while len(futures) < min(len(bloecke), verbraucht + 1 + anzahl_prozesse):
+                            futures.append(block_einreichen(pool, cache, bloecke[len(futures)], szenarien[szenario_key], handlungsoptionen[handlungsoption_key], engine, varianzreduktion, parameter, trajektorien))
+                        ergebnisse.zusammenfuehren(block_ergebnis(futures[verbraucht]))
+                        verbraucht += 1
+                        if abbruch_erreicht(ergebnisse, praezision, min_durchlaeufe):
+                            break
+                    for future in futures[verbraucht:]: # Nicht mehr benötigte Blöcke verwerfen
+                        future.cancel()
+                teilergebnisse[(szenario_key, handlungsoption_key)] = ergebnisse
+                if praezision is not None:
+                    print( f"      Durchläufe = {ergebnisse.durchlaeufe}" )
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.begrenzen()
+            print( f"[Info] Cache: {cache.treffer} Blöcke geladen, {cache.fehlschlaege} Blöcke simuliert." )
+
+    simulation_ergebnisse_metrik = ergebnisse_auswerten(teilergebnisse, szenarien, handlungsoptionen, praezision, varianzreduktion, anzahl_prozesse, grafik_verzeichnis=grafik_verzeichnis)
     return simulation_ergebnisse_metrik
 
-# ------------------------------------------------------
-# ---------- Klassenmodell (Simulationslogik) ----------
-"""
-Jeder Simulationsschritt entspricht einen Kalendertag.  
-Der Leertag der Mülltage wird zu Beginn der Simulation per Zufall gefällt.
-Jeden Tag wird Müll durch die Bewohner und ggf. den Gästen erzeugt. Die Anzahl der Besucher wird per Zufall betsimmt. 
-Der Müll wird in die Mülltonne geschmissen (Füllstand hinzugefügt).
-Alle 14 Tage erfolgt eine reguläre Leerung, solange der Leertag nicht auf einen Feiertag oder Ausfalltag fällt.
-Kommt es zu einer Überfüllung (Müllmenge > Kapazität), so entstehen Überfüllungszusatzkosten bei der Abholung.
-Bei mehrfacher Überfüllung kann, wenn die Kapazitäten es hergeben, die Tonnenkapazität erhöht werden. 
-Bei der Handlungsoption Sonderentleerung wird beim Erreichen eines bestimmten Füllstands die Leerung ausgelöst. Diese verusacht zusätzliche Kosten.
-"""
-class MuellentsorgungsSystem:
-    def __init__(self, env, szenario, handlungsoption, seed):
-        self.env = env
-        self.rng = random.Random(seed)
-        self.szenario = szenario
-        self.handlungsoption = handlungsoption
-
-        # Wochentag der Leertag der Mülltonne
-        self.leertag = self.rng.randint(0, 4) # Montag=0/Dienstag=1/Mittwoch=2/Donnerstag=3/Freitag=4
-        # Feiertage, die auf den Leertag fallen
-        self.feiertage = berechne_feiertage(self.leertag, TAGE, START_JAHR)
-        # Tageszähler: Tage seit letzter Leerung
-        self.tage_seit_letzter_leerung = 0
-
-        # Mülltonnen Startwerte
-        self.kapazitaet = 80 # Kapazität
-        self.fuellstand = 0.0 # Füllstand 
-        self.wochen_ueberfuellt = 0 # Überfüllungsindikator
-
-        # Metriken
-        self.kosten_tag = [] # Kosten
-        self.anzahl_bewohner_tag = [] # Anzahl der Bewohner
-        self.anzahl_besuch_tag = [] # Anzahl der Besucher
-        self.ausfall_tag = [] # Indikator, ob Ausfall stattgefunden hat
-        self.fuellmenge_tag = [] # Füllmenge der Tonne
-        self.kapazitaet_tag = [] # Kapazität der Tonne
-        self.ueberfuellungsrate_tag = [] # Überfüllungsrate
-        self.sonderentleerung_kosten_tag = [] # Kosten für die Sonderentleerung
-        self.ueberfuellung_kosten_tag = [] # Kosten bei Überfüllung 
-
-        # Prozess starten 
-        self.env.process(self.muellzyklus_taeglich()) # Müllzyklus (Entstehung bis Entsorgung)
-
-    def muellzyklus_taeglich(self):
-        while True:
-            tag = int(self.env.now)
-            
-            # Bestimmung des Datums des aktuellen Tages (Für Feiertag)
-            tag_datum = date(START_JAHR, 1, 1) + timedelta(days=tag)
-            self.tage_seit_letzter_leerung += 1
-
-            # Indikator, ob Tag ein Leertag ist (Wenn Tag auf Wochen-Leertag fällt und zwei Wochen seit der letzten Leerung vergangen sind)
-            ist_leertag = (tag_datum.weekday() == self.leertag and self.tage_seit_letzter_leerung >= 14)
-            # Indikator, ob Tag ein Feiertag ist
-            ist_feiertag = (tag_datum in self.feiertage)
-
-
-            # -------------------------
-            # Prozess: Müllproduktion  
-
-            # Müll der Bewohner (Szenario: Normales Müllaufkommen):
-            anzahl_bewohner = ANZAHL_BEWOHNER
-            # Mit eines Wahrscheinlichkeit sind die Bewohner aus dem Haus
-            if self.rng.random() < P_ABWESEND:
-                anzahl_bewohner = self.rng.randint(0, anzahl_bewohner)
-            self.fuellstand += anzahl_bewohner * RESTMUELL_MENGE_PRO_PERSON_TAG
-
-            # Müll der Gäste (Szenario: erhöhter Besuch)
-            anzahl_gaeste = 0
-            if self.rng.random() < self.szenario["P_BESUCH"]:
-                anzahl_gaeste = self.rng.randint(1, 10)  # Besucheranzahl zwischen 1 und 10
-                self.fuellstand += anzahl_gaeste * RESTMUELL_MENGE_PRO_PERSON_TAG * 0.25 # Müllmenge der Gäste entspricht lediglich 25 Prozent des reguläten Müllaufkommen pro Person
-            
-            self.anzahl_bewohner_tag.append(anzahl_bewohner) # Metrik (Anzahl der Bewohner)
-            self.anzahl_besuch_tag.append(anzahl_gaeste) # Metrik (Anzahl der Besucher)
-            self.ueberfuellungsrate_tag.append(ueberfuellungsrate(self.fuellstand, self.kapazitaet)) # Metrik (Überfüllungsrate)
-            self.fuellmenge_tag.append(self.fuellstand) # Metrik (Füllmenge der Tonne )
-            self.kapazitaet_tag.append(self.kapazitaet) # Metrik (Kapazität der Tonne)
-
-            # -------------------------
-            # Prozess: reguläre Leerung (Szenario: Normales Müllaufkommen/Ausfall) - Teil 1: Indikator
-            # Wenn Tag auf Leertag fällt, Tag keine Feiertag ist und an dem Tag kein Ausfall stattfindet (Szenario: Ausfall) wird geleert 
-            ist_ausfall = False
-            findet_regulaere_leerung_statt = False
-            if ist_leertag and (not ist_feiertag):
-                if self.rng.random() <= self.szenario["P_AUSFALL"]:
-                    ist_ausfall = True
-                else:
-                    findet_regulaere_leerung_statt = True
-                self.tage_seit_letzter_leerung = 0 # Zwei Wochen Zähler wird zurückgesetzte
-            self.ausfall_tag.append(ist_ausfall) # Metriken (Indikator, ob Ausfall stattgefunden hat)
-
-            # -------------------------
-            # Prozess: Sonderentleerung (Handlungsoption: Sonderentleerung)
-            kosten_sonderentleerung = 0
-            # Wenn die Handlungsoption Sonderentleerung in der Simulation betrachtet wird, keine reguläre Leerung stattfindet und der Schwellenwert für die Sonderentleerung erreicht ist, findet eine Sonderentleerung statt
-            if (not findet_regulaere_leerung_statt and self.handlungsoption["sonderentleerung"] and (self.fuellstand / self.kapazitaet * 100) >= SONDERENTLEERUNG_FUELLMENGE_PROZENT):
-                self.fuellstand = 0 # Tonne wird geleert --> Füllstand wird zurückgesetzt, auf 0 
-                kosten_sonderentleerung = REST_MUELLTONE_KOSTEN_STAFFEL[self.kapazitaet] * 1.4 # Sonderkosten liegen 140 Prozent über den normal Kosten
-                # Quelle: Abfallwirtschaft Hohenlohekreis. Qualitätsoffensive. Abgerufen am 25.01.2026 von https://www.abfallwirtschaft-hohenlohekreis.de/leistungen-gebühren/qualitätsoffensive
-            self.sonderentleerung_kosten_tag.append(kosten_sonderentleerung) # Metrik (Kosten für die Sonderentleerung)
-
-            # -------------------------
-            # Prozess: Überfuellung
-            kosten_ueberfuellung = 0
-            if findet_regulaere_leerung_statt:
-                # Überfüllungskosten:
-                ueber_liter = max(0, self.fuellstand - self.kapazitaet) # Überfüllungsmenge in Liter
-                kosten_ueberfuellung = ueberfuellungskosten(ueber_liter) # Überfüllungskosten
-                
-                # Anzahl der Überfülllungen:
-                if self.fuellstand > self.kapazitaet:
-                    self.wochen_ueberfuellt += 1
-                else:
-                    self.wochen_ueberfuellt = 0
-
-                # Wenn die Handlungsoption Kapazitaetsausbau in der Simulation betrachtet wird und in nach drei aufeianderfolgendenden Leerungen es zu einer Überfüllung kam, wird die Kapazität erweitert.
-                if self.handlungsoption["kapazitaetsausbau"] and self.wochen_ueberfuellt >= 3:
-                    # Bestimmung der möglichen Kapazitätsgrößen
-                    potenzielle_tonnen_kapa = [kapa for kapa in REST_MUELLTONE_STAFFEL if kapa > self.kapazitaet]
-                    if potenzielle_tonnen_kapa:
-                        self.kapazitaet = min(potenzielle_tonnen_kapa) # Auswahl der nächst größeren Kapazität
-                    self.wochen_ueberfuellt = 0 # Zähler für Überfüllungsanzahl auf 0 setzten
-            self.ueberfuellung_kosten_tag.append(kosten_ueberfuellung) # Metrik (Kosten bei Überfüllung) 
-
-            # -------------------------
-            # Prozess: reguläre Leerung (Szenario: Normales Müllaufkommen/Ausfall) - Teil 2: Tatsächliche Leerung inkl. Kostenbestimmung
-            tonnen_kosten = 0
-            if findet_regulaere_leerung_statt:
-                self.fuellstand = 0
-                tonnen_kosten = REST_MUELLTONE_KOSTEN_STAFFEL[self.kapazitaet]
-
-            # Gesamtkosten (Basiskosten + Überfüllung + Sonderleerung)
-            self.kosten_tag.append(tonnen_kosten + kosten_ueberfuellung + kosten_sonderentleerung) # Metrik (Kosten)
-
-            # Zeitfortschritt (1 Zeiteinheit = 1 Tag)
-            yield self.env.timeout(1) 
 
+
+"""
+Funktion:       Auswertung der zusammengeführten Teilergebnisse aller Kombinationen
+Input:          teilergebnisse (Dictionary (Szenario, Handlungsoption) -> Teilergebnis, in der Reihenfolge der Kombinationen)
+                szenarien (Dictionary der Szenarien)
+                handlungsoptionen (Dictionary der Handlungsoptionen)
+                praezision (geforderte relative Genauigkeit bei adaptiver Anzahl, None = feste Anzahl an Simulationsläufen)
+                varianzreduktion (None, "crn" oder "antithetisch")
+                anzahl_prozesse (Anzahl der parallelen Prozesse für die Grafiken)
+                ausgabe (Pfad der Ergebnistabelle als CSV, None = nicht speichern)
+                grafik_verzeichnis (Ausgabeordner der Grafiken, None = keine Grafiken)
+Output:         simulation_ergebnisse_metrik (Werte der erfassten Metriken)
+Funktionsweise: Pro Kombination werden die Statistiken der Metriken und die Häufigkeiten für die Histogramme bestimmt
+                (bei adaptiver Anzahl zusätzlich die Kennzahlen "durchlaeufe") und bei Varianzreduktion die Gesamtkosten
+                paarweise mit der ersten Handlungsoption verglichen. Die Ergebnistabelle wird gespeichert, bevor die Grafiken
+                erstellt werden, damit sie bei einem Fehler in den Grafiken erhalten bleibt.
+"""
+def ergebnisse_auswerten(teilergebnisse, szenarien, handlungsoptionen, praezision=None, varianzreduktion=None, anzahl_prozesse=1, ausgabe=None, grafik_verzeichnis="output"):
+    simulation_ergebnisse_metrik = {}
+    histogramme = {} # Häufigkeiten der Summen pro Simulationslauf für die Grafiken
+    for kombination, ergebnisse in teilergebnisse.items():
+        # Häufigkeiten für die Histogramme der Metriken
+        histogramme[kombination] = histogramm_daten(ergebnisse.histogramme)
+        # Statistische Auswertung der Metriken
+        with phase("berechnung_statistiken"):
+            simulation_ergebnisse_metrik[kombination] = (berechnung_statistiken(ergebnisse)) # Anwendung der Funktion berechnung_statistiken
+        if praezision is not None:
+            simulation_ergebnisse_metrik[kombination]["durchlaeufe"] = kennzahlen_durchlaeufe(ergebnisse)
+
+    # Paarweiser Vergleich der Handlungsoptionen mit der ersten Handlungsoption (Referenz)
+    if varianzreduktion is not None:
+        referenz_key = next(iter(handlungsoptionen))
+        for szenario_key, handlungsoption_key in teilergebnisse:
+            if handlungsoption_key != referenz_key:
+                simulation_ergebnisse_metrik[(szenario_key, handlungsoption_key)]["differenz_gesamtkosten"] = paarvergleich(
+                    teilergebnisse[(szenario_key, referenz_key)].laufsummen["gesamtkosten"], teilergebnisse[(szenario_key, handlungsoption_key)].laufsummen["gesamtkosten"], varianzreduktion == "antithetisch")
+
+    # Ergebnistabelle
+    if ausgabe is not None:
+        with phase("export"):
+            os.makedirs(os.path.dirname(ausgabe) or ".", exist_ok=True)
+            ausgabe_csv(simulation_ergebnisse_metrik).to_csv(ausgabe)
+        print(f"[Info] Ergebnisse gespeichert: {ausgabe}")
+
+    # Histogramme (Einzelgrafiken und Gesamtgrafik pro Metrik)
+    if grafik_verzeichnis is not None:
+        with phase("grafiken"):
+            grafiken_erstellen(histogramme, szenarien, handlungsoptionen, grafik_verzeichnis, anzahl_prozesse)
+
+    return simulation_ergebnisse_metrik
     
 # --------------------------
 # ---------- Ende ----------
@@ -0,0 +1,454 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die laufende (streamende) Statistik der Simulation.
+Die Metriken eines Blocks von Simulationsläufen werden direkt nach der Simulation in einen Akkumulator übernommen,
+sodass die einzelnen Tageswerte nicht aufbewahrt werden müssen. Akkumulatoren verschiedener Blöcke bzw. Prozesse können zusammengeführt werden.
+Die Verteilung der Summen pro Simulationslauf (Gesamtkosten, Gesamtfüllmenge) wird in einer Quantilskizze mit festen Klassen (Quantile P50, P90, P99)
+und in einem Histogramm mit festen, gleich breiten Klassen (exakte Häufigkeiten) geführt, ohne die Summen der einzelnen Läufe aufzubewahren.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import math
+import numpy as np
+
+
+# ---------------------------------------------------------
+# ---------- Klassenmodell (Statistik-Akkumulator) ----------
+"""
+Pro numerischer Metrik werden Anzahl, Mittelwert, Summe der quadrierten Abweichungen (M2), Minimum und Maximum geführt.
+Pro Boolean Metrik werden Anzahl der Werte und Anzahl der True-Werte (z.B. Ausfälle) geführt.
+Neue Werte werden blockweise nach dem Verfahren von Welford bzw. Chan et al. eingerechnet:
+    n = n_a + n_b,  delta = mittelwert_b - mittelwert_a
+    mittelwert = mittelwert_a + delta * n_b / n
+    M2 = M2_a + M2_b + delta^2 * n_a * n_b / n
+Die Laufzeit ist linear in der Anzahl der Werte, der Speicherbedarf unabhängig von der Anzahl der Simulationsläufe.
+"""
+class StatistikAkkumulator:
+    def __init__(self):
+        self.werte = {} # Zustand pro Metrik
+
+    """
+    Funktion:           Einrechnen eines Blocks von Werten einer Metrik
+    Input:              metrik (Name der Metrik)
+                        werte (Array beliebiger Form)
+    """
+    def hinzufuegen(self, metrik, werte):
+        werte = np.asarray(werte)
+        if werte.size == 0:
+            return
+        if werte.dtype == bool:
+            block = {"anzahl": werte.size, "anzahl_true": int(np.count_nonzero(werte))}
+        else:
+            mittelwert = float(werte.mean())
+            block = {
+                "anzahl": werte.size,
+                "mittelwert": mittelwert,
+                "m2": float(((werte - mittelwert) ** 2).sum()),
+                "minimum": werte.min().item(),
+                "maximum": werte.max().item(),
+            }
+        self._zusammenfuehren_metrik(metrik, block)
+
+    """
+    Funktion:           Einrechnen aller Metriken eines Ergebnisspeichers
+    Input:              speicher (Ergebnisspeicher eines Blocks von Simulationsläufen)
+    Output:             self (für Verkettung)
+    Funktionsweise:     Ein Speicher ohne Tageswerte (Ereignisspeicher der Ereignis-Engine) liefert die Kennzahlen des Blocks direkt über kennzahlen().
+    """
+    def erfassen(self, speicher):
+        if hasattr(speicher, "kennzahlen"):
+            for metrik, block in speicher.kennzahlen().items():
+                self._zusammenfuehren_metrik(metrik, block)
+            return self
+        for metrik in speicher:
+            self.hinzufuegen(metrik, speicher[metrik])
+        return self
+
+    """
+    Funktion:           Zusammenführen mit einem anderen Akkumulator (z.B. aus einem anderen Prozess)
+    Input:              anderer (StatistikAkkumulator)
+    Output:             self (für Verkettung)
+    """
+    def zusammenfuehren(self, anderer):
+        for metrik, block in anderer.werte.items():
+            self._zusammenfuehren_metrik(metrik, dict(block))
+        return self
+
+    def _zusammenfuehren_metrik(self, metrik, block):
+        if metrik not in self.werte:
+            self.werte[metrik] = block
+            return
+        bisher = self.werte[metrik]
+        anzahl = bisher["anzahl"] + block["anzahl"]
+        if "anzahl_true" in bisher:
+            bisher["anzahl_true"] += block["anzahl_true"]
+        else:
+            delta = block["mittelwert"] - bisher["mittelwert"]
+            bisher["m2"] += block["m2"] + delta ** 2 * bisher["anzahl"] * block["anzahl"] / anzahl
+            bisher["mittelwert"] += delta * block["anzahl"] / anzahl
+            bisher["minimum"] = min(bisher["minimum"], block["minimum"])
+            bisher["maximum"] = max(bisher["maximum"], block["maximum"])
+        bisher["anzahl"] = anzahl
+
+    """
+    Funktion:           Stichproben-Standardabweichung einer numerischen Metrik
+    Input:              metrik (Name der Metrik)
+    Output:             standardabweichung
+    """
+    def standardabweichung(self, metrik):
+        werte = self.werte[metrik]
+        standardabweichung = math.sqrt(werte["m2"] / (werte["anzahl"] - 1)) if werte["anzahl"] > 1 else 0.0
+        return standardabweichung
+
+    """
+    Funktion:           Statistik-Werte der einzelnen Metriken im Format von berechnung_statistiken
+    Output:             statstiken (Durchschnitt, Minimal- und Maximalwert bzw. Anzahl Ausfälle und Quote pro Metrik)
+    """
+    def statistiken(self):
+        statstiken = {}
+        for metrik, werte in self.werte.items():
+            metrik = metrik.removesuffix("_tag") # Suffix entfernen (für eine schönere Ausgabe)
+            # Boolean Metrik (ausfall_tag)
+            if "anzahl_true" in werte:
+                statstiken[metrik] = {
+                    "Anzahl Ausfälle": werte["anzahl_true"],
+                    "Quote": round((werte["anzahl_true"] / werte["anzahl"]*100), 3),
+                }
+                continue
+            # Numerische Metrik
+            statstiken[metrik] = {
+                "Durchchschnitt": round(werte["mittelwert"],3),
+                "Minimalwert": round(werte["minimum"],3),
+                "Maximalwert": round(werte["maximum"], 3),
+            }
+        return statstiken
+
+
+# ------------------------------------------------
+# ---------- Klassenmodell (Quantilskizze) ----------
+"""
+Quantilskizze mit relativer Genauigkeit (nach dem Verfahren DDSketch, Masson et al. 2019) für nicht-negative Werte.
+Die positiven Werte werden in feste, logarithmisch wachsende Klassen eingeordnet:
+    gamma = (1 + alpha) / (1 - alpha)
+    Klasse i enthält die Werte im Intervall (gamma^(i-1), gamma^i]
+Gezählt wird nur die Anzahl der Werte pro Klasse (sowie die Anzahl der Nullwerte, Minimum und Maximum).
+Da die Klassengrenzen nicht von den Daten abhängen, werden zwei Skizzen durch Addition der Anzahlen exakt zusammengeführt.
+Das Ergebnis ist dadurch unabhängig von der Reihenfolge und der Aufteilung der Blöcke auf die Prozesse.
+Ein Quantil wird durch den Mittelpunkt 2 * gamma^i / (gamma + 1) der Klasse des Rangs q * (n - 1) geschätzt,
+die relative Abweichung zum exakten Wert dieses Rangs beträgt höchstens alpha.
+Der Speicherbedarf hängt nur von der Spannweite der Werte ab (ca. ln(maximum / minimum) / (2 * alpha) belegte Klassen), nicht von der Anzahl der Werte.
+"""
+class Quantilskizze:
+    RELATIVE_GENAUIGKEIT = 0.001 # alpha (0.1% relative Abweichung der Quantile)
+
+    def __init__(self, relative_genauigkeit=RELATIVE_GENAUIGKEIT):
+        self.relative_genauigkeit = relative_genauigkeit
+        self.gamma = (1 + relative_genauigkeit) / (1 - relative_genauigkeit)
+        self.klassen = {} # Klassenindex -> Anzahl der Werte
+        self.nullwerte = 0
+        self.anzahl = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    """
+    Funktion:           Einrechnen eines Blocks von Werten
+    Input:              werte (Array nicht-negativer Werte)
+    Output:             self (für Verkettung)
+    """
+    def hinzufuegen(self, werte):
+        werte = np.asarray(werte, dtype=float).ravel()
+        if werte.size == 0:
+            return self
+        if werte.min() < 0:
+            raise ValueError("Die Quantilskizze unterstützt nur nicht-negative Werte.")
+        positiv = werte[werte > 0]
+        indizes, anzahlen = np.unique(np.ceil(np.log(positiv) / math.log(self.gamma)).astype(np.int64), return_counts=True)
+        for index, anzahl in zip(indizes.tolist(), anzahlen.tolist()):
+            self.klassen[index] = self.klassen.get(index, 0) + anzahl
+        self.nullwerte += werte.size - positiv.size
+        self.anzahl += werte.size
+        self.minimum = min(self.minimum, float(werte.min()))
+        self.maximum = max(self.maximum, float(werte.max()))
+        return self
+
+    """
+    Funktion:           Zusammenführen mit einer anderen Skizze (z.B. aus einem anderen Prozess)
+    Input:              andere (Quantilskizze mit derselben relativen Genauigkeit)
+    Output:             self (für Verkettung)
+    """
+    def zusammenfuehren(self, andere):
+        if andere.relative_genauigkeit != self.relative_genauigkeit:
+            raise ValueError("Quantilskizzen mit unterschiedlicher Genauigkeit können nicht zusammengeführt werden.")
+        for index, anzahl in andere.klassen.items():
+            self.klassen[index] = self.klassen.get(index, 0) + anzahl
+        self.nullwerte += andere.nullwerte
+        self.anzahl += andere.anzahl
+        self.minimum = min(self.minimum, andere.minimum)
+        self.maximum = max(self.maximum, andere.maximum)
+        return self
+
+    """
+    Funktion:           Schätzung eines Quantils
+    Input:              q (Wahrscheinlichkeit zwischen 0 und 1, z.B. 0.9 für P90)
+    Output:             wert (geschätztes Quantil, begrenzt auf Minimum und Maximum)
+    """
+    def quantil(self, q):
+        if self.anzahl == 0:
+            return math.nan
+        rang = q * (self.anzahl - 1)
+        if rang < self.nullwerte:
+            return 0.0
+        indizes = sorted(self.klassen)
+        kumuliert = np.cumsum([self.klassen[index] for index in indizes]) + self.nullwerte
+        index = indizes[int(np.searchsorted(kumuliert, rang, side="right"))]
+        wert = 2 * self.gamma ** index / (self.gamma + 1)
+        return min(max(wert, self.minimum), self.maximum)
+
+
+# ---------------------------------------------------
+# ---------- Klassenmodell (Histogramm) ----------
+"""
+Histogramm mit festen, gleich breiten Klassen und exakten Häufigkeiten.
+Die Klassenbreite ist eine Zweierpotenz 2^exponent, Klasse i enthält die Werte im Intervall [i * 2^exponent, (i + 1) * 2^exponent).
+Die Klassengrenzen hängen damit nur vom Exponenten ab. Der Exponent ist der kleinste (mindestens MIN_EXPONENT bzw. die Gleitkommagenauigkeit), bei dem alle Werte
+zwischen Minimum und Maximum in höchstens MAX_KLASSEN Klassen liegen. Wird die Spannweite größer, werden jeweils zwei benachbarte Klassen
+zusammengefasst (Exponent + 1), die Häufigkeiten bleiben dabei exakt. Zwei Histogramme werden zusammengeführt, indem beide auf den größeren
+Exponenten vergröbert und die Anzahlen addiert werden. Da der Exponent nur von Minimum und Maximum aller Werte abhängt,
+ist das Ergebnis unabhängig von der Reihenfolge und der Aufteilung der Blöcke auf die Prozesse.
+Die Anzahlen werden als zusammenhängendes Array ab der Klasse offset geführt (höchstens MAX_KLASSEN Einträge).
+"""
+class Histogramm:
+    MAX_KLASSEN = 1024
+    MIN_EXPONENT = -20
+
+    def __init__(self):
+        self.exponent = self.MIN_EXPONENT
+        self.offset = 0
+        self.anzahlen = np.zeros(0, dtype=np.int64)
+        self.anzahl = 0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    """
+    Funktion:           Kleinster zulässiger Exponent für eine Spannweite
+    Input:              minimum, maximum (Spannweite der Werte)
+                        exponent (bisheriger Exponent, der Exponent wird nicht verkleinert)
+    Output:             exponent (kleinster Exponent ab dem bisherigen, bei dem die Spannweite in MAX_KLASSEN Klassen liegt)
+    """
+    def _exponent(self, minimum, maximum, exponent):
+        exponent = max(exponent, math.frexp(max(abs(minimum), abs(maximum)))[1] - 53) # Klassen nicht feiner als die Gleitkommagenauigkeit
+        if maximum > minimum:
+            exponent = max(exponent, math.floor(math.log2((maximum - minimum) / self.MAX_KLASSEN)) - 1)
+        while math.floor(maximum / 2.0 ** exponent) - math.floor(minimum / 2.0 ** exponent) + 1 > self.MAX_KLASSEN:
+            exponent += 1
+        return exponent
+
+    """
+    Funktion:           Vergröberung auf einen größeren Exponenten
+    Input:              exponent (neuer Exponent, mindestens der bisherige)
+    """
+    def _vergroebern(self, exponent):
+        if exponent > self.exponent and len(self.anzahlen):
+            klassen = (self.offset + np.arange(len(self.anzahlen), dtype=np.int64)) // (2 ** (exponent - self.exponent))
+            anzahlen = np.zeros(int(klassen[-1] - klassen[0]) + 1, dtype=np.int64)
+            np.add.at(anzahlen, klassen - klassen[0], self.anzahlen)
+            self.offset, self.anzahlen = int(klassen[0]), anzahlen
+        self.exponent = exponent
+
+    """
+    Funktion:           Addition von Anzahlen ab einer Klasse (gleicher Exponent)
+    Input:              offset (erste Klasse)
+                        anzahlen (Anzahlen ab dieser Klasse)
+    """
+    def _addieren(self, offset, anzahlen):
+        if not len(self.anzahlen):
+            self.offset, self.anzahlen = offset, anzahlen.copy()
+            return
+        beginn = min(self.offset, offset)
+        ende = max(self.offset + len(self.anzahlen), offset + len(anzahlen))
+        summe = np.zeros(ende - beginn, dtype=np.int64)
+        summe[self.offset - beginn:self.offset - beginn + len(self.anzahlen)] += self.anzahlen
+        summe[offset - beginn:offset - beginn + len(anzahlen)] += anzahlen
+        self.offset, self.anzahlen = beginn, summe
+
+    """
+    Funktion:           Einrechnen eines Blocks von Werten
+    Input:              werte (Array von Werten)
+    Output:             self (für Verkettung)
+    """
+    def hinzufuegen(self, werte):
+        werte = np.asarray(werte, dtype=float).ravel()
+        if werte.size == 0:
+            return self
+        minimum, maximum = min(self.minimum, float(werte.min())), max(self.maximum, float(werte.max()))
+        self._vergroebern(self._exponent(minimum, maximum, self.exponent))
+        klassen = np.floor(werte / 2.0 ** self.exponent).astype(np.int64)
+        offset = int(klassen.min())
+        self._addieren(offset, np.bincount(klassen - offset).astype(np.int64))
+        self.anzahl += werte.size
+        self.minimum, self.maximum = minimum, maximum
+        return self
+
+    """
+    Funktion:           Zusammenführen mit einem anderen Histogramm (z.B. aus einem anderen Prozess)
+    Input:              anderes (Histogramm)
+    Output:             self (für Verkettung)
+    """
+    def zusammenfuehren(self, anderes):
+        if anderes.anzahl == 0:
+            return self
+        minimum, maximum = min(self.minimum, anderes.minimum), max(self.maximum, anderes.maximum)
+        exponent = self._exponent(minimum, maximum, max(self.exponent, anderes.exponent))
+        self._vergroebern(exponent)
+        kopie = Histogramm()
+        kopie.exponent, kopie.offset, kopie.anzahlen = anderes.exponent, anderes.offset, anderes.anzahlen
+        kopie._vergroebern(exponent)
+        self._addieren(kopie.offset, kopie.anzahlen)
+        self.anzahl += anderes.anzahl
+        self.minimum, self.maximum = minimum, maximum
+        return self
+
+    """
+    Funktion:           Häufigkeiten mit höchstens anzahl_klassen gleich breiten Klassen
+    Input:              anzahl_klassen (Höchstanzahl der Histogrammklassen)
+    Output:             haeufigkeiten (exakte Häufigkeiten pro Klasse)
+                        grenzen (Klassengrenzen, wie bei np.histogram)
+    Funktionsweise:     Jeweils gleich viele benachbarte feste Klassen werden zu einer Histogrammklasse zusammengefasst,
+                        die erste Histogrammklasse beginnt an der Klasse des Minimums. Die Häufigkeiten entsprechen daher exakt
+                        np.histogram mit diesen Grenzen. Sind alle Werte gleich, wird wie bei np.histogram der Bereich Wert +/- 0.5 verwendet.
+    """
+    def haeufigkeiten(self, anzahl_klassen):
+        if self.anzahl == 0:
+            return np.zeros(anzahl_klassen), np.linspace(0, 1, anzahl_klassen + 1)
+        if self.minimum == self.maximum:
+            haeufigkeiten = np.zeros(anzahl_klassen)
+            haeufigkeiten[anzahl_klassen // 2] = self.anzahl
+            return haeufigkeiten, np.linspace(self.minimum - 0.5, self.maximum + 0.5, anzahl_klassen + 1)
+        gruppe = math.ceil(len(self.anzahlen) / anzahl_klassen)
+        klassen = math.ceil(len(self.anzahlen) / gruppe)
+        anzahlen = np.zeros(klassen * gruppe, dtype=np.int64)
+        anzahlen[:len(self.anzahlen)] = self.anzahlen
+        haeufigkeiten = anzahlen.reshape(klassen, gruppe).sum(axis=1).astype(float)
+        grenzen = (self.offset + gruppe * np.arange(klassen + 1)) * 2.0 ** self.exponent
+        return haeufigkeiten, grenzen
+
+
+# ---------------------------------------------------
+# ---------- Klassenmodell (Teilergebnis) ----------
+"""
+Das Teilergebnis fasst einen oder mehrere Blöcke von Simulationsläufen einer Szenario-Handlungsoption-Kombination zusammen:
+- statistik: StatistikAkkumulator über alle Tageswerte und über die Summen pro Simulationslauf (Gesamtkosten, Gesamtfüllmenge)
+- skizzen: Quantilskizze der Summen pro Simulationslauf für die Quantile
+- histogramme: Histogramm der Summen pro Simulationslauf mit exakten Häufigkeiten für die Grafiken
+- laufsummen: Summen der einzelnen Simulationsläufe, nur falls benötigt (paarweiser Vergleich bei Varianzreduktion)
+Teilergebnisse sind klein (unabhängig von der Anzahl der Tage) und werden von den Prozessen anstelle der Tageswerte zurückgegeben.
+Das Zusammenführen erfolgt in der Reihenfolge der Blöcke, dadurch ist das Ergebnis unabhängig von der Anzahl der Prozesse.
+"""
+class Teilergebnis:
+    LAUFSUMMEN = {"gesamtkosten": "kosten_tag", "gesamtfuellmenge": "fuellmenge_tag"}
+    QUANTILE = {"P50": 0.5, "P90": 0.9, "P99": 0.99}
+
+    def __init__(self, laufsummen_speichern=False):
+        self.statistik = StatistikAkkumulator()
+        self.skizzen = {name: Quantilskizze() for name in self.LAUFSUMMEN}
+        self.histogramme = {name: Histogramm() for name in self.LAUFSUMMEN}
+        self.laufsummen_speichern = laufsummen_speichern
+        self.laufsummen = {name: np.empty(0) for name in self.LAUFSUMMEN}
+        self.messungen = None # Messungen der Instrumentierung im Arbeitsprozess (werden im Hauptprozess übernommen, siehe instrumentierung.py)
+
+    @property
+    def durchlaeufe(self):
+        return self.skizzen["gesamtkosten"].anzahl
+
+    """
+    Funktion:           Einrechnen eines Ergebnisspeichers
+    Input:              speicher (Ergebnisspeicher eines Blocks von Simulationsläufen)
+    Output:             self (für Verkettung)
+    """
+    def erfassen(self, speicher):
+        self.statistik.erfassen(speicher)
+        for name, metrik in self.LAUFSUMMEN.items():
+            summen = speicher.summe(metrik)
+            self.statistik.hinzufuegen(name, summen)
+            self.skizzen[name].hinzufuegen(summen)
+            self.histogramme[name].hinzufuegen(summen)
+            if self.laufsummen_speichern:
+                self.laufsummen[name] = np.concatenate([self.laufsummen[name], summen])
+        return self
+
+    """
+    Funktion:           Konfidenzintervall des Mittelwerts einer Summe pro Simulationslauf
+    Input:              name (Name der Laufsumme, z.B. "gesamtkosten")
+                        z_wert (Quantil der Standardnormalverteilung, 1.96 = 95%-Konfidenzintervall)
+    Output:             mittelwert (Mittelwert über die Simulationsläufe)
+                        halbbreite (halbe Breite des Konfidenzintervalls)
+    """
+    def konfidenzintervall(self, name, z_wert=1.96):
+        werte = self.statistik.werte[name]
+        mittelwert = werte["mittelwert"]
+        halbbreite = z_wert * self.statistik.standardabweichung(name) / math.sqrt(werte["anzahl"]) if werte["anzahl"] > 1 else math.inf
+        return mittelwert, halbbreite
+
+    """
+    Funktion:           Statistik-Werte der Metriken inkl. der Quantile der Summen pro Simulationslauf
+    Output:             statstiken (Statistik-Werte wie StatistikAkkumulator.statistiken, Gesamtkosten und Gesamtfüllmenge zusätzlich mit P50, P90 und P99)
+    """
+    def statistiken(self):
+        statstiken = self.statistik.statistiken()
+        for name, skizze in self.skizzen.items():
+            if name in statstiken:
+                statstiken[name].update({kennzahl: round(skizze.quantil(q), 3) for kennzahl, q in self.QUANTILE.items()})
+        return statstiken
+
+    """
+    Funktion:           Zusammenführen mit einem anderen Teilergebnis (nachfolgende Simulationsläufe)
+    Input:              anderes (Teilergebnis)
+    Output:             self (für Verkettung)
+    """
+    def zusammenfuehren(self, anderes):
+        self.statistik.zusammenfuehren(anderes.statistik)
+        for name in self.skizzen:
+            self.skizzen[name].zusammenfuehren(anderes.skizzen[name])
+            self.histogramme[name].zusammenfuehren(anderes.histogramme[name])
+            self.laufsummen[name] = np.concatenate([self.laufsummen[name], anderes.laufsummen[name]])
+        return self
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Paarweiser Vergleich einer Laufsumme zwischen zwei Handlungsoptionen
+Input:              werte_referenz (Laufsummen der Referenz-Handlungsoption, sortiert nach Zufallsstartwert)
+                    werte_option (Laufsummen der verglichenen Handlungsoption, gleiche Zufallsstartwerte)
+                    antithetisch (True, wenn je zwei aufeinanderfolgende Läufe ein antithetisches Paar bilden)
+Output:             vergleich (mittlere Differenz Option - Referenz, Standardfehler der gepaarten Differenz und Standardfehler bei unabhängigen Stichproben)
+Funktionsweise:     Die Differenz wird pro Zufallsstartwert gebildet (gemeinsame Zufallszahlen). Bei antithetischen Paaren werden die Differenzen
+                    zunächst pro Paar gemittelt, da die beiden Läufe eines Paares nicht unabhängig sind.
+                    Der Standardfehler bei unabhängigen Stichproben dient als Vergleichswert für die erreichte Varianzreduktion.
+"""
+def paarvergleich(werte_referenz, werte_option, antithetisch=False):
+    anzahl = min(len(werte_referenz), len(werte_option))
+    referenz, option = np.asarray(werte_referenz[:anzahl]), np.asarray(werte_option[:anzahl])
+    differenzen = option - referenz
+    if antithetisch:
+        anzahl_paare = anzahl // 2
+        differenzen = (differenzen[0:2 * anzahl_paare:2] + differenzen[1:2 * anzahl_paare:2]) / 2
+    standardfehler = float(differenzen.std(ddof=1)) / math.sqrt(len(differenzen)) if len(differenzen) > 1 else math.nan
+    standardfehler_unabhaengig = math.sqrt((referenz.var(ddof=1) + option.var(ddof=1)) / anzahl) if anzahl > 1 else math.nan
+    vergleich = {
+        "Durchchschnitt": round(float(differenzen.mean()), 3),
+        "Standardfehler": round(standardfehler, 3),
+        "Standardfehler (unabhängig)": round(standardfehler_unabhaengig, 3),
+    }
+    return vergleich
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,129 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Parameterstudie (Sweep) über die Modellparameter aus parameter.py.
+Die Parameterpunkte werden als Raster (Parametername -> Liste von Werten, alle Kombinationen) oder als Liste von Überschreibungen angegeben.
+Alle (Parameterpunkt, Szenario, Handlungsoption, Seed-Block)-Arbeitspakete werden gemeinsam als ein Auftrag ausgeführt (seriell oder in einem Prozess-Pool).
+Die Kalendertabelle (Wochentage, Feiertage, Leertermine) hängt nicht von den Modellparametern ab und wird für alle Parameterpunkte einmalig erstellt.
+Alle Parameterpunkte verwenden dieselben Zufallsstartwerte (gemeinsame Zufallszahlen), Unterschiede zwischen den Punkten sind daher nicht durch unterschiedliche Zufallszahlen verrauscht.
+Das Ergebnis ist eine Tabelle im Langformat (eine Zeile pro Parameterpunkt, Szenario, Handlungsoption, Metrik und Kennzahl).
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from parameter import TAGE, START_JAHR, modellparameter, arbeitsprozess_initialisieren
+from funktionen import berechnung_statistiken
+from kalender import kalender_tabelle
+from statistik import Teilergebnis, paarvergleich
+from simulation import seed_bloecke, simulation_block_cache, block_einreichen, block_ergebnis
+from instrumentierung import phase
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Bestimmung der Parameterpunkte
+Input:              studie (Raster als Dictionary Parametername -> Liste von Werten oder Liste von Überschreibungen)
+Output:             punkte (Liste von Überschreibungen, eine pro Parameterpunkt)
+Funktionsweise:     Bei einem Raster werden alle Kombinationen der Werte gebildet (kartesisches Produkt, erster Parameter variiert am langsamsten).
+                    Jeder Punkt wird vorab mit modellparameter() geprüft, damit ungültige Punkte nicht erst während der Simulation auffallen.
+"""
+def parameterpunkte(studie):
+    if isinstance(studie, dict):
+        namen = list(studie)
+        punkte = [dict(zip(namen, werte)) for werte in itertools.product(*(studie[name] for name in namen))]
+    else:
+        punkte = [dict(punkt) for punkt in studie]
+    for punkt in punkte:
+        modellparameter(punkt)
+    return punkte
+
+
+
+"""
+Funktion:           Durchführung der Parameterstudie
+Input:              punkte (Liste von Überschreibungen der Modellparameter, siehe parameterpunkte)
+                    szenarien (Dictionary der Szenarien)
+                    handlungsoptionen (Dictionary der Handlungsoptionen)
+                    durchlaeufe (Anzahl der Simulationsdurchläufe pro Parameterpunkt und Kombination)
+                    anzahl_prozesse (Anzahl der parallelen Prozesse, 1 = serielle Ausführung)
+                    chunk_groesse (Anzahl der Simulationsläufe pro Arbeitspaket)
+                    engine (Simulationslogik: "simpy", "numpy" oder "ereignis")
+                    varianzreduktion (None, "crn" oder "antithetisch")
+                    cache (Ergebniscache oder Checkpoint, None = ohne Cache)
+Output:             ergebnisse (Dictionary (Punktnummer, Szenario, Handlungsoption) -> Teilergebnis)
+Funktionsweise:     Die Arbeitspakete aller Parameterpunkte und Kombinationen werden in einer Liste zusammengefasst.
+                    Bei mehreren Prozessen werden alle Arbeitspakete gleichzeitig an einen Prozess-Pool übergeben, sodass die Prozesse
+                    über die Grenzen der Parameterpunkte hinweg ausgelastet sind. Die Teilergebnisse werden in der Reihenfolge
+                    der Zufallsstartwerte zusammengeführt, die Ergebnisse sind daher identisch zur seriellen Ausführung.
+                    Mit Ergebnis-Cache werden nur Blöcke simuliert, die für den Parameterpunkt noch nicht im Cache vorhanden sind.
+"""
+def parameterstudie(punkte, szenarien, handlungsoptionen, durchlaeufe, anzahl_prozesse=1, chunk_groesse=50, engine="simpy", varianzreduktion=None, cache=None):
+    kalender_tabelle(TAGE, START_JAHR) # Gemeinsame Kalendertabelle für alle Parameterpunkte (wird beim Forken übernommen)
+    aufgaben = [
+        ((punkt_nr, szenario_key, handlungsoption_key), (seeds, szenarien[szenario_key], handlungsoptionen[handlungsoption_key], engine, varianzreduktion, punkt))
+        for punkt_nr, punkt in enumerate(punkte)
+        for szenario_key in szenarien
+        for handlungsoption_key in handlungsoptionen
+        for seeds in seed_bloecke(durchlaeufe, chunk_groesse)
+    ]
+    ergebnisse = {kennung: Teilergebnis() for kennung, _ in aufgaben}
+
+    with phase("parameterstudie", punkte=len(punkte), bloecke=len(aufgaben)):
+        if anzahl_prozesse <= 1:
+            for kennung, aufgabe in aufgaben:
+                ergebnisse[kennung].zusammenfuehren(simulation_block_cache(cache, *aufgabe))
+        else:
+            with ProcessPoolExecutor(max_workers=anzahl_prozesse, initializer=arbeitsprozess_initialisieren, initargs=(TAGE, START_JAHR)) as pool:
+                futures = [block_einreichen(pool, cache, *aufgabe) for _, aufgabe in aufgaben]
+                for future, (kennung, _) in zip(futures, aufgaben):
+                    ergebnisse[kennung].zusammenfuehren(block_ergebnis(future))
+    if cache is not None:
+        cache.begrenzen()
+        print( f"[Info] Cache: {cache.treffer} Blöcke geladen, {cache.fehlschlaege} Blöcke simuliert." )
+    return ergebnisse
+
+
+
+"""
+Funktion:           Ergebnistabelle der Parameterstudie im Langformat
+Input:              punkte (Liste von Überschreibungen der Modellparameter)
+                    ergebnisse (Ergebnis von parameterstudie)
+                    varianzreduktion (None, "crn" oder "antithetisch"; bestimmt den paarweisen Vergleich mit der ersten Handlungsoption)
+Output:             df_out (DataFrame mit den Spalten Punkt, je eine Spalte pro variiertem Parameter, Szenario, Handlungsoption, Metrik, Kennzahl und Wert)
+Funktionsweise:     Pro Parameterpunkt und Kombination werden die Statistiken der Metriken bestimmt (wie in simulationslauf).
+                    Listen- und Dictionary-Werte (z.B. REST_MUELLTONE_STAFFEL) werden als Text in die Parameterspalte geschrieben.
+                    Bei Varianzreduktion wird zusätzlich die Metrik "differenz_gesamtkosten" gegenüber der ersten Handlungsoption ausgewiesen.
+"""
+def ausgabe_parameterstudie(punkte, ergebnisse, varianzreduktion=None):
+    import pandas as pd # Import zur Laufzeit (nur für die Auswertung benötigt)
+    namen = list(dict.fromkeys(name for punkt in punkte for name in punkt))
+    referenz = {}
+    element = []
+    for (punkt_nr, szenario, handlungsoption), teilergebnis in ergebnisse.items():
+        statistiken = berechnung_statistiken(teilergebnis)
+        if varianzreduktion is not None:
+            if (punkt_nr, szenario) not in referenz:
+                referenz[(punkt_nr, szenario)] = teilergebnis.laufsummen["gesamtkosten"]
+            else:
+                statistiken["differenz_gesamtkosten"] = paarvergleich(referenz[(punkt_nr, szenario)], teilergebnis.laufsummen["gesamtkosten"], varianzreduktion == "antithetisch")
+        spalten = {"Punkt": punkt_nr}
+        for name in namen:
+            wert = modellparameter(punkte[punkt_nr])[name]
+            spalten[name] = wert if isinstance(wert, (int, float)) else str(wert)
+        for metrik, kennzahlen in statistiken.items():
+            for kennzahl, wert in kennzahlen.items():
+                element.append({**spalten, "Szenario": szenario, "Handlungsoption": handlungsoption, "Metrik": metrik, "Kennzahl": kennzahl, "Wert": wert})
+    df_out = pd.DataFrame(element)
+    return df_out
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,188 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet den Export der vollständigen Tageswerte (Trajektorien) aller Simulationsläufe.
+Die Tageswerte werden spaltenorientiert (eine Datei pro Metrik) und in Blöcken (eine Datei pro Seed-Block) als unkomprimierte
+NumPy-Dateien (.npy) geschrieben, sobald ein Block simuliert ist. Der Speicherbedarf ist daher auf einen Block begrenzt.
+Beim Lesen werden die Dateien per Memory-Mapping geöffnet, sodass nur die angefragten Läufe und Tage von der Festplatte gelesen werden.
+
+Verzeichnisstruktur:
+    <verzeichnis>/index.json     (Anzahl Tage, Startjahr, Metriken mit Datentyp und Kombinationen Szenario/Handlungsoption -> Schlüssel)
+    <verzeichnis>/<kombinationsschluessel>/<metrik>/<erster seed>_<anzahl>.npy     (Array der Form (anzahl x tage))
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import json
+import os
+from pathlib import Path
+import numpy as np
+from parameter import TAGE, START_JAHR
+from ergebnisspeicher import METRIKEN
+from cache import kombinationsschluessel
+
+
+# ---------------------------------------------------------
+# ---------- Klassenmodell (Trajektorien-Export) ----------
+"""
+Der Export wird im Hauptprozess angelegt und an die Prozesse übergeben (er enthält nur das Verzeichnis).
+Jeder Block wird in dem Prozess geschrieben, der ihn simuliert hat. Die Dateien werden zunächst unter einem temporären Namen
+geschrieben und anschließend umbenannt, sodass keine unvollständigen Blöcke gelesen werden.
+Der Ordner einer Kombination wird wie im Ergebniscache über den Hash von Szenario, Handlungsoption, Parametern, Engine und Varianzreduktion bestimmt.
+"""
+class TrajektorienExport:
+    def __init__(self, verzeichnis="output/trajektorien"):
+        self.verzeichnis = Path(verzeichnis)
+
+    def _ordner(self, szenario, handlungsoption, engine, varianzreduktion, parameter):
+        schluessel, _ = kombinationsschluessel(szenario, handlungsoption, engine, varianzreduktion, parameter)
+        return self.verzeichnis / schluessel
+
+    """
+    Funktion:           Anmelden einer Kombination im Index (im Hauptprozess vor der Simulation)
+    Input:              szenario_key, handlungsoption_key (Namen des Szenarios und der Handlungsoption)
+                        szenario, handlungsoption, engine, varianzreduktion, parameter (Bestandteile des Kombinationsschlüssels)
+    """
+    def anmelden(self, szenario_key, handlungsoption_key, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None):
+        self.verzeichnis.mkdir(parents=True, exist_ok=True)
+        pfad = self.verzeichnis / "index.json"
+        index = json.loads(pfad.read_text(encoding="utf-8")) if pfad.exists() else {}
+        if index and (index["tage"], index["start_jahr"]) != (TAGE, START_JAHR):
+            raise ValueError(f"Der Export in {self.verzeichnis} wurde mit anderen Werten für TAGE/START_JAHR erstellt.")
+        index.update({"tage": TAGE, "start_jahr": START_JAHR, "metriken": {metrik: np.dtype(datentyp).str for metrik, datentyp in METRIKEN.items()}})
+        index.setdefault("kombinationen", {})[f"{szenario_key}|{handlungsoption_key}"] = {
+            "szenario": szenario_key,
+            "handlungsoption": handlungsoption_key,
+            "schluessel": self._ordner(szenario, handlungsoption, engine, varianzreduktion, parameter).name,
+        }
+        temporaer = pfad.with_suffix(f".{os.getpid()}.tmp")
+        temporaer.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporaer, pfad)
+
+    """
+    Funktion:           Prüfung, ob ein Block bereits vollständig exportiert ist
+    Input:              seeds, szenario, handlungsoption, engine, varianzreduktion, parameter (siehe schreiben)
+    Output:             vorhanden (True, wenn die Dateien aller Metriken vorhanden sind)
+    """
+    def vorhanden(self, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None):
+        ordner = self._ordner(szenario, handlungsoption, engine, varianzreduktion, parameter)
+        return all((ordner / metrik / f"{seeds[0]}_{len(seeds)}.npy").exists() for metrik in METRIKEN)
+
+    """
+    Funktion:           Schreiben der Tageswerte eines Blocks
+    Input:              speicher (Ergebnisspeicher des Blocks)
+                        seeds (Zufallsstartwerte des Blocks, aufeinanderfolgend)
+                        szenario, handlungsoption, engine, varianzreduktion, parameter (Bestandteile des Kombinationsschlüssels)
+    """
+    def schreiben(self, speicher, seeds, szenario, handlungsoption, engine="simpy", varianzreduktion=None, parameter=None):
+        ordner = self._ordner(szenario, handlungsoption, engine, varianzreduktion, parameter)
+        for metrik in speicher:
+            (ordner / metrik).mkdir(parents=True, exist_ok=True)
+            pfad = ordner / metrik / f"{seeds[0]}_{len(seeds)}.npy"
+            temporaer = pfad.with_suffix(f".{os.getpid()}.tmp")
+            with open(temporaer, "wb") as datei:
+                np.save(datei, np.ascontiguousarray(speicher[metrik]))
+            os.replace(temporaer, pfad)
+
+
+# -----------------------------------------------------
+# ---------- Klassenmodell (Trajektorien-Leser) ----------
+"""
+Der Leser öffnet die Blockdateien einer Kombination per Memory-Mapping und liest nur die Zeilen (Läufe) und Spalten (Tage) der Anfrage.
+Seed- und Tagesbereiche werden als (von, bis) angegeben, "bis" ist wie bei range() nicht enthalten.
+"""
+class Trajektorien:
+    def __init__(self, verzeichnis="output/trajektorien"):
+        self.verzeichnis = Path(verzeichnis)
+        self.index = json.loads((self.verzeichnis / "index.json").read_text(encoding="utf-8"))
+        self.tage = self.index["tage"]
+        self.start_jahr = self.index["start_jahr"]
+        self.metriken = list(self.index["metriken"])
+
+    @property
+    def kombinationen(self):
+        return [(eintrag["szenario"], eintrag["handlungsoption"]) for eintrag in self.index["kombinationen"].values()]
+
+    """
+    Funktion:           Blockdateien einer Kombination und Metrik
+    Input:              metrik, szenario, handlungsoption
+    Output:             bloecke (Liste von (erster Seed, Anzahl, Pfad), sortiert nach Seed)
+    Funktionsweise:     Überschneidet sich ein Block mit einem vorherigen Block (Export mit unterschiedlicher Blockgröße), wird er übersprungen.
+    """
+    def bloecke(self, metrik, szenario, handlungsoption):
+        if metrik not in self.index["metriken"]:
+            raise KeyError(f"Unbekannte Metrik: {metrik}")
+        eintrag = self.index["kombinationen"].get(f"{szenario}|{handlungsoption}")
+        if eintrag is None:
+            raise KeyError(f"Kombination nicht im Export: {szenario} / {handlungsoption}")
+        dateien = sorted((*(int(teil) for teil in pfad.stem.split("_")), pfad) for pfad in (self.verzeichnis / eintrag["schluessel"] / metrik).glob("*.npy"))
+        bloecke = []
+        for erster_seed, anzahl, pfad in dateien:
+            if not bloecke or erster_seed >= bloecke[-1][0] + bloecke[-1][1]:
+                bloecke.append((erster_seed, anzahl, pfad))
+        return bloecke
+
+    """
+    Funktion:           Verfügbare Zufallsstartwerte einer Kombination
+    Input:              szenario, handlungsoption
+    Output:             seeds (Array der exportierten Zufallsstartwerte, aufsteigend)
+    """
+    def seeds(self, szenario, handlungsoption):
+        bloecke = self.bloecke(self.metriken[0], szenario, handlungsoption)
+        seeds = np.concatenate([np.arange(erster_seed, erster_seed + anzahl) for erster_seed, anzahl, _ in bloecke]) if bloecke else np.empty(0, dtype=np.int64)
+        return seeds
+
+    """
+    Funktion:           Lesen eines Ausschnitts der Tageswerte
+    Input:              metrik (Name der Metrik, z.B. "fuellmenge_tag")
+                        szenario, handlungsoption (Namen der Kombination)
+                        seeds (Bereich der Zufallsstartwerte (von, bis), None = alle)
+                        tage (Bereich der Simulationstage (von, bis), None = alle)
+    Output:             seeds (Array der Zufallsstartwerte der gelesenen Zeilen)
+                        werte (Array der Form (Anzahl Läufe x Anzahl Tage))
+    Funktionsweise:     Es werden nur die Blöcke geöffnet, die sich mit dem Seed-Bereich überschneiden. Liegt der Ausschnitt in einem Block,
+                        wird die Sicht auf die Datei (Memory-Mapping, schreibgeschützt) ohne Kopie zurückgegeben, die Werte werden erst beim
+                        Zugriff gelesen. Über mehrere Blöcke wird aus jedem Block nur der angefragte Ausschnitt kopiert.
+                        Nicht exportierte Seeds werden übersprungen.
+    """
+    def lesen(self, metrik, szenario, handlungsoption, seeds=None, tage=None):
+        seed_von, seed_bis = seeds if seeds is not None else (-np.inf, np.inf)
+        tag_von, tag_bis = tage if tage is not None else (0, self.tage)
+        teile, seed_teile = [], []
+        for erster_seed, anzahl, pfad in self.bloecke(metrik, szenario, handlungsoption):
+            von, bis = max(erster_seed, seed_von), min(erster_seed + anzahl, seed_bis)
+            if von >= bis:
+                continue
+            block = np.load(pfad, mmap_mode="r")
+            teile.append(block[int(von - erster_seed):int(bis - erster_seed), tag_von:tag_bis])
+            seed_teile.append(np.arange(von, bis, dtype=np.int64))
+        if not teile:
+            return np.empty(0, dtype=np.int64), np.empty((0, len(range(self.tage)[tag_von:tag_bis])), dtype=self.index["metriken"][metrik])
+        if len(teile) == 1:
+            return seed_teile[0], teile[0]
+        return np.concatenate(seed_teile), np.concatenate(teile)
+
+    """
+    Funktion:           Kalenderangaben zu den Simulationstagen (z.B. für saisonale Auswertungen und Feiertagseffekte)
+    Input:              tage (Bereich der Simulationstage (von, bis), None = alle)
+    Output:             kalender (Dictionary mit Arrays datum, wochentag (0 = Montag) und feiertag)
+    """
+    def kalender(self, tage=None):
+        from kalender import kalender_tabelle # Import zur Laufzeit (Feiertage werden nur bei Bedarf berechnet)
+        tag_von, tag_bis = tage if tage is not None else (0, self.tage)
+        tabelle = kalender_tabelle(self.tage, self.start_jahr)
+        kalender = {
+            "datum": np.datetime64(f"{self.start_jahr}-01-01") + np.arange(self.tage)[tag_von:tag_bis],
+            "wochentag": np.array(tabelle.wochentag[tag_von:tag_bis]),
+            "feiertag": np.array(tabelle.feiertag[tag_von:tag_bis]),
+        }
+        return kalender
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
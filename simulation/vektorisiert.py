@@ -0,0 +1,198 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die vektorisierte Simulationslogik (NumPy-Engine).
+Anstatt jeden Simulationslauf einzeln Tag für Tag mit SimPy zu simulieren, wird ein ganzer Block an Simulationsläufen
+gleichzeitig als Arrays der Form (Durchläufe x TAGE) berechnet. Die Regeln entsprechen dem Klassenmodell MuellentsorgungsSystem.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import math
+from statistics import NormalDist
+import numpy as np
+# Globale Paramter importieren
+from parameter import TAGE, START_JAHR, modellparameter
+from kalender import kalender_tabelle
+from ergebnisspeicher import Ergebnisspeicher
+from zufall import basis_seed
+
+
+# Reihenfolge der Zufallsströme (Zeilen des Zufallszahlenblocks eines Simulationslaufs)
+STROM_ABWESEND, STROM_ABWESEND_ANZAHL, STROM_BESUCH, STROM_BESUCH_ANZAHL, STROM_AUSFALL = range(5)
+ANZAHL_STROEME = 5
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Erzeugung der Zufallszahlen für einen Block von Simulationsläufen
+Input:              seeds (Zufallsstartwerte der Simulationsläufe)
+                    tage (Anzahl der Tage, die in der Simulation betrachtet werden)
+                    varianzreduktion (None/"crn" = ein Generator pro Lauf, "antithetisch" = Paare (2k, 2k+1) mit gespiegelten Zufallszahlen)
+Output:             leertage (Leertag pro Simulationslauf)
+                    zufall (gleichverteilte Zufallszahlen der Form (ANZAHL_STROEME x Durchläufe x tage))
+Funktionsweise:     Jeder Simulationslauf erhält einen eigenen Zufallsgenerator, der nur vom Zufallsstartwert abhängt.
+                    Dadurch ist das Ergebnis eines Laufs unabhängig davon, in welchem Block er berechnet wird.
+                    Pro Tag werden alle Zufallszahlen gezogen, auch wenn sie nicht benötigt werden (feste Zuordnung Zufallszahl zu Tag).
+                    Dadurch erleben Läufe mit gleichem Zufallsstartwert unter allen Szenarien und Handlungsoptionen dieselben Zufallszahlen (gemeinsame Zufallszahlen).
+                    Bei antithetischen Paaren verwendet der zweite Lauf die gespiegelten Zufallszahlen 1 - u des ersten Laufs (der Leertag bleibt gleich).
+"""
+def zufallszahlen(seeds, tage, varianzreduktion=None):
+    leertage = np.empty(len(seeds), dtype=np.int64)
+    zufall = np.empty((ANZAHL_STROEME, len(seeds), tage))
+    for i, seed in enumerate(seeds):
+        basis, antithetisch = basis_seed(seed, varianzreduktion)
+        rng = np.random.default_rng(basis)
+        leertage[i] = rng.integers(0, 5) # Montag=0/Dienstag=1/Mittwoch=2/Donnerstag=3/Freitag=4
+        zufall[:, i, :] = rng.random((ANZAHL_STROEME, tage))
+        if antithetisch:
+            zufall[:, i, :] = 1.0 - zufall[:, i, :]
+    return leertage, zufall
+
+
+
+"""
+Funktion:           Vektorisierte Simulation eines Blocks von Simulationsläufen
+Input:              seeds (Zufallsstartwerte der Simulationsläufe)
+                    szenario (betrachteten Szenario)
+                    handlungsoption (betrachtete Handlungsoption)
+                    speicher (Ergebnisspeicher, in den geschrieben wird; None = eigener Speicher für den Block)
+                    start (Zeile des ersten Simulationslaufs im Ergebnisspeicher)
+                    varianzreduktion (None, "crn" oder "antithetisch")
+                    parameter (Überschreibungen der Modellparameter, None = Standardwerte aus parameter.py)
+Output:             speicher (Ergebnisspeicher mit den Metriken der Simulationsläufe)
+Funktionsweise:     Die Wahrscheinlichkeiten des Szenarios und die Zahlenwerte der Modellparameter (außer der Tonnenstaffel) können auch als
+                    Arrays mit einem Wert pro Simulationslauf angegeben werden (z.B. für die Sensitivitätsanalyse mit vielen Parameterpunkten in einem Block).
+                    Die Zufallszahlen aller Simulationsläufe werden vorab gezogen.
+                    Anschließend wird Tag für Tag der Zustand aller Simulationsläufe (Füllstand, Kapazität, Überfüllungszähler) gleichzeitig fortgeschrieben
+                    und die Metriken des Tages spaltenweise in den Ergebnisspeicher geschrieben.
+                    Die Reihenfolge der Prozesse innerhalb eines Tages entspricht der Methode muellzyklus_taeglich des Klassenmodells.
+"""
+def simulation_batch(seeds, szenario, handlungsoption, speicher=None, start=0, varianzreduktion=None, parameter=None):
+    durchlaeufe = len(seeds)
+    parameter = modellparameter(parameter)
+    bewohner, menge_pro_person = parameter["ANZAHL_BEWOHNER"], parameter["RESTMUELL_MENGE_PRO_PERSON_TAG"]
+    if speicher is None:
+        speicher = Ergebnisspeicher(durchlaeufe, TAGE)
+    metriken = {metrik: speicher[metrik][start:start + durchlaeufe] for metrik in speicher} # Sichten auf die Zeilen des Blocks
+
+    leertage, zufall = zufallszahlen(seeds, TAGE, varianzreduktion)
+    termine = kalender_tabelle(TAGE, START_JAHR).leerungstermine[leertage].T # (TAGE x Durchläufe)
+
+    staffel = np.array(parameter["REST_MUELLTONE_STAFFEL"], dtype=np.int64)
+    staffel_kosten = np.array([parameter["REST_MUELLTONE_KOSTEN_STAFFEL"][kapa] for kapa in parameter["REST_MUELLTONE_STAFFEL"]])
+
+    # Zustand der Simulationsläufe
+    kapazitaet_index = np.zeros(durchlaeufe, dtype=np.int64) # Startkapazität (kleinste Tonnengröße)
+    fuellstand = np.zeros(durchlaeufe)
+    wochen_ueberfuellt = np.zeros(durchlaeufe, dtype=np.int64)
+
+    # Müllproduktion (unabhängig vom Zustand, daher für alle Tage vorab; Werte pro Simulationslauf als Spalte)
+    bewohner_spalte = np.reshape(bewohner, (-1, 1))
+    anzahl_bewohner = np.where(zufall[STROM_ABWESEND] < np.reshape(parameter["P_ABWESEND"], (-1, 1)), np.minimum(np.floor(zufall[STROM_ABWESEND_ANZAHL] * (bewohner_spalte + 1)), bewohner_spalte), bewohner_spalte).astype(np.int64)
+    anzahl_gaeste = np.where(zufall[STROM_BESUCH] < np.reshape(szenario["P_BESUCH"], (-1, 1)), np.minimum(1 + np.floor(zufall[STROM_BESUCH_ANZAHL] * 10), 10), 0).astype(np.int64)
+    metriken["anzahl_bewohner_tag"][:] = anzahl_bewohner
+    metriken["anzahl_besuch_tag"][:] = anzahl_gaeste
+    anzahl_bewohner, anzahl_gaeste = anzahl_bewohner.T, anzahl_gaeste.T # (TAGE x Durchläufe)
+    ausfall_zufall = zufall[STROM_AUSFALL].T
+
+    for tag in range(TAGE):
+        # Prozess: Müllproduktion
+        fuellstand += anzahl_bewohner[tag] * menge_pro_person
+        fuellstand += anzahl_gaeste[tag] * menge_pro_person * 0.25
+        kapazitaet = staffel[kapazitaet_index]
+        metriken["ueberfuellungsrate_tag"][:, tag] = np.maximum(0.0, (fuellstand - kapazitaet) / kapazitaet * 100)
+        metriken["fuellmenge_tag"][:, tag] = fuellstand
+        metriken["kapazitaet_tag"][:, tag] = kapazitaet
+
+        # Prozess: reguläre Leerung - Teil 1: Indikator
+        ist_ausfall = termine[tag] & (ausfall_zufall[tag] <= szenario["P_AUSFALL"])
+        findet_regulaere_leerung_statt = termine[tag] & ~ist_ausfall
+        metriken["ausfall_tag"][:, tag] = ist_ausfall
+
+        # Prozess: Sonderentleerung
+        kosten_sonderentleerung = 0.0
+        if handlungsoption["sonderentleerung"]:
+            sonderentleerung = ~findet_regulaere_leerung_statt & ((fuellstand / kapazitaet * 100) >= parameter["SONDERENTLEERUNG_FUELLMENGE_PROZENT"])
+            fuellstand[sonderentleerung] = 0.0
+            kosten_sonderentleerung = np.where(sonderentleerung, staffel_kosten[kapazitaet_index] * 1.4, 0.0)
+        metriken["sonderentleerung_kosten_tag"][:, tag] = kosten_sonderentleerung
+
+        # Prozess: Überfüllung
+        ueber_liter = np.maximum(0.0, fuellstand - kapazitaet)
+        kosten_ueberfuellung = np.where(findet_regulaere_leerung_statt, np.ceil(ueber_liter / 70) * 9, 0.0)
+        metriken["ueberfuellung_kosten_tag"][:, tag] = kosten_ueberfuellung
+        wochen_ueberfuellt = np.where(findet_regulaere_leerung_statt, np.where(fuellstand > kapazitaet, wochen_ueberfuellt + 1, 0), wochen_ueberfuellt)
+        if handlungsoption["kapazitaetsausbau"]:
+            ausbau = findet_regulaere_leerung_statt & (wochen_ueberfuellt >= parameter["UEBERFUELLUNGEN_KAPAZITAETSAUSBAU"])
+            kapazitaet_index = np.where(ausbau, np.minimum(kapazitaet_index + 1, len(staffel) - 1), kapazitaet_index)
+            wochen_ueberfuellt[ausbau] = 0
+
+        # Prozess: reguläre Leerung - Teil 2: Tatsächliche Leerung inkl. Kostenbestimmung
+        tonnen_kosten = np.where(findet_regulaere_leerung_statt, staffel_kosten[kapazitaet_index], 0.0)
+        fuellstand[findet_regulaere_leerung_statt] = 0.0
+
+        # Gesamtkosten (Basiskosten + Überfüllung + Sonderleerung)
+        metriken["kosten_tag"][:, tag] = tonnen_kosten + kosten_ueberfuellung + kosten_sonderentleerung
+
+    return speicher
+
+
+
+"""
+Funktion:           Zwei-Stichproben-Kolmogorov-Smirnov-Test
+Input:              stichprobe_a, stichprobe_b (Stichproben)
+                    alpha (Signifikanzniveau, unterstützt 0.1, 0.05, 0.01, 0.001)
+Output:             ks_statistik (maximale Differenz der empirischen Verteilungsfunktionen)
+                    kritischer_wert (kritischer Wert für die Ablehnung der Nullhypothese gleicher Verteilungen)
+Funktionsweise:     Die empirischen Verteilungsfunktionen beider Stichproben werden an allen Stichprobenwerten ausgewertet.
+                    Der kritische Wert wird über die asymptotische Näherung c(alpha) * sqrt((n + m) / (n * m)) bestimmt.
+"""
+def ks_test(stichprobe_a, stichprobe_b, alpha=0.01):
+    c_alpha = {0.1: 1.224, 0.05: 1.358, 0.01: 1.628, 0.001: 1.949}[alpha]
+    a, b = np.sort(stichprobe_a), np.sort(stichprobe_b)
+    werte = np.concatenate([a, b])
+    ks_statistik = np.max(np.abs(np.searchsorted(a, werte, side="right") / len(a) - np.searchsorted(b, werte, side="right") / len(b)))
+    kritischer_wert = c_alpha * math.sqrt((len(a) + len(b)) / (len(a) * len(b)))
+    return float(ks_statistik), kritischer_wert
+
+
+
+"""
+Funktion:           Statistischer Vergleich einer schnellen Engine mit dem SimPy-Klassenmodell
+Input:              szenario (betrachteten Szenario)
+                    handlungsoption (betrachtete Handlungsoption)
+                    durchlaeufe (Anzahl der Simulationsdurchläufe pro Engine)
+                    alpha (Signifikanzniveau)
+                    engine (verglichene Engine: "numpy" oder "ereignis")
+Output:             vergleich (Teststatistik, kritischer Wert und Testergebnis pro Kennzahl und Test)
+Funktionsweise:     Beide Engines werden mit unterschiedlichen Zufallsstartwerten ausgeführt (unabhängige Stichproben).
+                    Für die Gesamtkosten und die Gesamtfüllmenge pro Simulationslauf wird mit dem Kolmogorov-Smirnov-Test geprüft, ob die Verteilungen
+                    übereinstimmen, und mit einem z-Test (Welch, Normalapproximation), ob sich die Mittelwerte unterscheiden.
+"""
+def validierung_engines(szenario, handlungsoption, durchlaeufe=500, alpha=0.01, engine="numpy"):
+    from simulation import simulation_rohdaten # Import zur Laufzeit (zirkulärer Import)
+
+    ergebnisse_simpy = simulation_rohdaten([1000 + i for i in range(durchlaeufe)], szenario, handlungsoption)
+    ergebnisse_engine = simulation_rohdaten([100000 + i for i in range(durchlaeufe)], szenario, handlungsoption, engine, tageswerte=False)
+
+    z_kritisch = NormalDist().inv_cdf(1 - alpha / 2)
+    vergleich = {}
+    for metrik, name in [("kosten_tag", "Gesamtkosten"), ("fuellmenge_tag", "Gesamtfüllmenge")]:
+        a, b = ergebnisse_simpy.summe(metrik), ergebnisse_engine.summe(metrik)
+        ks_statistik, kritischer_wert = ks_test(a, b, alpha)
+        standardfehler = math.sqrt(np.var(a, ddof=1) / len(a) + np.var(b, ddof=1) / len(b))
+        z_statistik = abs(float(np.mean(a) - np.mean(b))) / standardfehler if standardfehler > 0 else 0.0
+        vergleich[name] = {"KS-Statistik": round(ks_statistik, 4), "Kritischer Wert": round(kritischer_wert, 4), "Test bestanden": ks_statistik <= kritischer_wert,
+                           "z-Statistik": round(z_statistik, 4), "Kritischer z-Wert": round(z_kritisch, 4), "Mittelwerttest bestanden": z_statistik <= z_kritisch}
+    return vergleich
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,334 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die verteilte Ausführung der Simulation auf mehreren Rechnern (Koordinator und Arbeiter).
+Der Koordinator teilt die Simulation in (Szenario, Handlungsoption, Seed-Block)-Aufgaben auf und vergibt sie über eine
+Socket-Verbindung (multiprocessing.connection mit gemeinsamem Schlüssel) an die Arbeiter. Ein Arbeiter simuliert jeweils einen
+Block und sendet nur das kompakte Teilergebnis (Statistik, Quantilskizzen und Histogramme, siehe cache.teilergebnis_speichern) zurück.
+Bricht die Verbindung zu einem Arbeiter ab (oder antwortet er nicht innerhalb der Zeitgrenze), wird seine Aufgabe erneut vergeben.
+Die Teilergebnisse werden pro Kombination in der Reihenfolge der Blöcke zusammengeführt, die Ergebnisse sind daher identisch
+zur seriellen Ausführung, unabhängig davon, welcher Arbeiter welchen Block simuliert hat.
+Ausführung über die Kommandozeile, z.B.:
+    python simulation/verteilt.py koordinator --adresse 0.0.0.0:6000 --durchlaeufe 100000
+    python simulation/verteilt.py arbeiter --adresse rechner1:6000 --prozesse 8     (auf jedem Rechner)
+    python simulation/verteilt.py lokal --arbeiter 4     (Koordinator und Arbeiter auf einem Rechner, z.B. zum Testen)
+Koordinator und Arbeiter benötigen einen gemeinsamen geheimen Schlüssel in der Umgebungsvariable SIMULATION_SCHLUESSEL und starten ohne ihn nicht.
+Nur im Modus lokal (Adresse localhost) wird ohne Umgebungsvariable ein zufälliger Schlüssel erzeugt.
+Die Nachrichten werden mit pickle übertragen und sind nur durch den gemeinsamen Schlüssel geschützt, daher nur in vertrauenswürdigen Netzen verwenden.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import argparse
+import io
+import os
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import Process
+from multiprocessing.connection import Listener, Client
+from simulation import seed_bloecke, simulation_block, ergebnisse_auswerten
+from statistik import Teilergebnis
+from cache import teilergebnis_speichern, teilergebnis_laden
+
+
+SCHLUESSEL = os.environ.get("SIMULATION_SCHLUESSEL", "").encode("utf-8") or None # Gemeinsamer Schlüssel von Koordinator und Arbeitern (None = nicht gesetzt)
+LOKALE_ADRESSEN = ("localhost", "127.0.0.1", "::1")
+
+
+# --------------------------------------------------
+# ---------- Klassenmodell (Koordinator) ----------
+"""
+Der Koordinator nimmt Verbindungen in einem Hintergrund-Thread an und bedient jeden Arbeiter in einem eigenen Thread:
+    Arbeiter -> Koordinator: {"art": "bereit", "name": ...}
+    Koordinator -> Arbeiter: {"art": "aufgabe", "nr": ..., "aufgabe": (seeds, szenario, handlungsoption, engine, varianzreduktion, parameter)} oder {"art": "ende"}
+    Arbeiter -> Koordinator: {"art": "ergebnis", "nr": ..., "daten": Teilergebnis als .npz-Bytes} oder {"art": "fehler", "nr": ..., "meldung": ...}
+Offene Aufgaben werden in der Reihenfolge der Blöcke vergeben, erneut zu vergebende Aufgaben zuerst.
+Sind keine Aufgaben offen, aber noch Aufgaben bei anderen Arbeitern in Bearbeitung, wartet ein Arbeiter, bis eine Aufgabe neu vergeben
+wird oder alle Aufgaben abgeschlossen sind. Ein doppelt eingehendes Ergebnis (nach einer Neuvergabe) wird verworfen.
+Bereits im Cache bzw. Checkpoint vorhandene Blöcke werden nicht vergeben, neue Ergebnisse werden dort gespeichert.
+"""
+class Koordinator:
+    def __init__(self, aufgaben, adresse=("localhost", 0), schluessel=None, cache=None, timeout=None):
+        schluessel_pruefen(schluessel)
+        self.aufgaben = aufgaben
+        self.cache = cache
+        self.timeout = timeout # Zeitgrenze pro Aufgabe in Sekunden (None = bis zum Abbruch der Verbindung)
+        self.ergebnisse = {}
+        self.offen = deque()
+        self.neu_vergeben = 0
+        self.arbeiter = set()
+        self.fehler = None
+        self._bedingung = threading.Condition()
+        for nr, aufgabe in enumerate(aufgaben):
+            teilergebnis = cache.laden(*aufgabe) if cache is not None else None
+            if teilergebnis is None:
+                self.offen.append(nr)
+            else:
+                self.ergebnisse[nr] = teilergebnis
+        self.listener = Listener(adresse, authkey=schluessel)
+        self.adresse = self.listener.address
+
+    @property
+    def fertig(self):
+        return len(self.ergebnisse) == len(self.aufgaben) or self.fehler is not None
+
+    """
+    Funktion:           Ausführung aller Aufgaben
+    Output:             ergebnisse (Liste der Teilergebnisse in der Reihenfolge der Aufgaben)
+    Funktionsweise:     Die Methode wartet, bis alle Aufgaben abgeschlossen sind. Meldet ein Arbeiter einen Fehler in der Simulation,
+                        wird die Ausführung mit einem RuntimeError beendet (die Aufgabe würde auch bei jedem anderen Arbeiter fehlschlagen).
+    """
+    def ausfuehren(self):
+        threading.Thread(target=self._annehmen, daemon=True).start()
+        letzte_meldung = 0.0
+        with self._bedingung:
+            while not self.fertig:
+                self._bedingung.wait(timeout=1.0)
+                if time.monotonic() - letzte_meldung >= 10:
+                    letzte_meldung = time.monotonic()
+                    print( f"   {len(self.ergebnisse)}/{len(self.aufgaben)} Blöcke abgeschlossen, {len(self.arbeiter)} Arbeiter verbunden, {self.neu_vergeben} Blöcke neu vergeben" )
+        self.listener.close()
+        if self.fehler is not None:
+            raise RuntimeError(f"Simulation auf einem Arbeiter fehlgeschlagen: {self.fehler}")
+        return [self.ergebnisse[nr] for nr in range(len(self.aufgaben))]
+
+    def _annehmen(self):
+        while True:
+            try:
+                verbindung = self.listener.accept()
+            except OSError: # Listener geschlossen
+                return
+            except Exception: # z.B. falscher Schlüssel
+                if self.fertig:
+                    return
+                continue
+            threading.Thread(target=self._bedienen, args=(verbindung,), daemon=True).start()
+
+    def _naechste_aufgabe(self):
+        with self._bedingung:
+            while not self.offen and not self.fertig:
+                self._bedingung.wait()
+            return None if self.fertig else self.offen.popleft()
+
+    def _abschliessen(self, nr, teilergebnis):
+        with self._bedingung:
+            if nr not in self.ergebnisse:
+                self.ergebnisse[nr] = teilergebnis
+                if self.cache is not None:
+                    self.cache.speichern(teilergebnis, *self.aufgaben[nr])
+            self._bedingung.notify_all()
+
+    def _bedienen(self, verbindung):
+        nr = None
+        name = "?"
+        try:
+            name = verbindung.recv()["name"]
+            with self._bedingung:
+                self.arbeiter.add(name)
+            while True:
+                nr = self._naechste_aufgabe()
+                if nr is None:
+                    verbindung.send({"art": "ende"})
+                    return
+                verbindung.send({"art": "aufgabe", "nr": nr, "aufgabe": self.aufgaben[nr]})
+                if self.timeout is not None and not verbindung.poll(self.timeout):
+                    raise TimeoutError
+                antwort = verbindung.recv()
+                if antwort["art"] == "fehler":
+                    with self._bedingung:
+                        self.fehler = f"{name}, Block {nr}: {antwort['meldung']}"
+                        self._bedingung.notify_all()
+                    return
+                self._abschliessen(nr, teilergebnis_laden(io.BytesIO(antwort["daten"])))
+                nr = None
+        except (EOFError, OSError, TimeoutError):
+            if nr is not None:
+                # Verbindung abgebrochen oder Zeitgrenze überschritten: Aufgabe erneut vergeben
+                with self._bedingung:
+                    if nr not in self.ergebnisse:
+                        self.offen.appendleft(nr)
+                        self.neu_vergeben += 1
+                    self._bedingung.notify_all()
+                print( f"[Info] Verbindung zu Arbeiter {name} verloren, Block {nr} wird neu vergeben." )
+        finally:
+            with self._bedingung:
+                self.arbeiter.discard(name)
+            verbindung.close()
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Prüfung des gemeinsamen Schlüssels
+Input:              schluessel (gemeinsamer Schlüssel als Bytes)
+Funktionsweise:     Ohne Schlüssel wird ein ValueError ausgelöst (kein öffentlich bekannter Standardschlüssel).
+"""
+def schluessel_pruefen(schluessel):
+    if not schluessel:
+        raise ValueError("Kein gemeinsamer Schlüssel: die Umgebungsvariable SIMULATION_SCHLUESSEL muss auf Koordinator und Arbeitern gesetzt sein.")
+
+
+
+"""
+Funktion:           Arbeiter: Simulation der vom Koordinator vergebenen Blöcke
+Input:              adresse (Adresse des Koordinators als (Rechner, Port))
+                    schluessel (gemeinsamer Schlüssel)
+                    name (Name des Arbeiters in den Meldungen des Koordinators, None = Rechnername:Prozess-ID)
+                    wartezeit (Sekunden, in denen der Verbindungsaufbau wiederholt wird, falls der Koordinator noch nicht bereit ist)
+Output:             anzahl (Anzahl der simulierten Blöcke)
+"""
+def arbeiter(adresse, schluessel, name=None, wartezeit=30):
+    schluessel_pruefen(schluessel)
+    ende = time.monotonic() + wartezeit
+    while True:
+        try:
+            verbindung = Client(adresse, authkey=schluessel)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > ende:
+                raise
+            time.sleep(0.5)
+    anzahl = 0
+    with verbindung:
+        verbindung.send({"art": "bereit", "name": name or f"{socket.gethostname()}:{os.getpid()}"})
+        while True:
+            nachricht = verbindung.recv()
+            if nachricht["art"] == "ende":
+                break
+            try:
+                teilergebnis = simulation_block(*nachricht["aufgabe"])
+            except Exception as fehler:
+                verbindung.send({"art": "fehler", "nr": nachricht["nr"], "meldung": repr(fehler)})
+                raise
+            verbindung.send({"art": "ergebnis", "nr": nachricht["nr"], "daten": teilergebnis_speichern(teilergebnis)})
+            anzahl += 1
+    return anzahl
+
+
+
+"""
+Funktion:           Aufgaben einer Simulation für den Koordinator
+Input:              szenarien, handlungsoptionen, durchlaeufe, chunk_groesse, engine, varianzreduktion, parameter (siehe simulationslauf)
+Output:             kennungen (Liste von (Szenario, Handlungsoption) pro Aufgabe)
+                    aufgaben (Liste der Argumente von simulation_block pro Aufgabe)
+"""
+def simulation_aufgaben(szenarien, handlungsoptionen, durchlaeufe, chunk_groesse=50, engine="simpy", varianzreduktion=None, parameter=None):
+    kennungen, aufgaben = [], []
+    for szenario_key in szenarien:
+        for handlungsoption_key in handlungsoptionen:
+            for seeds in seed_bloecke(durchlaeufe, chunk_groesse):
+                kennungen.append((szenario_key, handlungsoption_key))
+                aufgaben.append((seeds, szenarien[szenario_key], handlungsoptionen[handlungsoption_key], engine, varianzreduktion, parameter))
+    return kennungen, aufgaben
+
+
+
+"""
+Funktion:           Verteilte Durchführung der Simulation (Gegenstück zu simulationslauf mit fester Anzahl an Simulationsläufen)
+Input:              szenarien, handlungsoptionen, durchlaeufe, chunk_groesse, engine, varianzreduktion, cache, parameter (siehe simulationslauf)
+                    adresse (Adresse, unter der der Koordinator erreichbar ist, als (Rechner, Port); Port 0 = freier Port)
+                    schluessel (gemeinsamer Schlüssel, None = zufälliger Schlüssel, nur mit Adresse localhost)
+                    timeout (Zeitgrenze pro Block in Sekunden, None = keine)
+                    anzahl_lokal (Anzahl der zusätzlich auf diesem Rechner gestarteten Arbeiterprozesse)
+                    ausgabe (Pfad der Ergebnistabelle als CSV, None = nicht speichern)
+                    grafik_verzeichnis (Ausgabeordner der Grafiken, None = keine Grafiken)
+Output:             simulation_ergebnisse_metrik (Werte der erfassten Metriken, wie simulationslauf)
+Funktionsweise:     Die Teilergebnisse werden pro Kombination in der Reihenfolge der Blöcke zusammengeführt und wie in simulationslauf ausgewertet.
+                    Die Ergebnistabelle wird vor den Grafiken gespeichert (siehe ergebnisse_auswerten).
+                    Ohne Schlüssel sind nur die lokal gestarteten Arbeiter zugelassen, die den zufälligen Schlüssel als Argument erhalten.
+"""
+def verteilte_simulation(szenarien, handlungsoptionen, durchlaeufe, chunk_groesse=50, engine="simpy", varianzreduktion=None, cache=None, parameter=None,
+                         adresse=("localhost", 0), schluessel=None, timeout=None, anzahl_lokal=0, ausgabe=None, grafik_verzeichnis="output"):
+    if schluessel is None:
+        if adresse[0] not in LOKALE_ADRESSEN:
+            raise ValueError(f"Ohne gemeinsamen Schlüssel (SIMULATION_SCHLUESSEL) ist nur die Adresse localhost zulässig, nicht {adresse[0]}.")
+        schluessel = os.urandom(32)
+    kennungen, aufgaben = simulation_aufgaben(szenarien, handlungsoptionen, durchlaeufe, chunk_groesse, engine, varianzreduktion, parameter)
+    koordinator = Koordinator(aufgaben, adresse, schluessel, cache, timeout)
+    print( f"[Info] Koordinator bereit unter {koordinator.adresse[0]}:{koordinator.adresse[1]}: {len(aufgaben)} Blöcke, davon {len(koordinator.offen)} offen" )
+    lokale_arbeiter = [Process(target=arbeiter, args=(koordinator.adresse, schluessel, f"lokal-{i + 1}"), daemon=True) for i in range(anzahl_lokal)]
+    for prozess in lokale_arbeiter:
+        prozess.start()
+    try:
+        ergebnisse = koordinator.ausfuehren()
+    finally:
+        for prozess in lokale_arbeiter:
+            prozess.join(timeout=5)
+    print( f"[Info] Alle Blöcke abgeschlossen ({koordinator.neu_vergeben} Blöcke neu vergeben)." )
+
+    teilergebnisse = {kennung: Teilergebnis() for kennung in kennungen}
+    for kennung, teilergebnis in zip(kennungen, ergebnisse):
+        teilergebnisse[kennung].zusammenfuehren(teilergebnis)
+    return ergebnisse_auswerten(teilergebnisse, szenarien, handlungsoptionen, varianzreduktion=varianzreduktion, ausgabe=ausgabe, grafik_verzeichnis=grafik_verzeichnis)
+
+
+
+"""
+Funktion:           Umwandlung einer Adresse "Rechner:Port" in (Rechner, Port)
+"""
+def adresse_lesen(text):
+    rechner, _, port = text.rpartition(":")
+    return (rechner or "localhost", int(port))
+
+
+
+"""
+Funktion:           Kommandozeile der verteilten Simulation
+Funktionsweise:     koordinator: vergibt die Blöcke an die verbundenen Arbeiter und speichert die Ergebnistabelle wie main.py.
+                    arbeiter: startet einen oder mehrere Arbeiterprozesse, die sich mit dem Koordinator verbinden.
+                    lokal: Koordinator und Arbeiterprozesse auf diesem Rechner (Adresse localhost).
+                    koordinator und arbeiter brechen ohne SIMULATION_SCHLUESSEL ab, lokal verwendet dann einen zufälligen Schlüssel.
+                    Die Grafiken werden im Ordner der Ergebnistabelle (--ausgabe) gespeichert, die Ergebnistabelle vor den Grafiken.
+                    Szenarien und Handlungsoptionen werden aus main.py übernommen.
+"""
+def main():
+    parser = argparse.ArgumentParser(description="Verteilte Simulation (Koordinator und Arbeiter)")
+    parser.add_argument("modus", choices=["koordinator", "arbeiter", "lokal"])
+    parser.add_argument("--adresse", default="localhost:6000", help="Rechner:Port des Koordinators")
+    parser.add_argument("--prozesse", type=int, default=1, help="arbeiter: Anzahl der Arbeiterprozesse auf diesem Rechner")
+    parser.add_argument("--arbeiter", type=int, default=2, help="lokal: Anzahl der lokalen Arbeiterprozesse")
+    parser.add_argument("--durchlaeufe", type=int, default=1000)
+    parser.add_argument("--chunk-groesse", type=int, default=50)
+    parser.add_argument("--engine", default="simpy", choices=["simpy", "numpy", "ereignis"])
+    parser.add_argument("--varianzreduktion", default=None, choices=["crn", "antithetisch"])
+    parser.add_argument("--timeout", type=float, default=None, help="Zeitgrenze pro Block in Sekunden, danach wird der Block neu vergeben")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint-Verzeichnis (abgeschlossene Blöcke werden beim Neustart übersprungen)")
+    parser.add_argument("--ausgabe", default=os.path.join("output", "simulation_ergebnisse.csv"))
+    argumente = parser.parse_args()
+    adresse = adresse_lesen(argumente.adresse)
+    if argumente.modus in ("koordinator", "arbeiter") and SCHLUESSEL is None:
+        parser.error(f"{argumente.modus}: die Umgebungsvariable SIMULATION_SCHLUESSEL (gemeinsamer geheimer Schlüssel aller Rechner) ist nicht gesetzt")
+
+    if argumente.modus == "arbeiter":
+        prozesse = [Process(target=arbeiter, args=(adresse, SCHLUESSEL)) for _ in range(argumente.prozesse)]
+        for prozess in prozesse:
+            prozess.start()
+        for prozess in prozesse:
+            prozess.join()
+        return 0 if all(prozess.exitcode == 0 for prozess in prozesse) else 1
+
+    from main import SZENARIEN, HANDLUNGSOPTIONEN
+    from checkpoint import Checkpoint
+    verzeichnis = os.path.dirname(argumente.ausgabe) or "."
+    os.makedirs(verzeichnis, exist_ok=True)
+    cache = Checkpoint(argumente.checkpoint) if argumente.checkpoint is not None else None
+    verteilte_simulation(SZENARIEN, HANDLUNGSOPTIONEN, argumente.durchlaeufe, argumente.chunk_groesse, argumente.engine, argumente.varianzreduktion, cache,
+                         adresse=("localhost", 0) if argumente.modus == "lokal" else adresse, schluessel=SCHLUESSEL, timeout=argumente.timeout,
+                         anzahl_lokal=argumente.arbeiter if argumente.modus == "lokal" else 0, ausgabe=argumente.ausgabe, grafik_verzeichnis=verzeichnis)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
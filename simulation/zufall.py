@@ -0,0 +1,96 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Diese Datei beinhaltet die Zufallszahlenströme für die Varianzreduktion.
+- Gemeinsame Zufallszahlen ("crn", Common Random Numbers): Für jeden zufälligen Prozess (Leertag, Abwesenheit, Besuch, Ausfall) gibt es einen eigenen Strom,
+  der nur vom Zufallsstartwert abhängt. Simulationsläufe mit gleichem Zufallsstartwert erleben dadurch unter allen Handlungsoptionen
+  dieselben Bewohner, Gäste und Ausfälle, auch wenn sich der Verbrauch der Zufallszahlen zwischen den Szenarien unterscheidet.
+- Antithetische Paare ("antithetisch"): Zusätzlich bilden zwei aufeinanderfolgende Zufallsstartwerte (2k, 2k+1) ein Paar.
+  Der zweite Lauf verwendet die gespiegelten Zufallszahlen 1 - u des ersten Laufs (der Leertag bleibt gleich).
+  Zufällige Anzahlen werden daher mit einer festen Anzahl an Zufallszahlen pro Tag gezogen (siehe Zufallsstrom.bedingte_anzahl).
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import random
+
+
+VARIANZREDUKTIONEN = (None, "crn", "antithetisch")
+
+
+# ---------------------------------------------------
+# ---------- Klassenmodell (Zufallsstrom) ----------
+"""
+Zufallsstrom mit Inversionsverfahren für ganze Zahlen.
+randint(a, b) wird aus einer einzigen gleichverteilten Zufallszahl u bestimmt (a + floor(u * (b - a + 1))),
+damit ein antithetischer Strom (u -> 1 - u) auch für ganze Zahlen gespiegelte Werte erzeugt.
+"""
+class Zufallsstrom(random.Random):
+    def __init__(self, seed, antithetisch=False):
+        super().__init__(seed)
+        self.antithetisch = antithetisch
+
+    def random(self):
+        u = super().random()
+        return 1.0 - u if self.antithetisch else u
+
+    def randint(self, a, b):
+        return min(b, a + int(self.random() * (b - a + 1))) # 1 - u kann 1.0 sein --> auf b begrenzen
+
+    """
+    Funktion:           Zufällige Anzahl, die nur mit einer Wahrscheinlichkeit eintritt (z.B. Abwesenheit, Besuch)
+    Input:              p (Wahrscheinlichkeit des Ereignisses)
+                        a, b (Grenzen der Anzahl wie bei randint)
+    Output:             anzahl (Anzahl zwischen a und b, None = Ereignis tritt nicht ein)
+    Funktionsweise:     Es werden immer zwei Zufallszahlen gezogen (Ereignis und Anzahl), auch wenn das Ereignis nicht eintritt
+                        (wie in vektorisiert.zufallszahlen). Ein Lauf und sein antithetischer Partner verbrauchen dadurch an jedem Tag
+                        gleich viele Zufallszahlen und bleiben über den gesamten Zeitraum gespiegelt.
+    """
+    def bedingte_anzahl(self, p, a, b):
+        ereignis = self.random() < p
+        anzahl = self.randint(a, b)
+        return anzahl if ereignis else None
+
+
+# --------------------------------
+# ---------- Funktionen ----------
+"""
+Funktion:           Zuordnung eines Zufallsstartwerts zu Basis-Startwert und antithetischem Indikator
+Input:              seed (Zufallsstartwert des Simulationslaufs)
+                    varianzreduktion (None, "crn" oder "antithetisch")
+Output:             basis_seed (Startwert der Zufallsströme)
+                    antithetisch (True, wenn der Lauf die gespiegelten Zufallszahlen verwendet)
+"""
+def basis_seed(seed, varianzreduktion):
+    if varianzreduktion == "antithetisch":
+        return seed // 2, seed % 2 == 1
+    return seed, False
+
+
+
+"""
+Funktion:           Erzeugung der getrennten Zufallszahlenströme eines Simulationslaufs
+Input:              seed (Zufallsstartwert des Simulationslaufs)
+                    varianzreduktion ("crn" oder "antithetisch")
+Output:             stroeme (Dictionary mit einem Zufallsstrom pro zufälligem Prozess)
+Funktionsweise:     Jeder Strom wird aus dem Namen des Prozesses und dem Basis-Startwert initialisiert (Zeichenketten werden von random.Random
+                    unabhängig vom Hash-Seed des Interpreters deterministisch verarbeitet).
+"""
+def zufallsstroeme(seed, varianzreduktion):
+    basis, antithetisch = basis_seed(seed, varianzreduktion)
+    stroeme = {
+        "leertag": Zufallsstrom(f"leertag:{basis}"),
+        "abwesend": Zufallsstrom(f"abwesend:{basis}", antithetisch),
+        "besuch": Zufallsstrom(f"besuch:{basis}", antithetisch),
+        "ausfall": Zufallsstrom(f"ausfall:{basis}", antithetisch),
+    }
+    return stroeme
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,23 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Gemeinsame Einstellungen der Tests: Die Simulationsmodule liegen im Ordner simulation und importieren sich gegenseitig
+ohne Paketnamen (wie beim Start über python simulation/main.py). Der Ordner wird daher dem Suchpfad hinzugefügt.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import sys
+from pathlib import Path
+
+SIMULATION_VERZEICHNIS = Path(__file__).resolve().parent.parent / "simulation"
+sys.path.insert(0, str(SIMULATION_VERZEICHNIS))
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,47 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der Benchmark-Suite: Ein im Hauptprozess geänderter Zeitraum (parameter.TAGE) muss auch in den Arbeitsprozessen gelten,
+unabhängig von der Startmethode der Prozesse. Jedes Modul der Arbeitsprozesse muss im Kaltstart innerhalb des Importbudgets importiert
+werden, ohne die Bibliotheken der Auswertung (pandas, Matplotlib) bzw. holidays zu laden. Jede Prüfung läuft in einem neuen Python-Prozess.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import json
+import multiprocessing
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from benchmark import IMPORT_MODULE, IMPORT_BUDGET, importzeit, importpruefung
+
+
+SIMULATION_VERZEICHNIS = Path(__file__).resolve().parent.parent / "simulation"
+
+
+@pytest.mark.parametrize("startmethode", [methode for methode in ("spawn", "forkserver", "fork") if methode in multiprocessing.get_all_start_methods()])
+def test_tage_in_arbeitsprozessen(startmethode):
+    code = (f"import json, multiprocessing, sys; sys.path.insert(0, {str(SIMULATION_VERZEICHNIS)!r}); multiprocessing.set_start_method({startmethode!r}); "
+            "import parameter; parameter.TAGE = 30; "
+            "from main import SZENARIEN, HANDLUNGSOPTIONEN; from simulation import monte_carlo; "
+            "ergebnis = monte_carlo(20, SZENARIEN['Normal'], HANDLUNGSOPTIONEN['feste Abholintervalle'], anzahl_prozesse=2, chunk_groesse=10, engine='numpy'); "
+            "print(json.dumps(ergebnis.statistik.werte['kosten_tag']['anzahl']))")
+    prozess = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert json.loads(prozess.stdout.strip().splitlines()[-1]) == 20 * 30
+
+
+@pytest.mark.parametrize("modul", IMPORT_MODULE)
+def test_importbudget(modul):
+    messung = importzeit(modul)
+    assert messung["schwere_bibliotheken"] == []
+    assert importpruefung([messung], IMPORT_BUDGET) == []
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,68 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests des Ergebnis-Caches: Ein gespeicherter Block wird nur bei unverändertem Schlüssel wiederverwendet.
+Eine Änderung der Parameter, der Engine-Version oder des Quelltexts der Simulationslogik muss zu einem Fehlschlag führen.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import pytest
+import cache
+from cache import Ergebniscache
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from simulation import simulation_block
+
+
+SEEDS = list(range(1000, 1005))
+SZENARIO = "Normal"
+HANDLUNGSOPTION = "Sonderentleerung"
+
+
+@pytest.fixture
+def ergebniscache(tmp_path):
+    ergebniscache = Ergebniscache(tmp_path / "cache")
+    teilergebnis = simulation_block(SEEDS, SZENARIEN[SZENARIO], HANDLUNGSOPTIONEN[HANDLUNGSOPTION], "numpy")
+    ergebniscache.speichern(teilergebnis, SEEDS, SZENARIO, HANDLUNGSOPTION, "numpy")
+    return ergebniscache
+
+
+def test_treffer_bei_unveraendertem_schluessel(ergebniscache):
+    teilergebnis = ergebniscache.laden(SEEDS, SZENARIO, HANDLUNGSOPTION, "numpy")
+    assert teilergebnis is not None
+    assert ergebniscache.treffer == 1
+    assert teilergebnis.statistik.werte == simulation_block(SEEDS, SZENARIEN[SZENARIO], HANDLUNGSOPTIONEN[HANDLUNGSOPTION], "numpy").statistik.werte
+
+
+def test_fehlschlag_bei_geaendertem_parameter(ergebniscache):
+    assert ergebniscache.laden(SEEDS, SZENARIO, HANDLUNGSOPTION, "numpy", ueberschreibungen={"P_ABWESEND": 0.1}) is None
+    assert ergebniscache.laden(SEEDS, SZENARIO, HANDLUNGSOPTION, "ereignis") is None
+
+
+def test_fehlschlag_bei_geaenderter_engine_version(ergebniscache, monkeypatch):
+    monkeypatch.setitem(cache.ENGINE_VERSIONEN, "numpy", cache.ENGINE_VERSIONEN["numpy"] + 1)
+    assert ergebniscache.laden(SEEDS, SZENARIO, HANDLUNGSOPTION, "numpy") is None
+
+
+def test_fehlschlag_bei_geaendertem_quelltext(ergebniscache, monkeypatch, tmp_path):
+    quellen = tmp_path / "quellen"
+    quellen.mkdir()
+    for name in set(cache.ENGINE_QUELLEN["numpy"] + cache.GEMEINSAME_QUELLEN):
+        (quellen / name).write_bytes((cache.Path(cache.__file__).resolve().parent / name).read_bytes())
+    (quellen / "vektorisiert.py").write_bytes((quellen / "vektorisiert.py").read_bytes() + b"\n# Aenderung\n")
+    monkeypatch.setattr(cache, "__file__", str(quellen / "cache.py"))
+    cache.quellen_hash.cache_clear()
+    try:
+        assert ergebniscache.laden(SEEDS, SZENARIO, HANDLUNGSOPTION, "numpy") is None
+    finally:
+        monkeypatch.undo()
+        cache.quellen_hash.cache_clear()
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,110 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests des Checkpoints: Eine fortgesetzte Simulation lädt die abgeschlossenen Blöcke und liefert dieselbe Ergebnistabelle wie eine
+ununterbrochene Ausführung. Ein beschädigter oder unvollständiger Eintrag am Ende der Datei wird beim Öffnen abgeschnitten und nicht geladen.
+Gleichzeitig gespeicherte Blöcke (Hintergrund-Threads von block_sichern) ergeben vollständige, nicht verschränkte Einträge.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import functools
+import os
+import threading
+import time
+from concurrent.futures import Future
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from checkpoint import Checkpoint
+from funktionen import ausgabe_csv
+from simulation import simulationslauf, simulation_block, block_sichern, seed_bloecke
+
+
+SZENARIO = {"Normal": SZENARIEN["Normal"]}
+BLOECKE = seed_bloecke(30, 10)
+
+
+def ergebnistabelle(durchlaeufe, cache=None):
+    return ausgabe_csv(simulationslauf(SZENARIO, HANDLUNGSOPTIONEN, durchlaeufe, 1, 10, "numpy", cache=cache, grafik_verzeichnis=None)).to_csv()
+
+
+def bloecke_speichern(checkpoint):
+    groessen = []
+    for seeds in BLOECKE:
+        checkpoint.speichern(simulation_block(seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy"), seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy")
+        groessen.append(checkpoint.pfad.stat().st_size)
+    return groessen
+
+
+def laden(checkpoint, seeds):
+    return checkpoint.laden(seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy")
+
+
+def test_fortsetzung_wie_ununterbrochen(tmp_path):
+    ergebnistabelle(20, Checkpoint(tmp_path)) # abgebrochene Simulation: nur die ersten beiden Blöcke jeder Kombination
+    checkpoint = Checkpoint(tmp_path)
+    assert ergebnistabelle(40, checkpoint) == ergebnistabelle(40)
+    assert checkpoint.treffer == 2 * len(HANDLUNGSOPTIONEN)
+    assert checkpoint.fehlschlaege == 2 * len(HANDLUNGSOPTIONEN)
+
+
+@pytest.mark.parametrize("beschaedigung", ["sha256", "abgeschnitten"])
+def test_beschaedigter_letzter_eintrag(tmp_path, beschaedigung):
+    groessen = bloecke_speichern(Checkpoint(tmp_path))
+    pfad = tmp_path / Checkpoint.DATEI
+    daten = bytearray(pfad.read_bytes())
+    if beschaedigung == "sha256":
+        daten[-10] ^= 0xFF # Daten des letzten Eintrags passen nicht mehr zum SHA-256-Hash
+    else:
+        daten = daten[:groessen[-1] - 100] # Abbruch während des Schreibens der npz-Daten
+    pfad.write_bytes(bytes(daten))
+
+    checkpoint = Checkpoint(tmp_path)
+    assert pfad.stat().st_size == groessen[-2]
+    assert len(checkpoint.bloecke) == len(BLOECKE) - 1
+    assert laden(checkpoint, BLOECKE[-1]) is None
+    for seeds in BLOECKE[:-1]:
+        assert laden(checkpoint, seeds).statistik.werte == simulation_block(seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy").statistik.werte
+
+
+def test_gleichzeitiges_speichern(tmp_path, monkeypatch):
+    checkpoint = Checkpoint(tmp_path)
+    schreiben = os.write
+    def teilweise_schreiben(deskriptor, daten): # Schreibzugriffe der Threads in Teilen, damit sich Einträge ohne Sperre verschränken
+        if threading.current_thread() in threads:
+            time.sleep(0.001)
+            return schreiben(deskriptor, bytes(daten[:max(1, len(daten) // 2)]))
+        return schreiben(deskriptor, daten)
+    monkeypatch.setattr(os, "write", teilweise_schreiben)
+    bloecke = seed_bloecke(160, 10)
+    teilergebnisse = [simulation_block(seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy") for seeds in bloecke]
+    futures = []
+    for seeds in bloecke:
+        future = Future()
+        future.add_done_callback(functools.partial(block_sichern, checkpoint, seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy", None, None))
+        futures.append(future)
+    start = threading.Barrier(len(bloecke))
+    def abschliessen(future, teilergebnis):
+        start.wait()
+        future.set_result(teilergebnis)
+    threads = [threading.Thread(target=abschliessen, args=argumente) for argumente in zip(futures, teilergebnisse)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    monkeypatch.undo()
+
+    wiedereroeffnet = Checkpoint(tmp_path)
+    assert wiedereroeffnet.bloecke == checkpoint.bloecke
+    assert len(wiedereroeffnet.bloecke) == len(bloecke)
+    for seeds, teilergebnis in zip(bloecke, teilergebnisse):
+        assert laden(wiedereroeffnet, seeds).statistik.werte == teilergebnis.statistik.werte
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,70 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der Simulationslogik: Die NumPy-Engine und die Ereignis-Engine müssen für alle Szenarien und Handlungsoptionen
+dieselbe Verteilung der Gesamtkosten und Gesamtfüllmenge liefern wie das SimPy-Klassenmodell (Kolmogorov-Smirnov- und Mittelwerttest
+mit festen Zufallsstartwerten). Die Ereignis-Engine verwendet dieselben Zufallszahlen wie die NumPy-Engine und muss Lauf für Lauf übereinstimmen.
+Ohne Tageswerte bestimmt die Ereignis-Engine die Kennzahlen direkt aus den Ereignissen; diese müssen den Kennzahlen aus den Tageswerten entsprechen.
+Die gespeicherte Kapazität muss der konfigurierten Tonnengröße entsprechen, auch bei großen Tonnen.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import itertools
+import numpy as np
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from simulation import simulation_rohdaten
+from statistik import StatistikAkkumulator
+from vektorisiert import validierung_engines
+
+
+KOMBINATIONEN = list(itertools.product(SZENARIEN, HANDLUNGSOPTIONEN))
+
+
+@pytest.mark.parametrize("engine", ["numpy", "ereignis"])
+@pytest.mark.parametrize("szenario, handlungsoption", KOMBINATIONEN)
+def test_verteilung_wie_klassenmodell(szenario, handlungsoption, engine):
+    vergleich = validierung_engines(SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], durchlaeufe=200, alpha=0.001, engine=engine)
+    for name, ergebnis in vergleich.items():
+        assert ergebnis["Test bestanden"], f"{name}: KS-Statistik {ergebnis['KS-Statistik']} > {ergebnis['Kritischer Wert']}"
+        assert ergebnis["Mittelwerttest bestanden"], f"{name}: z-Statistik {ergebnis['z-Statistik']} > {ergebnis['Kritischer z-Wert']}"
+
+
+@pytest.mark.parametrize("szenario, handlungsoption", KOMBINATIONEN)
+def test_ereignis_wie_numpy(szenario, handlungsoption):
+    seeds = list(range(1000, 1050))
+    numpy_engine = simulation_rohdaten(seeds, SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], "numpy")
+    ereignis_engine = simulation_rohdaten(seeds, SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], "ereignis")
+    for metrik in ("kosten_tag", "fuellmenge_tag"):
+        np.testing.assert_allclose(ereignis_engine.summe(metrik), numpy_engine.summe(metrik), rtol=1e-9)
+
+
+@pytest.mark.parametrize("szenario, handlungsoption", KOMBINATIONEN)
+def test_ereignis_kennzahlen_ohne_tageswerte(szenario, handlungsoption):
+    seeds = list(range(1000, 1050))
+    tageswerte = StatistikAkkumulator().erfassen(simulation_rohdaten(seeds, SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], "numpy"))
+    ereignisse = StatistikAkkumulator().erfassen(simulation_rohdaten(seeds, SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], "ereignis", tageswerte=False))
+    assert ereignisse.werte.keys() == tageswerte.werte.keys()
+    for metrik, werte in tageswerte.werte.items():
+        for kennzahl, wert in werte.items():
+            assert ereignisse.werte[metrik][kennzahl] == pytest.approx(wert, rel=1e-7, abs=1e-9), f"{metrik}: {kennzahl}"
+
+
+@pytest.mark.parametrize("engine", ["simpy", "numpy", "ereignis"])
+def test_kapazitaet_wie_tonnengroesse(engine):
+    parameter = {"REST_MUELLTONE_STAFFEL": [80, 40000], "REST_MUELLTONE_KOSTEN_STAFFEL": {80: 6.84, 40000: 100.0}}
+    speicher = simulation_rohdaten(list(range(1000, 1010)), SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Kapazitaetsausbau"], engine, parameter=parameter)
+    kapazitaet = speicher["kapazitaet_tag"]
+    assert (kapazitaet[:, 0] == 80).all()
+    assert (kapazitaet[:, -1] == 40000).all() # Ausbau auf die größte Tonne (ohne Überlauf des Datentyps)
+    assert set(np.unique(kapazitaet)) <= {80, 40000}
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
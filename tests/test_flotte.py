@@ -0,0 +1,77 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der Flottensimulation: Ein Stadtteil mit einem Gebäude entspricht einem Simulationslauf der NumPy-Engine mit demselben
+Zufallsstartwert. Gebäude derselben Tour teilen sich Leertag und Ausfälle, Gebäude unterschiedlicher Touren nicht.
+Die Kennzahlen des Stadtteils entsprechen den Summen bzw. Mittelwerten der Werte pro Gebäude.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import itertools
+import numpy as np
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from parameter import TAGE, ANZAHL_BEWOHNER, REST_MUELLTONE_STAFFEL
+from flotte import Flotte, flotte_erzeugen, simulation_flotte, monte_carlo_flotte, auswertung_flotte
+from simulation import simulation_rohdaten
+
+
+@pytest.mark.parametrize("szenario, handlungsoption", list(itertools.product(SZENARIEN, HANDLUNGSOPTIONEN)))
+def test_ein_gebaeude_wie_numpy(szenario, handlungsoption):
+    flotte = Flotte([ANZAHL_BEWOHNER], [REST_MUELLTONE_STAFFEL[0]], [0])
+    for seed in (1000, 1001):
+        gebaeude = simulation_flotte(flotte, SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], seed)["gebaeude"]
+        speicher = simulation_rohdaten([seed], SZENARIEN[szenario], HANDLUNGSOPTIONEN[handlungsoption], "numpy")
+        assert gebaeude["gesamtkosten"][0] == pytest.approx(speicher.summe("kosten_tag")[0], rel=1e-12)
+        assert gebaeude["gesamtfuellmenge"][0] == pytest.approx(speicher.summe("fuellmenge_tag")[0], rel=1e-12)
+        assert gebaeude["ueberfuellungskosten"][0] == pytest.approx(speicher.summe("ueberfuellung_kosten_tag")[0], rel=1e-12)
+        assert gebaeude["ueberfuellungsrate"][0] == pytest.approx(speicher["ueberfuellungsrate_tag"][0].mean(), rel=1e-12)
+        assert gebaeude["ueberfuellte_tage"][0] == np.count_nonzero(speicher["ueberfuellungsrate_tag"][0])
+        assert gebaeude["sonderentleerungen"][0] == np.count_nonzero(speicher["sonderentleerung_kosten_tag"][0])
+
+
+def test_gemeinsame_leerung_pro_tour():
+    # Ohne Abwesenheit und Besuch hängt der Füllstand nur von den Leerungen ab (Leertag und Ausfälle der Tour)
+    flotte = Flotte([ANZAHL_BEWOHNER] * 6, [REST_MUELLTONE_STAFFEL[0]] * 6, [0, 1, 2, 0, 1, 2])
+    ergebnis = simulation_flotte(flotte, {"P_BESUCH": 0.0, "P_AUSFALL": 0.5}, HANDLUNGSOPTIONEN["feste Abholintervalle"], parameter={"P_ABWESEND": 0.0})
+    fuellmenge = ergebnis["gebaeude"]["gesamtfuellmenge"]
+    assert fuellmenge[0] == fuellmenge[3] and fuellmenge[1] == fuellmenge[4] and fuellmenge[2] == fuellmenge[5]
+    assert len(set(fuellmenge[:3])) == 3
+    assert ergebnis["tage"]["ausgefallene_touren"].max() <= 3
+    assert ergebnis["tage"]["ausgefallene_touren"].sum() > 0
+
+
+@pytest.mark.parametrize("handlungsoption", list(HANDLUNGSOPTIONEN))
+def test_kennzahlen_stadtteil(handlungsoption):
+    flotte = flotte_erzeugen(60, 4)
+    laeufe = monte_carlo_flotte(flotte, SZENARIEN["Ausfall"], HANDLUNGSOPTIONEN[handlungsoption], durchlaeufe=3)
+    df_gebaeude, df_zusammenfassung = auswertung_flotte(flotte, laeufe)
+    kennzahlen = dict(zip(df_zusammenfassung["Kennzahl"], df_zusammenfassung["Wert"]))
+    erwartet = {
+        "Gebäude": len(flotte),
+        "Touren": 4,
+        "Bewohner": flotte.bewohner.sum(),
+        "Durchläufe": 3,
+        "Gesamtkosten Stadtteil (Durchschnitt)": df_gebaeude["gesamtkosten"].sum(),
+        "Gesamtkosten pro Gebäude (Durchschnitt)": df_gebaeude["gesamtkosten"].mean(),
+        "Gesamtkosten pro Bewohner (Durchschnitt)": df_gebaeude["gesamtkosten"].sum() / flotte.bewohner.sum(),
+        "Überfüllungskosten Stadtteil (Durchschnitt)": df_gebaeude["ueberfuellungskosten"].sum(),
+        "Anteil überfüllter Gebäude-Tage": df_gebaeude["ueberfuellte_tage"].sum() / (len(flotte) * TAGE),
+        "Überfüllungsrate (Durchschnitt)": df_gebaeude["ueberfuellungsrate"].mean(),
+        "Überfüllte Gebäude pro Tag (Durchschnitt)": df_gebaeude["ueberfuellte_tage"].sum() / TAGE,
+        "Ausgefallene Touren (Summe pro Durchlauf)": np.mean([lauf["tage"]["ausgefallene_touren"].sum() for lauf in laeufe]),
+        "Sonderentleerungen pro Gebäude (Durchschnitt)": df_gebaeude["sonderentleerungen"].mean(),
+        "Kapazitätsausbauten pro Gebäude (Durchschnitt)": df_gebaeude["ausbauten"].mean(),
+    }
+    for kennzahl, wert in erwartet.items():
+        assert kennzahlen[kennzahl] == pytest.approx(wert, abs=1e-4), kennzahl # Werte der Zusammenfassung auf 4 Stellen gerundet
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,33 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der Instrumentierung: Bei paralleler Ausführung müssen die Phasen und Zähler der Arbeitsprozesse mit den Teilergebnissen
+zurückgegeben und im Hauptprozess übernommen werden.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import os
+import instrumentierung
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from simulation import monte_carlo
+
+
+def test_messungen_der_arbeitsprozesse(monkeypatch):
+    monkeypatch.setattr(instrumentierung, "_aktiv", False) # Zustand nach dem Test zurücksetzen
+    instrumentierung.aktivieren()
+    ergebnis = monte_carlo(100, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["feste Abholintervalle"], anzahl_prozesse=2, chunk_groesse=25, engine="numpy")
+    simulation = [ereignis for ereignis in instrumentierung._ereignisse if ereignis["name"] == "simulation (numpy)"]
+    assert len(simulation) == 4
+    assert all(ereignis["pid"] != os.getpid() and ereignis["ts"] >= 0 for ereignis in simulation)
+    assert instrumentierung._zaehler["simulationslaeufe"] == 100
+    assert ergebnis.messungen is None
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
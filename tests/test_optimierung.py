@@ -0,0 +1,42 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der Optimierung (Successive Halving): Mit maximaler Überfüllungsrate ist der günstigste zulässige Kandidat der beste.
+Ist kein Kandidat zulässig, ist der Kandidat mit der geringsten Überschreitung der beste, auch wenn günstigere Kandidaten die Grenze stärker überschreiten.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from optimierung import successive_halving, kandidaten_strategie
+
+
+HANDLUNGSOPTION = HANDLUNGSOPTIONEN["Sonderentleerung"]
+KANDIDATEN = kandidaten_strategie(HANDLUNGSOPTION, [50, 60, 100], [1]) # Überfüllungsrate ca. 0.8%, 1.0% bzw. 42%
+
+
+def optimierung(max_ueberfuellungsrate):
+    return successive_halving(KANDIDATEN, SZENARIEN["Normal"], HANDLUNGSOPTION, start_durchlaeufe=20, max_durchlaeufe=40, max_ueberfuellungsrate=max_ueberfuellungsrate)
+
+
+def test_guenstigster_zulaessiger_kandidat():
+    ergebnis = optimierung(1.5)
+    assert ergebnis["zulaessig"]
+    assert ergebnis["beste_strategie"] == {"SONDERENTLEERUNG_FUELLMENGE_PROZENT": 60}
+
+
+def test_kein_kandidat_zulaessig():
+    ergebnis = optimierung(0.5)
+    assert not ergebnis["zulaessig"]
+    assert ergebnis["beste_strategie"] == {"SONDERENTLEERUNG_FUELLMENGE_PROZENT": 50}
+    assert [eintrag["parameter"] for eintrag in ergebnis["rangliste"]] == KANDIDATEN
+    assert ergebnis["ueberfuellungsrate"]["mittelwert"] < 1.0
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
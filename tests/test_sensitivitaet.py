@@ -0,0 +1,85 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der Sensitivitätsanalyse: Die Latin-Hypercube-Stichprobe verwendet jede Schicht pro Dimension genau einmal, die Saltelli-Stichprobe
+besteht aus A, B und den Matrizen A_B^(i), die sich nur in Spalte i von A unterscheiden. Beide Schätzer reproduzieren die bekannten
+Sobol-Indizes der Ishigami-Funktion. Ganzzahlige Eingangsgrößen liegen ganzzahlig im Bereich, und die parallele Auswertung
+entspricht der seriellen.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import math
+import numpy as np
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from sensitivitaet import STANDARD_BEREICHE, latin_hypercube, stichprobe, auswertung, sobol_indizes, erste_ordnung_klassen
+
+
+ISHIGAMI_BEREICHE = {"x1": (-math.pi, math.pi), "x2": (-math.pi, math.pi), "x3": (-math.pi, math.pi)}
+ISHIGAMI_ERSTE_ORDNUNG = [0.3139, 0.4424, 0.0] # analytische Werte für a = 7, b = 0.1
+ISHIGAMI_TOTALEFFEKT = [0.5576, 0.4424, 0.2437]
+
+
+def ishigami(x, a=7.0, b=0.1):
+    return np.sin(x[:, 0]) + a * np.sin(x[:, 1]) ** 2 + b * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+
+def test_latin_hypercube_jede_schicht_einmal():
+    punkte = latin_hypercube(50, 4, np.random.default_rng(0))
+    assert punkte.shape == (50, 4)
+    assert ((punkte >= 0) & (punkte < 1)).all()
+    for spalte in range(4):
+        assert sorted(np.floor(punkte[:, spalte] * 50).astype(int)) == list(range(50))
+
+
+def test_saltelli_matrizen():
+    anzahl, d = 16, len(ISHIGAMI_BEREICHE)
+    matrizen = stichprobe(ISHIGAMI_BEREICHE, anzahl, "saltelli", seed=1).reshape(d + 2, anzahl, d) # A, B, A_B^(1), ..., A_B^(d)
+    a, b = matrizen[0], matrizen[1]
+    assert (a != b).all()
+    for i in range(d):
+        andere = [spalte for spalte in range(d) if spalte != i]
+        np.testing.assert_array_equal(matrizen[2 + i][:, i], b[:, i])
+        np.testing.assert_array_equal(matrizen[2 + i][:, andere], a[:, andere])
+
+
+def test_sobol_indizes_ishigami():
+    anzahl, d = 2 ** 14, len(ISHIGAMI_BEREICHE)
+    y = ishigami(stichprobe(ISHIGAMI_BEREICHE, anzahl, "saltelli", seed=2)).reshape(d + 2, anzahl)
+    erste_ordnung, totaleffekt = sobol_indizes(y[0], y[1], y[2:])
+    np.testing.assert_allclose(erste_ordnung, ISHIGAMI_ERSTE_ORDNUNG, atol=0.03)
+    np.testing.assert_allclose(totaleffekt, ISHIGAMI_TOTALEFFEKT, atol=0.03)
+
+
+def test_erste_ordnung_klassen_ishigami():
+    x = stichprobe(ISHIGAMI_BEREICHE, 10000, "lhs", seed=3)
+    np.testing.assert_allclose(erste_ordnung_klassen(x, ishigami(x)), ISHIGAMI_ERSTE_ORDNUNG, atol=0.03)
+
+
+@pytest.mark.parametrize("methode", ["saltelli", "lhs"])
+def test_ganzzahlige_eingangsgroessen(methode):
+    bereiche = {"ANZAHL_BEWOHNER": (1.5, 8.2), "UEBERFUELLUNGEN_KAPAZITAETSAUSBAU": (2.0, 5.0), "P_BESUCH": (0.02, 0.2)}
+    punkte = stichprobe(bereiche, 200, methode, seed=4)
+    for spalte, (untere, obere) in enumerate(list(bereiche.values())[:2]):
+        werte = punkte[:, spalte]
+        np.testing.assert_array_equal(werte, np.round(werte))
+        assert set(werte.astype(int)) == set(range(math.ceil(untere), math.floor(obere) + 1))
+
+
+def test_parallel_wie_seriell():
+    namen = list(STANDARD_BEREICHE)
+    punkte = stichprobe(STANDARD_BEREICHE, 6, "lhs", seed=5)
+    argumente = (punkte, namen, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], 5)
+    seriell = auswertung(*argumente, anzahl_prozesse=1, block_laeufe=10) # drei Arbeitspakete mit je zwei Parameterpunkten
+    np.testing.assert_array_equal(auswertung(*argumente, anzahl_prozesse=2, block_laeufe=10), seriell)
+    assert len(np.unique(seriell)) == len(punkte)
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,35 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests des Simulationslaufs: Die Ergebnistabelle ist für jede Engine unabhängig von der Anzahl der Prozesse identisch zur seriellen
+Ausführung, auch ohne Simulationsläufe.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from funktionen import ausgabe_csv
+from simulation import simulationslauf
+
+
+def ergebnistabelle(durchlaeufe, anzahl_prozesse, engine):
+    return ausgabe_csv(simulationslauf(SZENARIEN, HANDLUNGSOPTIONEN, durchlaeufe, anzahl_prozesse, 10, engine, grafik_verzeichnis=None)).to_csv()
+
+
+@pytest.mark.parametrize("engine", ["simpy", "numpy", "ereignis"])
+def test_parallel_wie_seriell(engine):
+    assert ergebnistabelle(40, 2, engine) == ergebnistabelle(40, 1, engine)
+
+
+def test_ohne_durchlaeufe():
+    assert ergebnistabelle(0, 2, "numpy") == ergebnistabelle(0, 1, "numpy")
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,68 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der laufenden Statistik: Die Quantile der Quantilskizze weichen höchstens um die relative Genauigkeit alpha vom exakten Wert ab.
+Die Häufigkeiten der Histogramme entsprechen exakt np.histogram mit denselben Klassengrenzen, auch nach dem Zusammenführen mehrerer Blöcke
+in beliebiger Reihenfolge.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import numpy as np
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from simulation import simulation_rohdaten, seed_bloecke
+from statistik import Quantilskizze, Histogramm, Teilergebnis
+
+
+VERTEILUNGEN = {
+    "normal": lambda rng: rng.normal(4500, 60, 5000),
+    "lognormal": lambda rng: rng.lognormal(10, 0.5, 5000),
+    "mit nullwerten": lambda rng: np.concatenate([np.zeros(300), rng.exponential(100, 2000)]),
+}
+
+
+@pytest.mark.parametrize("verteilung", VERTEILUNGEN)
+def test_quantile_innerhalb_alpha(verteilung):
+    werte = VERTEILUNGEN[verteilung](np.random.default_rng(1))
+    skizze = Quantilskizze()
+    for block in np.array_split(werte, 13):
+        skizze.zusammenfuehren(Quantilskizze().hinzufuegen(block))
+    sortiert = np.sort(werte)
+    for q in (0.01, 0.1, 0.5, 0.9, 0.99, 1.0):
+        exakt = sortiert[int(q * (len(werte) - 1))] # Wert des Rangs q * (n - 1)
+        assert abs(skizze.quantil(q) - exakt) <= Quantilskizze.RELATIVE_GENAUIGKEIT * exakt
+
+
+@pytest.mark.parametrize("verteilung", VERTEILUNGEN)
+def test_histogramm_exakt(verteilung):
+    rng = np.random.default_rng(2)
+    werte = VERTEILUNGEN[verteilung](rng)
+    gesamt = Histogramm().hinzufuegen(werte)
+    haeufigkeiten, grenzen = gesamt.haeufigkeiten(40)
+    assert len(haeufigkeiten) <= 40
+    np.testing.assert_array_equal(haeufigkeiten, np.histogram(werte, grenzen)[0])
+    bloecke = np.array_split(rng.permutation(werte), 11)
+    zusammengefuehrt = Histogramm()
+    for block in bloecke[::-1]:
+        zusammengefuehrt.zusammenfuehren(Histogramm().hinzufuegen(block))
+    np.testing.assert_array_equal(zusammengefuehrt.haeufigkeiten(40)[0], haeufigkeiten)
+    np.testing.assert_array_equal(zusammengefuehrt.haeufigkeiten(40)[1], grenzen)
+
+
+def test_teilergebnis_histogramme_wie_laufsummen():
+    ergebnis = Teilergebnis(laufsummen_speichern=True)
+    for seeds in seed_bloecke(300, 50):
+        ergebnis.zusammenfuehren(Teilergebnis(laufsummen_speichern=True).erfassen(simulation_rohdaten(seeds, SZENARIEN["Normal"], HANDLUNGSOPTIONEN["Sonderentleerung"], "numpy")))
+    for name, histogramm in ergebnis.histogramme.items():
+        haeufigkeiten, grenzen = histogramm.haeufigkeiten(40)
+        np.testing.assert_array_equal(haeufigkeiten, np.histogram(ergebnis.laufsummen[name], grenzen)[0])
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
@@ -0,0 +1,70 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests des Trajektorien-Exports: Die gelesenen Tageswerte entsprechen den simulierten Tageswerten, auch über die Grenze zweier Blöcke.
+Ein Ausschnitt innerhalb eines Blocks wird per Memory-Mapping ohne Kopie zurückgegeben. Bei einem erneuten Lauf werden bereits
+exportierte Blöcke nicht erneut geschrieben.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import numpy as np
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from cache import Ergebniscache
+from simulation import simulationslauf, simulation_rohdaten
+from trajektorien import TrajektorienExport, Trajektorien
+
+
+SZENARIO = "Normal"
+HANDLUNGSOPTION = "Sonderentleerung"
+
+
+def simulation(export, cache=None, durchlaeufe=30):
+    simulationslauf({SZENARIO: SZENARIEN[SZENARIO]}, {HANDLUNGSOPTION: HANDLUNGSOPTIONEN[HANDLUNGSOPTION]}, durchlaeufe, 1, 10, "numpy", cache=cache, trajektorien=export, grafik_verzeichnis=None)
+
+
+@pytest.fixture
+def export(tmp_path):
+    export = TrajektorienExport(tmp_path / "trajektorien")
+    simulation(export) # Seeds 1000 bis 1029 in drei Blöcken
+    return export
+
+
+@pytest.mark.parametrize("metrik", ["fuellmenge_tag", "kapazitaet_tag", "ausfall_tag"])
+def test_lesen_wie_simulation(export, metrik):
+    seeds, werte = Trajektorien(export.verzeichnis).lesen(metrik, SZENARIO, HANDLUNGSOPTION, seeds=(1005, 1015), tage=(100, 200))
+    erwartet = simulation_rohdaten(list(range(1005, 1015)), SZENARIEN[SZENARIO], HANDLUNGSOPTIONEN[HANDLUNGSOPTION], "numpy")[metrik][:, 100:200]
+    assert seeds.tolist() == list(range(1005, 1015))
+    np.testing.assert_array_equal(werte, erwartet)
+
+
+def test_ausschnitt_per_memory_mapping(export):
+    seeds, werte = Trajektorien(export.verzeichnis).lesen("fuellmenge_tag", SZENARIO, HANDLUNGSOPTION, seeds=(1012, 1018), tage=(10, 20))
+    assert isinstance(werte, np.memmap)
+    assert not werte.flags.writeable
+    assert werte.shape == (6, 10)
+
+
+def test_vorhandene_bloecke_nicht_erneut_schreiben(export, tmp_path, monkeypatch):
+    for erster_seed in (1000, 1010, 1020):
+        assert export.vorhanden(list(range(erster_seed, erster_seed + 10)), SZENARIEN[SZENARIO], HANDLUNGSOPTIONEN[HANDLUNGSOPTION], "numpy")
+    geschrieben = []
+    schreiben = TrajektorienExport.schreiben
+    monkeypatch.setattr(TrajektorienExport, "schreiben", lambda self, speicher, seeds, *argumente: geschrieben.append(seeds[0]) or schreiben(self, speicher, seeds, *argumente))
+    simulation(export, durchlaeufe=40) # ohne Cache: alle Blöcke werden simuliert, aber nur der neue Block exportiert
+    assert geschrieben == [1030]
+    cache = Ergebniscache(tmp_path / "cache")
+    simulation(export, cache, 40) # Blöcke werden im Cache gespeichert
+    simulation(export, cache, 40) # Teilergebnisse und Tageswerte vorhanden: Blöcke werden geladen
+    assert geschrieben == [1030]
+    assert cache.treffer == 4
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
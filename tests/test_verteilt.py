@@ -0,0 +1,87 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der verteilten Simulation: Mit lokalen Arbeiterprozessen ist die Ergebnistabelle identisch zum seriellen Simulationslauf
+und wird vor den Grafiken im Ausgabeordner gespeichert. Bricht die Verbindung zu einem Arbeiter ab oder überschreitet er die
+Zeitgrenze, wird sein Block an einen anderen Arbeiter vergeben. Koordinator und Arbeiter starten nicht ohne gemeinsamen Schlüssel.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import os
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Client
+from pathlib import Path
+import pytest
+from main import SZENARIEN, HANDLUNGSOPTIONEN
+from funktionen import ausgabe_csv
+from simulation import simulationslauf, simulation_block
+from verteilt import Koordinator, arbeiter, simulation_aufgaben, verteilte_simulation
+
+
+SIMULATION_VERZEICHNIS = Path(__file__).resolve().parent.parent / "simulation"
+SZENARIO = {"Normal": SZENARIEN["Normal"]}
+SCHLUESSEL = b"test-schluessel"
+
+
+def test_lokal_identisch_zum_simulationslauf(tmp_path):
+    ausgabe = tmp_path / "ergebnisse" / "simulation_ergebnisse.csv"
+    verteilt = verteilte_simulation(SZENARIO, HANDLUNGSOPTIONEN, 40, 10, "numpy", anzahl_lokal=2, ausgabe=str(ausgabe), grafik_verzeichnis=str(ausgabe.parent))
+    seriell = simulationslauf(SZENARIO, HANDLUNGSOPTIONEN, 40, 1, 10, "numpy", grafik_verzeichnis=None)
+    assert ausgabe_csv(verteilt).to_csv() == ausgabe_csv(seriell).to_csv()
+    assert ausgabe.read_text() == ausgabe_csv(seriell).to_csv()
+    assert list(ausgabe.parent.glob("*.png"))
+
+
+def test_neuvergabe_nach_abbruch_und_zeitgrenze():
+    kennungen, aufgaben = simulation_aufgaben(SZENARIO, HANDLUNGSOPTIONEN, 30, 10, "numpy")
+    koordinator = Koordinator(aufgaben, schluessel=SCHLUESSEL, timeout=2)
+    ergebnisse = []
+    ausfuehrung = threading.Thread(target=lambda: ergebnisse.extend(koordinator.ausfuehren()))
+    ausfuehrung.start()
+
+    # Arbeiter A wird nach Erhalt eines Blocks beendet (Verbindung bricht ab)
+    abgebrochen = Client(koordinator.adresse, authkey=SCHLUESSEL)
+    abgebrochen.send({"art": "bereit", "name": "abgebrochen"})
+    assert abgebrochen.recv()["art"] == "aufgabe"
+    abgebrochen.close()
+    # Arbeiter B erhält einen Block und antwortet nicht (Zeitgrenze)
+    haengend = Client(koordinator.adresse, authkey=SCHLUESSEL)
+    haengend.send({"art": "bereit", "name": "haengend"})
+    assert haengend.recv()["art"] == "aufgabe"
+
+    anzahl = []
+    arbeit = threading.Thread(target=lambda: anzahl.append(arbeiter(koordinator.adresse, SCHLUESSEL, "arbeiter")))
+    arbeit.start()
+    ausfuehrung.join(timeout=120)
+    arbeit.join(timeout=10)
+    haengend.close()
+
+    assert not ausfuehrung.is_alive()
+    assert koordinator.neu_vergeben == 2
+    assert anzahl == [len(aufgaben)]
+    for teilergebnis, aufgabe in zip(ergebnisse, aufgaben):
+        assert teilergebnis.statistik.werte == simulation_block(*aufgabe).statistik.werte
+
+
+def test_kein_start_ohne_schluessel():
+    with pytest.raises(ValueError):
+        Koordinator([], schluessel=None)
+    with pytest.raises(ValueError):
+        verteilte_simulation(SZENARIO, HANDLUNGSOPTIONEN, 10, 10, "numpy", adresse=("0.0.0.0", 0))
+    umgebung = {name: wert for name, wert in os.environ.items() if name != "SIMULATION_SCHLUESSEL"}
+    for modus in ("koordinator", "arbeiter"):
+        prozess = subprocess.run([sys.executable, str(SIMULATION_VERZEICHNIS / "verteilt.py"), modus], env=umgebung, capture_output=True, text=True, timeout=60)
+        assert prozess.returncode == 2
+        assert "SIMULATION_SCHLUESSEL" in prozess.stderr
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------
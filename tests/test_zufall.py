@@ -0,0 +1,43 @@
+"""
+Digital Business University of Applied Sciences
+Data Science und Management (M. Sc.)
+ADSC32 Applied Data Science III: Softwareparadigmen
+Prof. Dr. Marcel Hebing
+Julia Schmid (200022)
+
+
+Tests der antithetischen Paare im SimPy-Klassenmodell: Mit einer Besuchswahrscheinlichkeit von 50% hat an jedem Tag genau einer
+der beiden Läufe eines Paars Besuch (gespiegelte Zufallszahlen über den gesamten Zeitraum). Der Mittelwert der Gesamtkosten eines
+antithetischen Paars hat eine geringere Varianz als der Mittelwert zweier unabhängiger Läufe.
+"""
+
+# -----------------------------
+# ---------- Imports ----------
+import numpy as np
+import pytest
+from main import HANDLUNGSOPTIONEN
+from simulation import simulation_rohdaten
+
+
+SZENARIO = {"P_BESUCH": 0.5, "P_AUSFALL": 0.008}
+PARAMETER = {"P_ABWESEND": 0.5}
+
+
+def test_paar_bleibt_gespiegelt():
+    speicher = simulation_rohdaten(list(range(1000, 1020)), SZENARIO, HANDLUNGSOPTIONEN["Sonderentleerung"], "simpy", "antithetisch", PARAMETER)
+    besuch = speicher["anzahl_besuch_tag"] > 0
+    assert (besuch[0::2] ^ besuch[1::2]).all()
+
+
+@pytest.mark.parametrize("handlungsoption", ["feste Abholintervalle", "Sonderentleerung"])
+def test_geringere_varianz_als_unabhaengige_laeufe(handlungsoption):
+    seeds = list(range(1000, 1400))
+    varianz = {}
+    for varianzreduktion in ("antithetisch", "crn"): # crn: aufeinanderfolgende Zufallsstartwerte sind unabhängig
+        gesamtkosten = simulation_rohdaten(seeds, SZENARIO, HANDLUNGSOPTIONEN[handlungsoption], "simpy", varianzreduktion, PARAMETER).summe("kosten_tag")
+        varianz[varianzreduktion] = np.var(gesamtkosten.reshape(-1, 2).mean(axis=1))
+    assert varianz["antithetisch"] < 0.75 * varianz["crn"]
+
+# --------------------------
+# ---------- Ende ----------
+# --------------------------